@@ -1,10 +1,43 @@
-from flask import Flask, render_template, jsonify, send_from_directory
+from flask import Flask, Response, render_template, jsonify, send_from_directory, send_file, request, abort, make_response, redirect, url_for, g
+from flask.json.provider import DefaultJSONProvider
 from flask_wtf.csrf import CSRFProtect
-from config import Config
+from config import ApiConfig, Config, LogoConfig, MetricsConfig
 from scheduler import data_scheduler
+from logo_cache import logo_cache, resolve_logo_file, choose_format, MIMETYPES
+from static_assets import AssetManifest
+from slides import slide_cache, SLIDE_NAMES
+from metrics import registry, ActiveClients, REQUEST_LATENCY, REQUESTS_TOTAL, CONTENT_TYPE
+from profiling import refresh_history
+from leagues import league_store
+from view_cache import serialized_view_cache, project_fields
+from match_table import MatchTable
+from archive import archive
+from circuit_breaker import upstream_breakers
+from projections import projection_cache
+from team_stats import team_stats_store
+from exports import export_chunks, EXPORT_VIEWS, EXPORT_FORMATS
+from indexes import AmbiguousTeamError, resolve_team, team_index_cache, match_index_cache, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from logging_setup import configure_logging
+from datetime import datetime
+import hashlib
+import hmac
 import os
+import time
+
+# Structured logging, written from a background thread
+configure_logging()
+
+class MatchTableJSONProvider(DefaultJSONProvider):
+    """Writes resident match tables as lists of matches at the response boundary"""
+
+    @staticmethod
+    def default(value):
+        if isinstance(value, MatchTable):
+            return value.to_list()
+        return DefaultJSONProvider.default(value)
 
 app = Flask(__name__) 
+app.json = MatchTableJSONProvider(app)
 app.secret_key = Config.SECRET_KEY
 
 # CSRF Protection
@@ -13,6 +46,84 @@ csrf = CSRFProtect(app)
 # Exempt API endpoints from CSRF (they're read-only)
 csrf.exempt('api')
 
+# Content-hashed static URLs, served with immutable caching
+asset_manifest = AssetManifest(app)
+
+# Request metrics
+active_clients = ActiveClients(MetricsConfig.ACTIVE_CLIENT_WINDOW_SECONDS, MetricsConfig.MAX_ACTIVE_CLIENTS)
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    
+    # Displays poll the slide manifest and API endpoints, possibly league-scoped
+    if request.path.startswith('/slides') or '/api/' in request.path:
+        active_clients.seen((request.remote_addr, request.headers.get('User-Agent', '')))
+
+@app.after_request
+def record_request_metrics(response):
+    start = g.pop('request_start', None)
+    if start is not None:
+        # Label by route pattern, not path, to keep the number of series bounded
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        REQUEST_LATENCY.observe(time.perf_counter() - start, route=route, method=request.method)
+        REQUESTS_TOTAL.inc(route=route, method=request.method, status=response.status_code)
+    return response
+
+def _snapshot_size_bytes():
+    try:
+        return os.path.getsize(data_scheduler.data_file)
+    except OSError:
+        return None
+
+def _snapshot_age_seconds(published=None):
+    published = published or data_scheduler.published
+    if published is None or published.last_update is None:
+        return None
+    return (datetime.now() - published.last_update).total_seconds()
+
+registry.gauge('spms_snapshot_size_bytes', 'Size of the processed data snapshot on disk',
+               callback=_snapshot_size_bytes)
+registry.gauge('spms_snapshot_age_seconds', 'Seconds since the data was last refreshed',
+               callback=_snapshot_age_seconds)
+registry.gauge('spms_league_partitions_resident', 'Leagues whose data is held in memory',
+               callback=lambda: len(league_store.resident))
+registry.gauge('spms_league_resident_bytes', 'Estimated memory held by resident league partitions',
+               callback=league_store.resident_bytes)
+registry.gauge('spms_active_poll_clients', 'Distinct displays that polled within the activity window',
+               callback=active_clients.count)
+registry.gauge('spms_upstream_circuits_open', 'Competition API circuit breakers that are open or half-open',
+               callback=upstream_breakers.open_count)
+
+@app.route('/metrics')
+def metrics():
+    """Export metrics in Prometheus text format"""
+    return registry.render(), 200, {'Content-Type': CONTENT_TYPE}
+
+@app.route('/health')
+def health():
+    """Liveness and data freshness, with the state of the competition API circuit breakers.
+    
+    Degraded while a breaker is not closed: the last good snapshot is being served."""
+    upstream = upstream_breakers.statuses()
+    published = data_scheduler.published
+    has_data = published is not None or os.path.exists(data_scheduler.data_file)
+    if not has_data:
+        status = 'unavailable'
+    elif any(breaker['state'] != 'closed' for breaker in upstream):
+        status = 'degraded'
+    else:
+        status = 'ok'
+    age = _snapshot_age_seconds(published)
+    last_update = published.last_update if published is not None else None
+    return jsonify({
+        'status': status,
+        'data_version': published.version if published is not None else None,
+        'last_update': last_update.isoformat() if last_update else None,
+        'snapshot_age_seconds': round(age, 1) if age is not None else None,
+        'upstream': upstream,
+    }), 503 if status == 'unavailable' else 200
+
 # Security headers
 @app.after_request
 def set_security_headers(response):
@@ -44,10 +155,79 @@ def favicon():
     return send_from_directory(os.path.join(app.root_path, 'static', 'images'),
                                'favicon.png', mimetype='image/png')
 
+# Resized team logos
+def _logo_file(team, size):
+    if size not in LogoConfig.SIZES:
+        abort(404)
+    # Use in-memory data only; a logo request should never trigger a fetch
+    league_table = (data_scheduler.cached_data or {}).get('league_table', [])
+    return resolve_logo_file(team, league_table)
+
+def _logo_response(logo_file, size, cache_control):
+    fmt = choose_format(request.headers.get('Accept'))
+    logo, key = logo_cache.open_entry(logo_file, size, fmt)
+    response = send_file(logo, mimetype=MIMETYPES[fmt], etag=key, conditional=True)
+    response.headers['Cache-Control'] = cache_control
+    response.headers['Vary'] = 'Accept'
+    return response
+
+@app.template_global()
+def logo_url(team, size):
+    """Content-addressed URL of a team logo, cacheable for good"""
+    logo_file = resolve_logo_file(team, (data_scheduler.cached_data or {}).get('league_table', []))
+    return url_for('versioned_team_logo', digest=logo_cache.version(logo_file),
+                   team=logo_file[:-len('.png')], size=size)
+
+@app.route('/logos/<team>/<int:size>')
+def team_logo(team, size):
+    """Serve a team logo resized to size x size in the best format the client accepts.
+    
+    The logo behind a team name can be replaced, so this URL is revalidated; logo_url
+    gives the immutable one."""
+    return _logo_response(_logo_file(team, size), size, 'public, max-age=300')
+
+@app.route('/logos/<digest>/<team>/<int:size>')
+def versioned_team_logo(digest, team, size):
+    """Serve a team logo under the digest of its source; a replaced logo redirects to its new URL"""
+    logo_file = _logo_file(team, size)
+    if logo_cache.version(logo_file) != digest:
+        return redirect(logo_url(team, size))
+    return _logo_response(logo_file, size, 'public, max-age=31536000, immutable')
+
+# Offline support for kiosk displays
+@app.route('/service-worker.js')
+def service_worker():
+    """Serve the service worker from the site root so it controls the whole dashboard"""
+    precache_urls = [
+        url_for('landing'),
+        url_for('static', filename='css/dashboard.css'),
+        url_for('static', filename='js/dashboard.js'),
+        # Backgrounds of dashboard.css, fingerprinted the same way in the served stylesheet
+        url_for('static', filename='images/team_logos/t_184.png'),
+        url_for('static', filename='images/logo_club1919.png'),
+    ]
+    
+    # Logos of the current league's teams
+    league_table = (data_scheduler.cached_data or {}).get('league_table', [])
+    logo_files = sorted({resolve_logo_file(row['team'], league_table) for row in league_table})
+    precache_urls += [url_for('static', filename=f'images/team_logos/{logo_file}') for logo_file in logo_files]
+    
+    cache_version = hashlib.sha256('\n'.join(precache_urls).encode('utf-8')).hexdigest()[:12]
+    response = make_response(render_template('service-worker.js',
+                                             precache_urls=precache_urls,
+                                             cache_version=cache_version))
+    response.mimetype = 'application/javascript'
+    response.cache_control.no_cache = True
+    return response
+
 @app.errorhandler(404)
 def page_not_found(error):
     return render_template('404.html'), 404
 
+@app.errorhandler(AmbiguousTeamError)
+def ambiguous_team(error):
+    return jsonify({'error': str(error), 'candidates': error.candidates}), 400
+
 @app.errorhandler(500)
 def internal_error(error):
     return render_template('500.html'), 500
@@ -57,24 +237,125 @@ def landing():
     return render_template('dashboard.html', 
                          screen_duration_seconds=Config.SCREEN_DURATION_SECONDS)
 
-# API endpoint mappings
-API_DATA_MAPPINGS = {
-    'data': {'key': None, 'wrapper': None},  # Return all data
-    'standings': {'key': 'league_table', 'wrapper': 'league_table'},
-    'period-standings': {'key': 'period_standings', 'wrapper': 'period_standings'},
-    'last-week-results': {'key': 'last_week_results', 'wrapper': 'results'},
-    'next-week-matches': {'key': 'next_week_matches', 'wrapper': 'matches'},
-    'weekly-results': {'key': 'weekly_results', 'wrapper': 'weekly_results'},
-    'team-matrix': {'key': 'team_matrix', 'wrapper': 'team_matrix'},
-    'all-matches': {'key': 'all_matches', 'wrapper': 'matches'},
-}
-
 def _get_cached_data_with_error_handling():
-    """Get cached data with consistent error handling"""
-    data = data_scheduler.get_cached_data()
-    if not data:
-        return None, (jsonify({'error': 'No data available'}), 500)
-    return data, None
+    """Get cached data and its version, read together, with consistent error handling"""
+    published = data_scheduler.get_published()
+    if published is None or not published.data:
+        return None, None, (jsonify({'error': 'No data available'}), 500)
+    return published.data, published.version, None
+
+def _featured_team_view(data, version, team):
+    """Featured team matches for a ?team= or URL identifier from the per-version team index.
+    
+    Returns (matches, team name), or (None, None) for a team that is not in the data."""
+    index = team_index_cache.get(data, version)
+    team_name = index.resolve(team)
+    if team_name is None:
+        return None, None
+    return index.featured_team_matches(team_name), team_name
+
+ALL_MATCHES_QUERY_ARGS = ('from', 'to', 'team', 'status', 'limit', 'cursor')
+
+def _parse_date_arg(name):
+    value = request.args.get(name)
+    if value:
+        try:
+            datetime.strptime(value, '%Y-%m-%d')
+        except ValueError:
+            abort(make_response(jsonify({'error': f"'{name}' must be a YYYY-MM-DD date"}), 400))
+    return value
+
+def _all_matches_page(data, version):
+    """Filtered, paginated /api/all-matches response from the per-version match index"""
+    index = match_index_cache.get(data, version)
+    
+    team = request.args.get('team')
+    if team:
+        team = index.resolve(team)
+        if team is None:
+            return jsonify({'error': 'Unknown team'}), 404
+    
+    status = request.args.get('status')
+    if status and status not in ('played', 'upcoming'):
+        return jsonify({'error': "'status' must be 'played' or 'upcoming'"}), 400
+    
+    limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    
+    # Cursors are positions in one data version's match array
+    start = 0
+    cursor = request.args.get('cursor')
+    if cursor:
+        cursor_version, _, position = cursor.partition(':')
+        if cursor_version != version or not position.isdigit():
+            return jsonify({'error': 'Cursor expired, restart without cursor'}), 410
+        start = int(position)
+    
+    matches, next_start = index.query(date_from=_parse_date_arg('from'), date_to=_parse_date_arg('to'),
+                                      team=team, status=status or None, start=start, limit=limit)
+    return jsonify({
+        'matches': matches,
+        'next_cursor': f"{version}:{next_start}" if next_start is not None else None,
+        'last_updated': data.get('last_updated')
+    })
+
+# Views that /api/batch can combine; 'data' is left out, it duplicates everything plus raw_data
+BATCH_VIEWS = {endpoint: mapping['key'] for endpoint, mapping in ApiConfig.DATA_MAPPINGS.items() if mapping['key']}
+BATCH_VIEWS['featured-team-matches'] = 'featured_team_matches'
+
+def _parse_fields_arg():
+    """Split ?fields= into fields for every view and fields qualified as view.field"""
+    common, per_view = set(), {}
+    for field in filter(None, (item.strip() for item in request.args.get('fields', '').split(','))):
+        view, dot, name = field.rpartition('.')
+        if dot:
+            per_view.setdefault(view, set()).add(name)
+        else:
+            common.add(field)
+    return common, per_view
+
+def _batch_response(data, version, team=None):
+    """Combine the requested views into one response from the serialized view cache"""
+    views = [view.strip() for view in request.args.get('views', '').split(',') if view.strip()]
+    unknown = [view for view in views if view not in BATCH_VIEWS]
+    if not views or unknown:
+        return jsonify({'error': 'Unknown or missing views', 'unknown': unknown,
+                        'available': sorted(BATCH_VIEWS)}), 400
+    
+    team_name = None
+    if team and 'featured-team-matches' in views:
+        featured_matches, team_name = _featured_team_view(data, version, team)
+        if team_name is None:
+            return jsonify({'error': 'Unknown team'}), 404
+    
+    common_fields, per_view_fields = _parse_fields_arg()
+    parts = []
+    for view in views:
+        fields = frozenset(common_fields | per_view_fields.get(view, set()))
+        view_team = team_name if view == 'featured-team-matches' else None
+        
+        def build(view=view, fields=fields, view_team=view_team):
+            if view_team:
+                value = featured_matches
+            else:
+                value = data.get(BATCH_VIEWS[view], {} if view in ('weekly-results', 'team-matrix') else [])
+            if fields:
+                value = project_fields(value, fields)
+            return app.json.dumps(value)
+        
+        encoded = serialized_view_cache.get(version, (view, fields, view_team), build)
+        parts.append(f"{app.json.dumps(view)}:{encoded}")
+    
+    parts.append(f'"last_updated":{app.json.dumps(data.get("last_updated"))}')
+    parts.append(f'"version":{app.json.dumps(version)}')
+    response = make_response('{' + ','.join(parts) + '}')
+    response.mimetype = 'application/json'
+    
+    # The same query against the same data version is answered with a 304
+    query = request.query_string.decode('utf-8', 'replace')
+    response.set_etag(hashlib.sha256(f"{version}?{query}".encode('utf-8')).hexdigest()[:16])
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 def _format_api_response(data, data_key, wrapper_key):
     """Format API response with consistent structure"""
@@ -90,12 +371,36 @@ def _format_api_response(data, data_key, wrapper_key):
 @app.route('/api/data')
 def get_data():
     """API endpoint to get all dashboard data"""
-    data, error = _get_cached_data_with_error_handling()
+    data, version, error = _get_cached_data_with_error_handling()
     if error:
         return error
     
-    # Add featured team info to the main data endpoint
+    requested_version = request.args.get('version')
+    if requested_version:
+        # Any version retained in the snapshot history, e.g. to compare with the live one
+        snapshot = data if requested_version == version else data_scheduler.get_version(requested_version)
+        if snapshot is None:
+            return jsonify({'error': f"Unknown version: {requested_version}"}), 404
+        response = jsonify({**snapshot, 'version': requested_version, 'featured_team_name': Config.FEATURED_TEAM,
+                            'featured_team_key': Config.FEATURED_TEAM_KEY})
+        response.headers['X-Data-Version'] = requested_version
+        return response
+    
+    team = request.args.get('team')
+    if team:
+        featured_matches, team_name = _featured_team_view(data, version, team)
+        if team_name is None:
+            return jsonify({'error': 'Unknown team'}), 404
+        # Copy, so the cached data keeps the configured featured team
+        data = dict(data)
+        data['featured_team_matches'] = featured_matches
+        data['featured_team_name'] = team_name
+        data['featured_team_key'] = team
+        return _format_api_response(data, None, None)
+    
+    # Add featured team info to the main data endpoint; copy, so retained snapshots stay as stored
     if data:
+        data = dict(data)
         data['featured_team_name'] = Config.FEATURED_TEAM
         data['featured_team_key'] = Config.FEATURED_TEAM_KEY
     
@@ -104,7 +409,7 @@ def get_data():
 @app.route('/api/standings')
 def get_standings():
     """Get league table standings"""
-    data, error = _get_cached_data_with_error_handling()
+    data, _, error = _get_cached_data_with_error_handling()
     if error:
         return error
     return _format_api_response(data, 'league_table', 'league_table')
@@ -112,7 +417,7 @@ def get_standings():
 @app.route('/api/period-standings')
 def get_period_standings():
     """Get period standings where matches have been played"""
-    data, error = _get_cached_data_with_error_handling()
+    data, _, error = _get_cached_data_with_error_handling()
     if error:
         return error
     return _format_api_response(data, 'period_standings', 'period_standings')
@@ -120,7 +425,7 @@ def get_period_standings():
 @app.route('/api/last-week-results')
 def get_last_week_results():
     """Get results from the last week"""
-    data, error = _get_cached_data_with_error_handling()
+    data, _, error = _get_cached_data_with_error_handling()
     if error:
         return error
     return _format_api_response(data, 'last_week_results', 'results')
@@ -128,31 +433,47 @@ def get_last_week_results():
 @app.route('/api/next-week-matches')
 def get_next_week_matches():
     """Get matches for the next week"""
-    data, error = _get_cached_data_with_error_handling()
+    data, _, error = _get_cached_data_with_error_handling()
     if error:
         return error
     return _format_api_response(data, 'next_week_matches', 'matches')
 
 @app.route('/api/featured-team-matches')
 def get_featured_team_matches_api():
-    """Get all featured team matches (dynamic based on USE_TEST_DATA)"""
-    data, error = _get_cached_data_with_error_handling()
+    """Get all featured team matches (dynamic based on USE_TEST_DATA, or ?team=<id>)"""
+    data, version, error = _get_cached_data_with_error_handling()
     if error:
         return error
     
-    featured_data = data.get('featured_team_matches', {})
+    team = request.args.get('team')
+    if team:
+        featured_data, team_name = _featured_team_view(data, version, team)
+        if team_name is None:
+            return jsonify({'error': 'Unknown team'}), 404
+        team_key = team
+    else:
+        featured_data = data.get('featured_team_matches', {})
+        team_name, team_key = Config.FEATURED_TEAM, Config.FEATURED_TEAM_KEY
     
     return jsonify({
         'featured_team_matches': featured_data,
-        'featured_team_name': Config.FEATURED_TEAM,
-        'featured_team_key': Config.FEATURED_TEAM_KEY,
+        'featured_team_name': team_name,
+        'featured_team_key': team_key,
         'last_updated': data.get('last_updated')
     })
 
+@app.route('/api/batch')
+def get_batch():
+    """Several views in one response: ?views=standings,team-matrix&fields=team,points,all-matches.date"""
+    data, version, error = _get_cached_data_with_error_handling()
+    if error:
+        return error
+    return _batch_response(data, version, request.args.get('team'))
+
 @app.route('/api/weekly-results')
 def get_weekly_results():
     """Get results grouped by week number"""
-    data, error = _get_cached_data_with_error_handling()
+    data, _, error = _get_cached_data_with_error_handling()
     if error:
         return error
     return _format_api_response(data, 'weekly_results', 'weekly_results')
@@ -160,19 +481,207 @@ def get_weekly_results():
 @app.route('/api/team-matrix')
 def get_team_matrix():
     """Get team vs team matrix"""
-    data, error = _get_cached_data_with_error_handling()
+    data, _, error = _get_cached_data_with_error_handling()
     if error:
         return error
     return _format_api_response(data, 'team_matrix', 'team_matrix')
 
 @app.route('/api/all-matches')
 def get_all_matches():
-    """Get all matches (both played and upcoming)"""
-    data, error = _get_cached_data_with_error_handling()
+    """Get all matches (both played and upcoming).
+    
+    Any of ?from=&to=&team=&status=&limit=&cursor= switches to a filtered, paginated response."""
+    data, version, error = _get_cached_data_with_error_handling()
     if error:
         return error
+    if any(arg in request.args for arg in ALL_MATCHES_QUERY_ARGS):
+        return _all_matches_page(data, version)
     return _format_api_response(data, 'all_matches', 'matches')
 
+def _projections_response(data, version):
+    """Final-position probabilities for a data version, simulated once per version"""
+    projection = projection_cache.get(data, version)
+    return jsonify({**projection, 'last_updated': data.get('last_updated'), 'version': version})
+
+@app.route('/api/projections')
+def get_projections():
+    """Chance of every final league position per team, from Monte Carlo season simulations"""
+    data, version, error = _get_cached_data_with_error_handling()
+    if error:
+        return error
+    return _projections_response(data, version)
+
+def _team_stats_response(competition, data, version, team):
+    """Home/away splits and streaks of a team, kept up to date per data version"""
+    stats = team_stats_store.team_stats(competition, data, version, team)
+    if stats is None:
+        return jsonify({'error': f"Unknown team: {team}"}), 404
+    return jsonify({**stats, 'last_updated': data.get('last_updated'), 'version': version})
+
+@app.route('/api/team-stats/<team>')
+def get_team_stats(team):
+    """Home and away record, totals and streaks of a team this season"""
+    data, version, error = _get_cached_data_with_error_handling()
+    if error:
+        return error
+    return _team_stats_response(data_scheduler.competition, data, version, team)
+
+@app.route('/api/head-to-head/<team_a>/<team_b>')
+def get_head_to_head(team_a, team_b):
+    """This season's meetings of two teams: wins, draws, goals and the most recent results"""
+    data, version, error = _get_cached_data_with_error_handling()
+    if error:
+        return error
+    record = team_stats_store.head_to_head(data_scheduler.competition, data, version, team_a, team_b)
+    if record is None:
+        return jsonify({'error': f"Unknown teams: {team_a}, {team_b}"}), 404
+    return jsonify({**record, 'last_updated': data.get('last_updated'), 'version': version})
+
+@app.route('/api/export/<view>.<fmt>')
+def export_view(view, fmt):
+    """Download the league table, period standings, all matches or team matrix as CSV, XLSX or PDF.
+
+    The file is generated while it is sent, from the snapshot current at the start of the request."""
+    if view not in EXPORT_VIEWS or fmt not in EXPORT_FORMATS:
+        abort(404)
+    
+    data, version, error = _get_cached_data_with_error_handling()
+    if error:
+        return error
+    
+    response = Response(export_chunks(data, view, fmt), mimetype=EXPORT_FORMATS[fmt][0])
+    response.headers['Content-Disposition'] = f'attachment; filename="{view}.{fmt}"'
+    response.headers['X-Data-Version'] = version
+    return response
+
+# Server-rendered carousel slides
+@app.route('/slides')
+def get_slides():
+    """List the slides and their content hashes for the current data version"""
+    data, version, error = _get_cached_data_with_error_handling()
+    if error:
+        return error
+    
+    response = jsonify({
+        'version': version,
+        'slides': slide_cache.manifest(data, version),
+        'featured_team_name': Config.FEATURED_TEAM,
+        'featured_team_key': Config.FEATURED_TEAM_KEY
+    })
+    
+    # Unchanged refreshes are answered with an empty 304
+    response.set_etag(f"{version}-{Config.FEATURED_TEAM_KEY}")
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+@app.route('/slides/<name>')
+def get_slide(name):
+    """Get one pre-rendered slide as an HTML fragment"""
+    if name not in SLIDE_NAMES:
+        abort(404)
+    
+    data, version, error = _get_cached_data_with_error_handling()
+    if error:
+        return error
+    
+    fragment = slide_cache.get(name, data, version)
+    if fragment is None:
+        abort(404)
+    
+    fragment_hash = slide_cache.get_hash(name, data, version)
+    response = make_response(fragment)
+    response.headers['X-Data-Version'] = version
+    response.headers['X-Slide-Hash'] = fragment_hash
+    response.set_etag(fragment_hash)
+    if request.args.get('h') == fragment_hash:
+        # Requested by its content hash: this URL never changes
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    else:
+        response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+# Match history from the SQLite archive
+def _archived_team(team):
+    team_name = resolve_team(team, archive.team_names())
+    if team_name is None:
+        abort(make_response(jsonify({'error': f"Unknown team: {team}"}), 404))
+    return team_name
+
+def _history_limit():
+    return max(1, min(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), MAX_PAGE_SIZE))
+
+@app.route('/api/history/seasons')
+def get_history_seasons():
+    """Archived competitions and seasons with match counts"""
+    return jsonify({'seasons': archive.seasons()})
+
+@app.route('/api/history/teams/<team>/matches')
+def get_history_team_matches(team):
+    """A team's archived matches, newest first; ?from=&to=&limit="""
+    team_name = _archived_team(team)
+    matches = archive.team_matches(team_name, _parse_date_arg('from'), _parse_date_arg('to'), _history_limit())
+    return jsonify({'team': team_name, 'matches': matches})
+
+@app.route('/api/history/head-to-head/<team_a>/<team_b>')
+def get_history_head_to_head(team_a, team_b):
+    """All archived meetings of two teams, newest first"""
+    team_a, team_b = _archived_team(team_a), _archived_team(team_b)
+    return jsonify({'teams': [team_a, team_b], 'matches': archive.head_to_head(team_a, team_b, _history_limit())})
+
+@app.route('/api/history/standings')
+def get_history_standings():
+    """League table as it was at ?at=YYYY-MM-DD (default: latest) for ?competition="""
+    standings = archive.standings_at(request.args.get('competition', 'default'), _parse_date_arg('at'))
+    if standings is None:
+        return jsonify({'error': 'No archived standings'}), 404
+    return jsonify(standings)
+
+# League-scoped API for multi-club deployments
+@app.route('/<league>/<team>/api/<endpoint>')
+def get_league_api(league, team, endpoint):
+    """Serve an /api/<endpoint> view for any configured league, featuring the team in the URL"""
+    if league not in league_store or (endpoint not in ApiConfig.DATA_MAPPINGS and
+                                      endpoint not in ('featured-team-matches', 'batch', 'projections', 'team-stats')):
+        abort(404)
+    
+    data, version = league_store.get(league)
+    if not data:
+        return jsonify({'error': 'No data available'}), 500
+    
+    featured_matches, team_name = _featured_team_view(data, version, team)
+    if team_name is None:
+        abort(404)
+    
+    if endpoint == 'batch':
+        return _batch_response(data, version, team)
+    
+    if endpoint == 'projections':
+        return _projections_response(data, version)
+    
+    if endpoint == 'team-stats':
+        return _team_stats_response(f"league:{league}", data, version, team)
+    
+    if endpoint == 'featured-team-matches':
+        return jsonify({
+            'featured_team_matches': featured_matches,
+            'featured_team_name': team_name,
+            'featured_team_key': team,
+            'last_updated': data.get('last_updated')
+        })
+    
+    if endpoint == 'data':
+        # Copy, so the shared partition data keeps its own featured team view
+        data = dict(data)
+        data['featured_team_matches'] = featured_matches
+        data['featured_team_name'] = team_name
+        data['featured_team_key'] = team
+    
+    if endpoint == 'all-matches' and any(arg in request.args for arg in ALL_MATCHES_QUERY_ARGS):
+        return _all_matches_page(data, version)
+    
+    mapping = ApiConfig.DATA_MAPPINGS[endpoint]
+    return _format_api_response(data, mapping['key'], mapping['wrapper'])
+
 @app.route('/api/refresh')
 def refresh_data():
     """Force refresh of data"""
@@ -182,9 +691,65 @@ def refresh_data():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+# Admin endpoints
+def _require_admin():
+    """Reject admin requests without the configured ADMIN_TOKEN; without one the endpoints do not exist"""
+    if not Config.ADMIN_TOKEN:
+        abort(404)
+    token = request.headers.get('X-Admin-Token', '')
+    if not hmac.compare_digest(token, Config.ADMIN_TOKEN):
+        abort(403)
+
+@app.route('/admin/refresh-timings')
+def get_refresh_timings():
+    """Stage-level wall and CPU timings of recent refreshes, newest first"""
+    _require_admin()
+    return jsonify({'runs': refresh_history.recent()})
+
+def _snapshot_state():
+    history = data_scheduler.history
+    return {
+        'live': data_scheduler.data_version,
+        'pinned': history.pinned if history is not None else None,
+        'versions': history.versions() if history is not None else [],
+    }
+
+@app.route('/admin/snapshots')
+def get_snapshots():
+    """Retained snapshot versions, newest first, with the live and pinned version"""
+    _require_admin()
+    return jsonify(_snapshot_state())
+
+@app.route('/admin/snapshots/<version>/rollback', methods=['POST'])
+@csrf.exempt
+def rollback_snapshot(version):
+    """Serve a retained version until the next refresh"""
+    _require_admin()
+    if not data_scheduler.rollback(version):
+        return jsonify({'error': f"Unknown version: {version}"}), 404
+    return jsonify(_snapshot_state())
+
+@app.route('/admin/snapshots/<version>/pin', methods=['POST'])
+@csrf.exempt
+def pin_snapshot(version):
+    """Serve a retained version until it is unpinned; refreshes only add to the history"""
+    _require_admin()
+    if not data_scheduler.pin(version):
+        return jsonify({'error': f"Unknown version: {version}"}), 404
+    return jsonify(_snapshot_state())
+
+@app.route('/admin/snapshots/unpin', methods=['POST'])
+@csrf.exempt
+def unpin_snapshot():
+    """Release the pin and serve the newest retained version"""
+    _require_admin()
+    data_scheduler.unpin()
+    return jsonify(_snapshot_state())
+
 if __name__ == '__main__':
     # Start the data scheduler
     data_scheduler.start_scheduler()
+    league_store.start_scheduler()
     
     # Only enable debug mode in development
     debug_mode = os.getenv('FLASK_ENV', 'production') == 'development'
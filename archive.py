@@ -0,0 +1,284 @@
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from config import Config, ArchiveConfig
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS competitions (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS teams (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    competition_id INTEGER NOT NULL REFERENCES competitions(id),
+    season TEXT NOT NULL,
+    date TEXT NOT NULL,
+    kickoff TEXT,
+    home_team_id INTEGER NOT NULL REFERENCES teams(id),
+    away_team_id INTEGER NOT NULL REFERENCES teams(id),
+    home_goals INTEGER,
+    away_goals INTEGER,
+    status TEXT NOT NULL,
+    UNIQUE (competition_id, date, home_team_id, away_team_id)
+);
+CREATE INDEX IF NOT EXISTS idx_matches_competition_date ON matches (competition_id, date);
+CREATE INDEX IF NOT EXISTS idx_matches_home_date ON matches (home_team_id, date);
+CREATE INDEX IF NOT EXISTS idx_matches_away_date ON matches (away_team_id, date);
+CREATE INDEX IF NOT EXISTS idx_matches_pair ON matches (home_team_id, away_team_id, date);
+CREATE TABLE IF NOT EXISTS table_snapshots (
+    id INTEGER PRIMARY KEY,
+    competition_id INTEGER NOT NULL REFERENCES competitions(id),
+    data_version TEXT NOT NULL,
+    taken_at TEXT NOT NULL,
+    UNIQUE (competition_id, data_version)
+);
+CREATE INDEX IF NOT EXISTS idx_table_snapshots_taken ON table_snapshots (competition_id, taken_at);
+CREATE TABLE IF NOT EXISTS table_rows (
+    snapshot_id INTEGER NOT NULL REFERENCES table_snapshots(id),
+    team_id INTEGER NOT NULL REFERENCES teams(id),
+    position INTEGER,
+    played INTEGER,
+    wins INTEGER,
+    draws INTEGER,
+    losses INTEGER,
+    goals_for INTEGER,
+    goals_against INTEGER,
+    points INTEGER,
+    PRIMARY KEY (snapshot_id, team_id)
+) WITHOUT ROWID;
+"""
+
+MATCH_COLUMNS = """
+    m.date, m.kickoff, m.season, c.key AS competition, h.name AS home, a.name AS away,
+    m.home_goals AS homeGoals, m.away_goals AS awayGoals, m.status
+"""
+
+
+def season_of(date):
+    """Season label of a match date; seasons run from July to June, e.g. '2024/2025'"""
+    year, month = int(date[:4]), int(date[5:7])
+    start = year if month >= 7 else year - 1
+    return f"{start}/{start + 1}"
+
+
+class Archive:
+    """Append-only SQLite history of every processed snapshot.
+
+    One writer connection ingests snapshots; reads use a small pool of read-only
+    connections, which WAL mode lets run while a snapshot is being written."""
+
+    def __init__(self, path, read_pool_size=ArchiveConfig.READ_POOL_SIZE):
+        self.path = path
+        self.read_pool_size = read_pool_size
+        self._writer = None
+        self._readers = None
+        self._write_lock = threading.Lock()
+        self._init_lock = threading.Lock()
+
+    def _connect(self, read_only=False):
+        connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        connection.row_factory = sqlite3.Row
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.execute('PRAGMA foreign_keys=ON')
+        if read_only:
+            connection.execute('PRAGMA query_only=ON')
+        return connection
+
+    def _ensure_open(self):
+        with self._init_lock:
+            if self._writer is not None:
+                return
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            writer = self._connect()
+            writer.executescript(SCHEMA)
+            readers = queue.Queue()
+            for _ in range(self.read_pool_size):
+                readers.put(self._connect(read_only=True))
+            self._writer, self._readers = writer, readers
+
+    @contextmanager
+    def reader(self):
+        """Borrow a read-only connection from the pool"""
+        self._ensure_open()
+        connection = self._readers.get()
+        try:
+            yield connection
+        finally:
+            self._readers.put(connection)
+
+    def _id(self, cursor, table, column, value):
+        cursor.execute(f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)", (value,))
+        return cursor.execute(f"SELECT id FROM {table} WHERE {column} = ?", (value,)).fetchone()[0]
+
+    def ingest(self, competition, processed_data, data_version):
+        """Add a processed snapshot; returns False if this data version is already archived"""
+        self._ensure_open()
+        raw_data = processed_data.get('raw_data') or {}
+        with self._write_lock, self._writer:
+            cursor = self._writer.cursor()
+            competition_id = self._id(cursor, 'competitions', 'key', competition)
+            if cursor.execute("SELECT 1 FROM table_snapshots WHERE competition_id = ? AND data_version = ?",
+                              (competition_id, data_version)).fetchone():
+                return False
+
+            team_ids = {}
+
+            def team_id(name):
+                if name not in team_ids:
+                    team_ids[name] = self._id(cursor, 'teams', 'name', name)
+                return team_ids[name]
+
+            rows = []
+            for status, matches in (('upcoming', raw_data.get('program', [])),
+                                    ('played', raw_data.get('results', []))):
+                for match in matches:
+                    home, away, day = match['home'], match['away'], match['date']
+                    if not (home and away and day):
+                        continue
+                    played = status == 'played'
+                    rows.append((competition_id, season_of(day), day, match['time'] or None,
+                                 team_id(home), team_id(away),
+                                 match['homeGoals'] if played else None,
+                                 match['awayGoals'] if played else None,
+                                 status))
+
+            # A fixture is inserted once and only updated when it gets played
+            cursor.executemany("""
+                INSERT INTO matches (competition_id, season, date, kickoff, home_team_id, away_team_id,
+                                     home_goals, away_goals, status)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (competition_id, date, home_team_id, away_team_id) DO UPDATE SET
+                    home_goals = excluded.home_goals, away_goals = excluded.away_goals, status = excluded.status
+                WHERE excluded.status = 'played'
+            """, rows)
+            self._drop_moved_fixtures(cursor, competition_id, rows)
+
+            taken_at = processed_data.get('last_updated') or datetime.now().isoformat()
+            cursor.execute("INSERT INTO table_snapshots (competition_id, data_version, taken_at) VALUES (?, ?, ?)",
+                           (competition_id, data_version, taken_at))
+            snapshot_id = cursor.lastrowid
+            cursor.executemany("""
+                INSERT OR REPLACE INTO table_rows (snapshot_id, team_id, position, played, wins, draws, losses,
+                                                   goals_for, goals_against, points)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(snapshot_id, team_id(row['team']), row['position'], row['played'], row['wins'],
+                   row['draws'], row['losses'], row['goals_for'], row['goals_against'], row['points'])
+                  for row in raw_data.get('leaguetable', []) if row['team']])
+
+        logger.info("Archived %d matches for %s, version %s", len(rows), competition, data_version)
+        return True
+
+    def _drop_moved_fixtures(self, cursor, competition_id, rows):
+        """Delete upcoming fixtures of the snapshot's seasons that it no longer lists.
+
+        A rescheduled fixture comes back under its new date; without this its row at the
+        old date would stay 'upcoming' for good. Played matches are never deleted."""
+        listed = {(row[2], row[4], row[5]) for row in rows}
+        seasons = sorted({row[1] for row in rows})
+        if not seasons:
+            return
+        placeholders = ', '.join('?' * len(seasons))
+        stale = [(match_id,) for match_id, day, home_id, away_id in cursor.execute(f"""
+            SELECT id, date, home_team_id, away_team_id FROM matches
+            WHERE competition_id = ? AND status = 'upcoming' AND season IN ({placeholders})
+        """, (competition_id, *seasons)).fetchall() if (day, home_id, away_id) not in listed]
+        cursor.executemany("DELETE FROM matches WHERE id = ?", stale)
+        if stale:
+            logger.info("Dropped %d fixtures that were moved or cancelled", len(stale))
+
+    def team_names(self):
+        with self.reader() as connection:
+            return [row[0] for row in connection.execute("SELECT name FROM teams ORDER BY name")]
+
+    def seasons(self):
+        """Archived competitions and seasons with their match counts"""
+        with self.reader() as connection:
+            rows = connection.execute("""
+                SELECT c.key AS competition, m.season, COUNT(*) AS matches,
+                       SUM(m.status = 'played') AS played, MIN(m.date) AS first_date, MAX(m.date) AS last_date
+                FROM matches m JOIN competitions c ON c.id = m.competition_id
+                GROUP BY c.key, m.season ORDER BY m.season DESC, c.key
+            """).fetchall()
+        return [dict(row) for row in rows]
+
+    def team_matches(self, team, date_from=None, date_to=None, limit=100):
+        """A team's matches in a date range, newest first, via the (team, date) indexes"""
+        date_from, date_to = date_from or '', date_to or '9999-12-31'
+        with self.reader() as connection:
+            rows = connection.execute(f"""
+                SELECT {MATCH_COLUMNS} FROM (
+                    SELECT * FROM matches WHERE home_team_id = (SELECT id FROM teams WHERE name = :team)
+                        AND date >= :date_from AND date <= :date_to
+                    UNION ALL
+                    SELECT * FROM matches WHERE away_team_id = (SELECT id FROM teams WHERE name = :team)
+                        AND date >= :date_from AND date <= :date_to
+                ) m
+                JOIN competitions c ON c.id = m.competition_id
+                JOIN teams h ON h.id = m.home_team_id
+                JOIN teams a ON a.id = m.away_team_id
+                ORDER BY m.date DESC LIMIT :limit
+            """, {'team': team, 'date_from': date_from, 'date_to': date_to, 'limit': limit}).fetchall()
+        return [dict(row) for row in rows]
+
+    def head_to_head(self, team_a, team_b, limit=100):
+        """All archived meetings of two teams, newest first, via the pair index"""
+        with self.reader() as connection:
+            rows = connection.execute(f"""
+                SELECT {MATCH_COLUMNS} FROM (
+                    SELECT * FROM matches
+                    WHERE home_team_id = (SELECT id FROM teams WHERE name = :a)
+                        AND away_team_id = (SELECT id FROM teams WHERE name = :b)
+                    UNION ALL
+                    SELECT * FROM matches
+                    WHERE home_team_id = (SELECT id FROM teams WHERE name = :b)
+                        AND away_team_id = (SELECT id FROM teams WHERE name = :a)
+                ) m
+                JOIN competitions c ON c.id = m.competition_id
+                JOIN teams h ON h.id = m.home_team_id
+                JOIN teams a ON a.id = m.away_team_id
+                ORDER BY m.date DESC LIMIT :limit
+            """, {'a': team_a, 'b': team_b, 'limit': limit}).fetchall()
+        return [dict(row) for row in rows]
+
+    def standings_at(self, competition, at=None):
+        """League table of the last snapshot taken at or before 'at' (default: the latest)"""
+        at = (at or '9999-12-31') + '\uffff'
+        with self.reader() as connection:
+            snapshot = connection.execute("""
+                SELECT s.id, s.taken_at, s.data_version FROM table_snapshots s
+                JOIN competitions c ON c.id = s.competition_id
+                WHERE c.key = ? AND s.taken_at <= ? ORDER BY s.taken_at DESC LIMIT 1
+            """, (competition, at)).fetchone()
+            if snapshot is None:
+                return None
+            rows = connection.execute("""
+                SELECT t.name AS team, r.position, r.played, r.wins, r.draws, r.losses,
+                       r.goals_for, r.goals_against, r.points
+                FROM table_rows r JOIN teams t ON t.id = r.team_id
+                WHERE r.snapshot_id = ? ORDER BY r.position
+            """, (snapshot['id'],)).fetchall()
+        return {'taken_at': snapshot['taken_at'], 'data_version': snapshot['data_version'],
+                'league_table': [dict(row) for row in rows]}
+
+
+def _sqlite_path(database_url):
+    """Path of a sqlite:/// DATABASE_URL, or None for anything else"""
+    if database_url and database_url.startswith('sqlite:///'):
+        return database_url[len('sqlite:///'):]
+    return None
+
+
+# Global archive; DATABASE_URL=sqlite:///path overrides the default file
+archive = Archive(_sqlite_path(Config.DATABASE_URL) or ArchiveConfig.PATH)
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the data processing pipeline.
+
+Times every view builder in hollandsevelden.py, fetch_and_process_data end to end,
+snapshot save/load and, for multiple competitions, a league refresh in-process versus
+in the process pool, on synthetic leagues of increasing size. Results can be
+stored as a baseline; later runs fail when a benchmark regresses beyond a threshold.
+Also compares the memory held by matches as dicts and as a compact MatchTable.
+
+    python benchmark.py                      # run and compare with the baseline
+    python benchmark.py --save-baseline      # run and store a new baseline
+    python benchmark.py --sizes small,large --threshold 0.5
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from hollandsevelden import (
+    get_filtered_period_standings,
+    get_last_week_results,
+    get_next_week_matches,
+    get_featured_team_matches,
+    get_weekly_results,
+    create_team_matrix,
+    get_all_matches
+)
+from config import ArchiveConfig
+from leagues import LeagueStore
+from match_table import MatchTable
+from scheduler import DataScheduler
+from synthetic_data import generate_competitions, generate_league
+
+DEFAULT_BASELINE_FILE = 'benchmark_baseline.json'
+DEFAULT_THRESHOLD = float(os.getenv('BENCHMARK_THRESHOLD', '0.25'))
+
+# Matches measured by the memory benchmark, and the minimum dict / MatchTable memory ratio
+MEMORY_BENCHMARK_MATCHES = 10000
+MEMORY_TARGET_RATIO = 5
+
+# League sizes: teams per competition, round-robin rounds, seasons of history, competitions
+BENCHMARK_SIZES = {
+    'small': {'num_teams': 14, 'rounds': 2, 'seasons': 1, 'competitions': 1},
+    'medium': {'num_teams': 18, 'rounds': 2, 'seasons': 5, 'competitions': 1},
+    'large': {'num_teams': 24, 'rounds': 4, 'seasons': 10, 'competitions': 1},
+    'multi': {'num_teams': 16, 'rounds': 2, 'seasons': 3, 'competitions': 20},
+}
+
+VIEW_FUNCTIONS = {
+    'period_standings': get_filtered_period_standings,
+    'last_week_results': get_last_week_results,
+    'next_week_matches': get_next_week_matches,
+    'featured_team_matches': get_featured_team_matches,
+    'weekly_results': get_weekly_results,
+    'team_matrix': create_team_matrix,
+    'all_matches': get_all_matches,
+}
+
+
+def time_call(func, repeat):
+    """Run func repeat times and return the wall time of each run in seconds"""
+    durations = []
+    for _ in range(repeat):
+        # Keep the pipeline's progress output out of the benchmark report
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            durations.append(time.perf_counter() - start)
+    return durations
+
+
+def _summarize(durations):
+    return {'median': statistics.median(durations), 'min': min(durations)}
+
+
+def benchmark_size(size, repeat):
+    """Run all benchmarks for one synthetic league size"""
+    options = dict(BENCHMARK_SIZES[size])
+    num_competitions = options.pop('competitions')
+    competitions = list(generate_competitions(num_competitions, **options).values())
+    num_matches = sum(len(raw['results']) + len(raw['program']) for raw in competitions)
+    print(f"\n[{size}] {num_competitions} competition(s), {num_matches} matches")
+
+    results = {}
+    for name, view_function in VIEW_FUNCTIONS.items():
+        results[f"{size}/{name}"] = _summarize(time_call(
+            lambda view_function=view_function: [view_function(raw) for raw in competitions], repeat))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        scheduler = DataScheduler(data_file=os.path.join(temp_dir, 'league_data.json'))
+
+        def process_all():
+            for raw in competitions:
+                scheduler.fetch_and_process_data(raw_data=raw)
+            if scheduler.cached_data is None:
+                raise RuntimeError("fetch_and_process_data did not produce data")
+
+        results[f"{size}/fetch_and_process_data"] = _summarize(time_call(process_all, repeat))
+
+        snapshot = scheduler.cached_data
+        results[f"{size}/snapshot_save"] = _summarize(time_call(lambda: scheduler.save_snapshot(snapshot), repeat))
+        results[f"{size}/snapshot_load"] = _summarize(time_call(scheduler.load_snapshot, repeat))
+
+        if num_competitions > 1:
+            store = LeagueStore({f"league-{index}": {'api_url': ''} for index in range(num_competitions)},
+                                snapshot_dir=os.path.join(temp_dir, 'snapshots'))
+            payloads = dict(zip(store.partitions, competitions, strict=True))
+            results[f"{size}/refresh_all_serial"] = _summarize(time_call(
+                lambda: store.refresh_all(payloads, workers=1), repeat))
+            results[f"{size}/refresh_all_pool"] = _summarize(time_call(
+                lambda: store.refresh_all(payloads), repeat))
+
+    for name, timing in results.items():
+        print(f"  {name:<40} median {timing['median'] * 1000:9.2f} ms   min {timing['min'] * 1000:9.2f} ms")
+    return results
+
+
+def _allocated_bytes(build):
+    """Bytes still allocated by the result of build(), measured with tracemalloc"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del result
+    return allocated
+
+
+def benchmark_match_memory(num_matches=MEMORY_BENCHMARK_MATCHES):
+    """Memory per match as dicts loaded from a snapshot versus a MatchTable; returns the ratio"""
+    raw = generate_league(num_teams=20, rounds=2, seasons=-(-num_matches // 380), played_fraction=0.8)
+    encoded = json.dumps((raw['results'] + raw['program'])[:num_matches])
+    matches = json.loads(encoded)
+
+    dict_bytes = _allocated_bytes(lambda: json.loads(encoded))
+    table_bytes = _allocated_bytes(lambda: MatchTable.from_matches(matches))
+    ratio = dict_bytes / table_bytes
+    print(f"\n[memory] {len(matches)} matches")
+    print(f"  {'dicts':<40} {dict_bytes / len(matches):9.1f} bytes/match")
+    print(f"  {'MatchTable':<40} {table_bytes / len(matches):9.1f} bytes/match   ({ratio:.1f}x smaller)")
+    return ratio
+
+
+def compare_with_baseline(results, baseline, threshold):
+    """Return (name, baseline, current) for every benchmark slower than baseline * (1 + threshold)"""
+    regressions = []
+    for name, timing in results.items():
+        reference = baseline.get(name)
+        if reference and timing['median'] > reference['median'] * (1 + threshold):
+            regressions.append((name, reference['median'], timing['median']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the SPMS data processing pipeline')
+    parser.add_argument('--sizes', default=','.join(BENCHMARK_SIZES),
+                        help=f"comma separated sizes to run ({', '.join(BENCHMARK_SIZES)})")
+    parser.add_argument('--repeat', type=int, default=5, help='runs per benchmark (median is compared)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_FILE, help='baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='allowed slowdown before failing, as a fraction (0.25 = 25%%)')
+    args = parser.parse_args(argv)
+
+    sizes = [size.strip() for size in args.sizes.split(',') if size.strip()]
+    unknown = [size for size in sizes if size not in BENCHMARK_SIZES]
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(unknown)}")
+
+    # Benchmark snapshots are synthetic; keep them out of the history archive
+    ArchiveConfig.ENABLED = False
+
+    print("=== SPMS BENCHMARK ===")
+    results = {}
+    for size in sizes:
+        results.update(benchmark_size(size, args.repeat))
+    memory_ratio = benchmark_match_memory()
+    if memory_ratio < MEMORY_TARGET_RATIO:
+        print(f"\nMatchTable is only {memory_ratio:.1f}x smaller than dicts, target {MEMORY_TARGET_RATIO}x")
+        return 1
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline found at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    regressions = compare_with_baseline(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n=== REGRESSIONS (threshold {args.threshold:.0%}) ===")
+        for name, reference, current in regressions:
+            print(f"  {name:<40} {reference * 1000:9.2f} ms -> {current * 1000:9.2f} ms "
+                  f"(+{(current / reference - 1):.0%})")
+        return 1
+
+    print(f"\nNo regressions beyond {args.threshold:.0%} compared to {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,116 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from config import UpstreamConfig
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Stops calling a failing upstream until it has had time to recover.
+
+    Closed: calls go through and consecutive failures are counted. After
+    failure_threshold failures in a row the breaker opens and calls are refused for
+    reset_timeout seconds. Then it is half-open: one probe call is let through, and
+    its outcome closes the breaker again or re-opens it for another timeout."""
+
+    def __init__(self, name, failure_threshold=UpstreamConfig.FAILURE_THRESHOLD,
+                 reset_timeout=UpstreamConfig.RESET_TIMEOUT_SECONDS, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None  # clock() when the breaker last opened
+        self.last_failure = None  # (ISO time, reason)
+        self.last_success = None  # ISO time
+        self.rejected_calls = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a call may go ahead now; a half-open breaker allows one probe at a time"""
+        with self._lock:
+            if self.state == OPEN:
+                if self._clock() - self.opened_at < self.reset_timeout:
+                    self.rejected_calls += 1
+                    return False
+                self.state = HALF_OPEN
+                logger.info("Circuit %s half-open, probing upstream", self.name)
+            if self.state == HALF_OPEN:
+                if self._probing:
+                    self.rejected_calls += 1
+                    return False
+                self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info("Circuit %s closed, upstream recovered", self.name)
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self._probing = False
+            self.last_success = datetime.now().isoformat(timespec='seconds')
+
+    def record_failure(self, reason):
+        with self._lock:
+            self.consecutive_failures += 1
+            self.last_failure = (datetime.now().isoformat(timespec='seconds'), reason)
+            self._probing = False
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    logger.warning("Circuit %s open after %d consecutive failures (%s); retrying in %.0f s",
+                                   self.name, self.consecutive_failures, reason, self.reset_timeout)
+                self.state = OPEN
+                self.opened_at = self._clock()
+
+    def status(self):
+        """State for health output"""
+        with self._lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = round(max(self.reset_timeout - (self._clock() - self.opened_at), 0), 1)
+            return {
+                'name': self.name,
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'retry_in_seconds': retry_in,
+                'last_failure': dict(zip(('at', 'reason'), self.last_failure, strict=True)) if self.last_failure else None,
+                'last_success': self.last_success,
+                'rejected_calls': self.rejected_calls,
+            }
+
+
+class BreakerRegistry:
+    """One circuit breaker per upstream URL"""
+
+    def __init__(self):
+        self.breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        with self._lock:
+            breaker = self.breakers.get(name)
+            if breaker is None:
+                breaker = self.breakers[name] = CircuitBreaker(name)
+            return breaker
+
+    def statuses(self):
+        with self._lock:
+            breakers = list(self.breakers.values())
+        return [breaker.status() for breaker in breakers]
+
+    def open_count(self):
+        with self._lock:
+            return sum(1 for breaker in self.breakers.values() if breaker.state != CLOSED)
+
+
+# Global breakers around the competition API
+upstream_breakers = BreakerRegistry()
@@ -5,10 +5,15 @@ load_dotenv()
 
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY')
+    ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')  # Required as X-Admin-Token on /admin endpoints; unset disables them
     DATABASE_URL = os.getenv('DATABASE_URL')
     FOOTBALL_DATA_API_KEY = os.getenv('FOOTBALL_DATA_API_KEY')
     USE_TEST_DATA = os.getenv('USE_TEST_DATA', 'false').lower() == 'true'
     
+    # Competition API; point at stub_api.py for load tests
+    COMPETITION_API_URL = os.getenv('HOLLANDSE_VELDEN_API_URL',
+                                    'https://api.hollandsevelden.nl/competities/2025-2026/oost/za/3n/')
+    
     # Screen display duration configuration
     SCREEN_DURATION_SECONDS = int(os.getenv('SCREEN_DURATION_SECONDS', '12'))
     
@@ -16,6 +21,19 @@ class Config:
     FEATURED_TEAM = 'VV Gorecht' if USE_TEST_DATA else 'AVV Columbia'
     FEATURED_TEAM_KEY = 'gorecht' if USE_TEST_DATA else 'columbia'
 
+class ApiConfig:
+    """Views served on /api/<endpoint>: snapshot key and response wrapper key; None returns all data"""
+    DATA_MAPPINGS = {
+        'data': {'key': None, 'wrapper': None},
+        'standings': {'key': 'league_table', 'wrapper': 'league_table'},
+        'period-standings': {'key': 'period_standings', 'wrapper': 'period_standings'},
+        'last-week-results': {'key': 'last_week_results', 'wrapper': 'results'},
+        'next-week-matches': {'key': 'next_week_matches', 'wrapper': 'matches'},
+        'weekly-results': {'key': 'weekly_results', 'wrapper': 'weekly_results'},
+        'team-matrix': {'key': 'team_matrix', 'wrapper': 'team_matrix'},
+        'all-matches': {'key': 'all_matches', 'wrapper': 'matches'},
+    }
+
 class ScheduleConfig:
     """Schedule configuration for data fetching"""
     DAILY_UPDATE_TIME = "10:00"
@@ -26,8 +44,98 @@ class ScheduleConfig:
                       for minute in [0, 30]]
 
 class TeamFieldMappings:
-    """Standard field mappings for team data extraction"""
+    """Source field variants, mapped to one canonical name when records are normalized"""
     HOME_FIELDS = ['home', 'hometeam', 'home_team']
     AWAY_FIELDS = ['away', 'awayteam', 'away_team'] 
     HOME_SCORE_FIELDS = ['homeGoals', 'homescore', 'home_score']
     AWAY_SCORE_FIELDS = ['awayGoals', 'awayscore', 'away_score']
+    TEAM_FIELDS = ['team', 'name']
+
+class LogoConfig:
+    """Resized team logo configuration"""
+    CACHE_DIR = os.getenv('LOGO_CACHE_DIR', 'logo_cache')
+    CACHE_MAX_BYTES = int(os.getenv('LOGO_CACHE_MAX_MB', '64')) * 1024 * 1024
+    
+    # Only these pixel sizes can be requested, so the cache stays bounded
+    SIZES = (24, 32, 48, 64, 96, 128)
+    PREWARM_WORKERS = int(os.getenv('LOGO_PREWARM_WORKERS', '0')) or None
+
+class MetricsConfig:
+    """Prometheus /metrics configuration"""
+    # Displays poll every 30 minutes; a client counts as active for one interval plus slack
+    ACTIVE_CLIENT_WINDOW_SECONDS = int(os.getenv('METRICS_ACTIVE_CLIENT_WINDOW', '2100'))
+    # Clients tracked at most; past this the least recently seen are forgotten
+    MAX_ACTIVE_CLIENTS = int(os.getenv('METRICS_MAX_ACTIVE_CLIENTS', '10000'))
+
+class ProfilingConfig:
+    """Refresh pipeline timing and opt-in profiling"""
+    HISTORY_SIZE = int(os.getenv('REFRESH_HISTORY_SIZE', '50'))
+    
+    # PROFILE_REFRESH=cprofile|sample profiles the next PROFILE_REFRESH_COUNT refreshes
+    PROFILE_MODE = os.getenv('PROFILE_REFRESH', '').lower()
+    PROFILE_COUNT = int(os.getenv('PROFILE_REFRESH_COUNT', '1'))
+    SAMPLE_INTERVAL = float(os.getenv('PROFILE_SAMPLE_INTERVAL', '0.005'))
+    OUTPUT_DIR = os.getenv('PROFILE_OUTPUT_DIR', 'profiles')
+
+class LeagueConfig:
+    """Multi-league serving on /<league>/<team>/api/..."""
+    # JSON object of league id -> {"api_url": ...}; without it the configured competition is 'default'
+    LEAGUES_FILE = os.getenv('LEAGUES_FILE', 'leagues.json')
+    SNAPSHOT_DIR = os.getenv('LEAGUE_SNAPSHOT_DIR', 'snapshots')
+    
+    # Leagues not polled recently are dropped from memory once resident snapshots exceed the budget
+    MEMORY_BUDGET_BYTES = int(os.getenv('LEAGUE_MEMORY_BUDGET_MB', '256')) * 1024 * 1024
+    
+    # Views are built in a process pool (default: one worker per core); fetches run in threads
+    REFRESH_WORKERS = int(os.getenv('LEAGUE_REFRESH_WORKERS', '0')) or None
+    FETCH_CONCURRENCY = int(os.getenv('LEAGUE_FETCH_CONCURRENCY', '8'))
+
+class ArchiveConfig:
+    """SQLite history of every processed snapshot (DATABASE_URL=sqlite:///path overrides PATH)"""
+    ENABLED = os.getenv('ARCHIVE_ENABLED', 'true').lower() == 'true'
+    PATH = os.getenv('ARCHIVE_PATH', 'league_archive.db')
+    READ_POOL_SIZE = int(os.getenv('ARCHIVE_READ_POOL_SIZE', '4'))
+
+class SnapshotHistoryConfig:
+    """Recent processed snapshots kept for /api/data?version= and admin rollback"""
+    SIZE = int(os.getenv('SNAPSHOT_HISTORY_SIZE', '10'))  # 0 disables the history
+    DIR = os.getenv('SNAPSHOT_HISTORY_DIR', 'snapshot_history')
+
+class UpstreamConfig:
+    """Circuit breaker around the competition API"""
+    FAILURE_THRESHOLD = int(os.getenv('UPSTREAM_FAILURE_THRESHOLD', '3'))  # Consecutive failures that open it
+    RESET_TIMEOUT_SECONDS = float(os.getenv('UPSTREAM_RESET_TIMEOUT_SECONDS', '120'))  # Open time before a probe
+    TIMEOUT_SECONDS = float(os.getenv('UPSTREAM_TIMEOUT_SECONDS', '30'))  # Connect and read timeout per request
+
+class ResponseArchiveConfig:
+    """Compressed, content-addressed copies of every upstream API response, for replays"""
+    ENABLED = os.getenv('RESPONSE_ARCHIVE_ENABLED', 'true').lower() == 'true'
+    DIR = os.getenv('RESPONSE_ARCHIVE_DIR', 'upstream_responses')
+    COMPRESS_LEVEL = int(os.getenv('RESPONSE_ARCHIVE_COMPRESS_LEVEL', '6'))
+
+class ProjectionConfig:
+    """Monte Carlo projections of the final league table"""
+    SIMULATIONS = int(os.getenv('PROJECTION_SIMULATIONS', '100000'))
+    BATCH_SIZE = int(os.getenv('PROJECTION_BATCH_SIZE', '10000'))  # Seasons simulated per array batch
+    WORKERS = int(os.getenv('PROJECTION_WORKERS', '1'))  # >1 spreads batches over a process pool
+    SEED = int(os.getenv('PROJECTION_SEED', '2024'))
+    PRIOR_MATCHES = 5  # Matches of league-average form mixed into each team's strength
+    PROMOTION_PLACES = int(os.getenv('PROJECTION_PROMOTION_PLACES', '1'))
+    RELEGATION_PLACES = int(os.getenv('PROJECTION_RELEGATION_PLACES', '2'))
+
+class ExportConfig:
+    """Streamed CSV, XLSX and PDF exports"""
+    CHUNK_ROWS = int(os.getenv('EXPORT_CHUNK_ROWS', '500'))  # Rows per streamed CSV/XLSX chunk
+    PDF_ROWS_PER_PAGE = int(os.getenv('EXPORT_PDF_ROWS_PER_PAGE', '34'))
+
+class LoggingConfig:
+    """Structured logging configuration"""
+    LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    
+    # Per-module overrides, e.g. LOG_LEVELS=scheduler=DEBUG,test_data=WARNING
+    MODULE_LEVELS = os.getenv('LOG_LEVELS', '')
+    FORMAT = os.getenv('LOG_FORMAT', 'json').lower()  # json or text
+    
+    # Identical messages are logged at most once per interval (0 disables)
+    RATE_LIMIT_SECONDS = float(os.getenv('LOG_RATE_LIMIT_SECONDS', '60'))
+    QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
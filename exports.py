@@ -0,0 +1,259 @@
+import csv
+import io
+import zipfile
+from array import array
+from xml.sax.saxutils import escape
+from config import ExportConfig
+
+# Columns of the exported views: (header, record key)
+TABLE_COLUMNS = [('Pos', 'position'), ('Team', 'team'), ('Played', 'played'), ('W', 'wins'), ('D', 'draws'),
+                 ('L', 'losses'), ('GF', 'goals_for'), ('GA', 'goals_against'), ('Pts', 'points')]
+MATCH_COLUMNS = [('Date', 'date'), ('Time', 'time'), ('Home', 'home'), ('Away', 'away'),
+                 ('Home goals', 'homeGoals'), ('Away goals', 'awayGoals'), ('Status', 'status')]
+
+
+def _records(records, columns):
+    for record in records:
+        yield [record.get(key) for _, key in columns]
+
+
+def _league_table(data):
+    return [header for header, _ in TABLE_COLUMNS], _records(data.get('league_table') or [], TABLE_COLUMNS)
+
+
+def _period_standings(data):
+    def rows():
+        for period in data.get('period_standings') or []:
+            for row in _records(period.get('standings') or [], TABLE_COLUMNS):
+                yield [period.get('name')] + row
+    return ['Period'] + [header for header, _ in TABLE_COLUMNS], rows()
+
+
+def _all_matches(data):
+    return [header for header, _ in MATCH_COLUMNS], _records(data.get('all_matches') or [], MATCH_COLUMNS)
+
+
+def _team_matrix(data):
+    matrix = data.get('team_matrix') or {}
+    teams = matrix.get('teams') or []
+    cells = matrix.get('matrix') or {}
+
+    def rows():
+        for home in teams:
+            yield [home] + [cells.get(home, {}).get(away, '') if away != home else '' for away in teams]
+    return ['Home \\ Away'] + list(teams), rows()
+
+
+# Export name -> (title, view building (header, row iterator) from a processed snapshot)
+EXPORT_VIEWS = {
+    'league-table': ('League table', _league_table),
+    'period-standings': ('Period standings', _period_standings),
+    'all-matches': ('All matches', _all_matches),
+    'team-matrix': ('Team matrix', _team_matrix),
+}
+
+
+def _text(value):
+    return '' if value is None else str(value)
+
+
+def csv_chunks(header, rows, chunk_rows=ExportConfig.CHUNK_ROWS):
+    """CSV text in chunks of chunk_rows rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for number, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if number % chunk_rows == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+class _Sink:
+    """Write-only file that collects bytes until they are taken; not seekable, so
+    zipfile writes entries with data descriptors and never goes back"""
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self):
+        data = b''.join(self.parts)
+        self.parts = []
+        return data
+
+
+XLSX_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="xl/workbook.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+        '</Relationships>'),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+        '</Relationships>'),
+}
+
+
+def _xlsx_workbook(title):
+    sheet_name = escape(title[:31], {'"': '&quot;'})
+    return ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f'<sheets><sheet name="{sheet_name}" sheetId="1" r:id="rId1"/></sheets></workbook>')
+
+
+def _xlsx_cell(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f'<c><v>{value}</v></c>'
+    return f'<c t="inlineStr"><is><t>{escape(_text(value))}</t></is></c>'
+
+
+def _xlsx_row(row):
+    return ('<row>' + ''.join(_xlsx_cell(value) for value in row) + '</row>').encode('utf-8')
+
+
+def xlsx_chunks(title, header, rows, chunk_rows=ExportConfig.CHUNK_ROWS):
+    """A one-sheet XLSX workbook, zipped as it is written.
+
+    Cells are inline strings or numbers, so there is no shared string table to hold
+    back; the sheet part is compressed row by row and drained every chunk_rows rows."""
+    sink = _Sink()
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED) as workbook:
+        for name, content in XLSX_PARTS.items():
+            workbook.writestr(name, content)
+        workbook.writestr('xl/workbook.xml', _xlsx_workbook(title))
+        with workbook.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                        b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+            sheet.write(_xlsx_row(header))
+            for number, row in enumerate(rows, 1):
+                sheet.write(_xlsx_row(row))
+                if number % chunk_rows == 0:
+                    yield sink.take()
+            sheet.write(b'</sheetData></worksheet>')
+    yield sink.take()
+
+
+# A4 landscape in points; Helvetica's average glyph is about half the font size wide
+PDF_PAGE_WIDTH, PDF_PAGE_HEIGHT = 842, 595
+PDF_MARGIN = 36
+PDF_FONT_SIZE = 9
+PDF_LINE_HEIGHT = 14
+
+
+def _pdf_string(value):
+    text = _text(value).encode('cp1252', 'replace')
+    return b'(' + text.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+
+class _PDFWriter:
+    """Numbers PDF objects and remembers their offsets for the cross-reference table"""
+
+    def __init__(self, objects):
+        self.offsets = array('q', [0]) * objects
+        self.position = 0
+
+    def raw(self, data):
+        self.position += len(data)
+        return data
+
+    def object(self, number, body):
+        if number >= len(self.offsets):
+            self.offsets.extend([0] * len(self.offsets))
+        self.offsets[number] = self.position
+        return self.raw(b'%d 0 obj\n' % number + body + b'\nendobj\n')
+
+
+def pdf_chunks(title, header, rows, rows_per_page=ExportConfig.PDF_ROWS_PER_PAGE):
+    """A PDF with one table page per rows_per_page rows, written page by page.
+
+    Pages take the object numbers 5, 7, 9, ... after their content streams, so only the
+    byte offsets of the objects are kept until the page tree and the cross-reference
+    table are written at the end."""
+    writer = _PDFWriter(64)
+    column_width = (PDF_PAGE_WIDTH - 2 * PDF_MARGIN) / max(len(header), 1)
+    max_chars = max(int(column_width / (PDF_FONT_SIZE * 0.5)) - 1, 1)
+    page_count = 0
+    next_object = 4  # 1 catalog, 2 page tree, 3 font
+
+    yield writer.raw(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+    yield writer.object(1, b'<< /Type /Catalog /Pages 2 0 R >>')
+    yield writer.object(3, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>')
+
+    def page(lines, page_number):
+        y = PDF_PAGE_HEIGHT - PDF_MARGIN
+        commands = [b'BT /F1 12 Tf %d %d Td %s Tj ET' % (PDF_MARGIN, y, _pdf_string(f"{title} - page {page_number}"))]
+        for line_number, line in enumerate([header] + lines):
+            y -= PDF_LINE_HEIGHT + (6 if line_number == 1 else 0)
+            for column, value in enumerate(line):
+                commands.append(b'BT /F1 %d Tf %.1f %d Td %s Tj ET' % (
+                    PDF_FONT_SIZE, PDF_MARGIN + column * column_width, y, _pdf_string(_text(value)[:max_chars])))
+        return b'\n'.join(commands)
+
+    def emit(lines):
+        nonlocal next_object, page_count
+        page_count += 1
+        content = page(lines, page_count)
+        content_number, page_number = next_object, next_object + 1
+        next_object += 2
+        return (writer.object(content_number, b'<< /Length %d >>\nstream\n' % len(content) + content + b'\nendstream')
+                + writer.object(page_number, b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] '
+                                             b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>'
+                                % (PDF_PAGE_WIDTH, PDF_PAGE_HEIGHT, content_number)))
+
+    lines = []
+    for row in rows:
+        lines.append(row)
+        if len(lines) == rows_per_page:
+            yield emit(lines)
+            lines = []
+    if lines or not page_count:
+        yield emit(lines)
+
+    kids = b' '.join(b'%d 0 R' % number for number in range(5, next_object, 2))
+    yield writer.object(2, b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, page_count))
+
+    xref_offset = writer.position
+    yield b'xref\n0 %d\n0000000000 65535 f \n' % next_object
+    for start in range(1, next_object, ExportConfig.CHUNK_ROWS):
+        yield b''.join(b'%010d 00000 n \n' % writer.offsets[number]
+                       for number in range(start, min(start + ExportConfig.CHUNK_ROWS, next_object)))
+    yield b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (next_object, xref_offset)
+
+
+# Format -> (mimetype, writer taking (title, header, rows))
+EXPORT_FORMATS = {
+    'csv': ('text/csv', lambda _title, header, rows: csv_chunks(header, rows)),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', xlsx_chunks),
+    'pdf': ('application/pdf', pdf_chunks),
+}
+
+
+def export_chunks(data, view, fmt):
+    """Byte chunks of a view of a processed snapshot in one of EXPORT_FORMATS"""
+    title, build = EXPORT_VIEWS[view]
+    header, rows = build(data)
+    return EXPORT_FORMATS[fmt][1](title, header, rows)
@@ -1,75 +1,153 @@
 import requests
 import json
+import logging
 import os
+import time
 from datetime import datetime, timedelta
 from test_data import get_test_data
+from circuit_breaker import upstream_breakers
 from dotenv import load_dotenv
-from config import Config, TeamFieldMappings
+from config import Config, ResponseArchiveConfig, UpstreamConfig
+from metrics import UPSTREAM_FETCH_DURATION, UPSTREAM_FETCH_TOTAL
+from profiling import stage
+from json_stream import JSONStreamReader, iter_text
+from normalize import COMPETITION_SECTIONS, normalize_section
+from response_archive import response_archive
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
 
-def get_data(use_test_data=None):
-    """Fetch data from API or use test data based on configuration"""
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _record_fetch(outcome, start):
+    """Record duration and outcome of a competition API fetch"""
+    UPSTREAM_FETCH_DURATION.observe(time.perf_counter() - start, outcome=outcome)
+    UPSTREAM_FETCH_TOTAL.inc(outcome=outcome)
+
+
+def _start_recording(url):
+    """A recorder for the response archive, or None when recording is off or not possible"""
+    if not ResponseArchiveConfig.ENABLED:
+        return None
+    try:
+        return response_archive.recorder(url)
+    except OSError as e:
+        logger.warning("Cannot record upstream response: %s", e)
+        return None
+
+
+def _finish_recording(recorder, body):
+    """Read what the parser left of a recorded body and store the response"""
+    with stage('record_response'):
+        try:
+            for _ in body:
+                pass
+        except Exception:
+            recorder.abort()
+            raise
+        try:
+            recorder.finish(200)
+        except OSError as e:
+            logger.warning("Cannot store upstream response: %s", e)
+
+
+def get_data(use_test_data=None, api_url=None):
+    """Fetch data from the API, or use test data in test mode.
+    
+    Returns None when the API fails or its circuit breaker is open; the caller keeps
+    serving its last good snapshot instead of processing a different league."""
     
     # Check if we should use test data
     if use_test_data is None:
         use_test_data = os.getenv('USE_TEST_DATA', 'false').lower() == 'true'
     
     if use_test_data:
-        return get_test_data()
+        UPSTREAM_FETCH_TOTAL.inc(outcome='test_data')
+        with stage('load_test_data'):
+            return get_test_data()
     
     # Use real API data
     user_agent = "Mozilla/5.0 (Macintosh; Intel Mac OS X x.y; rv:42.0) Gecko/20100101 Firefox/42.0"
     x_api_key = os.getenv('HOLLANDSE_VELDEN_API_KEY', 'b73ibxfaivpaa7a68pbapckgpt0q947y')
-    apiUrl = 'https://api.hollandsevelden.nl/competities/2025-2026/oost/za/3n/'
+    apiUrl = api_url or Config.COMPETITION_API_URL
     
+    breaker = upstream_breakers.get(apiUrl)
+    if not breaker.allow():
+        UPSTREAM_FETCH_TOTAL.inc(outcome='circuit_open')
+        logger.debug("Circuit for %s is open, skipping fetch", apiUrl)
+        return None
+    
+    start = time.perf_counter()
     try:
-        response = requests.get(apiUrl, headers={"User-Agent": user_agent, "x-api-key": x_api_key})
-        
-        if response.status_code != 200:
-            return get_test_data()
-        
-        try:
-            data = json.loads(response.text)
-        except json.JSONDecodeError:
-            return get_test_data()
-        
-        result = {}
+        with stage('http_request'):
+            response = requests.get(apiUrl, headers={"User-Agent": user_agent, "x-api-key": x_api_key},
+                                    stream=True, timeout=UpstreamConfig.TIMEOUT_SECONDS)
         
-        for k, v in data.items():
-            # Normalize league table structure to match test data format
-            leaguetable = v.get('leaguetable', [])
-            normalized_leaguetable = []
-            for team in leaguetable:
-                normalized_team = {
-                    'team': team.get('name', team.get('team', '')),  # Normalize name field
-                    'position': team.get('position', 0),
-                    'played': team.get('matches', team.get('played', 0)),  # matches -> played
-                    'wins': team.get('wins', 0),
-                    'draws': team.get('ties', team.get('draws', 0)),  # ties -> draws
-                    'losses': team.get('losses', 0),
-                    'goals_for': team.get('goalsFor', team.get('goals_for', 0)),
-                    'goals_against': team.get('goalsAgainst', team.get('goals_against', 0)),
-                    'points': team.get('points', 0)
-                }
-                normalized_leaguetable.append(normalized_team)
+        with response:
+            if response.status_code != 200:
+                _record_fetch('http_error', start)
+                breaker.record_failure(f"HTTP {response.status_code}")
+                logger.warning("Competition API returned HTTP %s", response.status_code)
+                return None
             
-            result = {
-                'leaguetable': normalized_leaguetable,
-                'period1': v.get('period1', []),
-                'period2': v.get('period2', []),
-                'period3': v.get('period3', []),
-                'results': v.get('results', []),
-                'program': v.get('program', [])
-            }
-            break
+            body = response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+            recorder = _start_recording(apiUrl)
+            if recorder is not None:
+                body = recorder.tee(body)
+            
+            try:
+                # Parse while the body downloads, keeping only the records we use
+                with stage('stream_parse'):
+                    chunks = iter_text(body, response.encoding or 'utf-8')
+                    result = parse_competition(JSONStreamReader(chunks))
+            except json.JSONDecodeError:
+                _record_fetch('decode_error', start)
+                breaker.record_failure('invalid JSON')
+                logger.warning("Competition API returned invalid JSON")
+                if recorder is not None:
+                    # Keep the whole body, so the failure can be replayed
+                    _finish_recording(recorder, body)
+                return None
+            except BaseException:
+                if recorder is not None:
+                    recorder.abort()
+                raise
+            
+            if recorder is not None:
+                _finish_recording(recorder, body)
         
+        _record_fetch('success', start)
+        breaker.record_success()
         return result
         
-    except Exception:
-        return get_test_data()
+    except Exception as e:
+        _record_fetch('exception', start)
+        breaker.record_failure(type(e).__name__)
+        logger.warning("Competition API request failed: %s", e)
+        return None
+
+
+def parse_competition(reader):
+    """Read the first competition of an API payload from a JSONStreamReader.
+    
+    Matches and table rows are normalized as they are read; sections we never use
+    (meta, links, period4) and any further competitions are skipped unparsed."""
+    result = {}
+    for _ in reader.iter_object():
+        if result:
+            reader.skip_value()
+            continue
+        
+        result = {section: [] for section in COMPETITION_SECTIONS}
+        for section in reader.iter_object():
+            if section in result:
+                result[section] = normalize_section(section, reader.iter_array())
+            else:
+                reader.skip_value()
+    return result
 
 
 def get_filtered_period_standings(data):
@@ -83,7 +161,7 @@ def get_filtered_period_standings(data):
         period_data = data.get(period_name, [])
         if period_data:
             # Check if any team has played at least 1 match
-            has_matches = any(team.get('played', 0) > 0 for team in period_data)
+            has_matches = any(team['played'] > 0 for team in period_data)
             if has_matches:
                 filtered_periods.append({
                     'name': period_name.replace('period', 'Periode '),
@@ -100,15 +178,15 @@ def get_last_week_results(data):
     
     # In test mode, return all results since test data is not current
     if Config.USE_TEST_DATA:
-        print(f"Test mode: returning all {len(data['results'])} results")
-        return sorted(data['results'], key=lambda x: x.get('date', ''))
+        logger.debug("Test mode: returning all %d results", len(data['results']))
+        return sorted(data['results'], key=lambda x: x['date'])
     
     today = datetime.now()
     week_ago = today - timedelta(days=7)
     
     last_week_results = []
     for match in data['results']:
-        match_date_str = match.get('date', '')
+        match_date_str = match['date']
         if match_date_str:
             try:
                 match_date = datetime.strptime(match_date_str, '%Y-%m-%d')
@@ -117,21 +195,12 @@ def get_last_week_results(data):
             except ValueError:
                 continue
     
-    return sorted(last_week_results, key=lambda x: x.get('date', ''))
+    return sorted(last_week_results, key=lambda x: x['date'])
 
 
 def _parse_match_date(date_str):
-    """Parse match date string to datetime object"""
-    if not date_str:
-        return None
-    
-    try:
-        if ' ' in date_str:
-            return datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
-        else:
-            return datetime.strptime(date_str, '%Y-%m-%d')
-    except ValueError:
-        return None
+    """Parse a normalized 'YYYY-MM-DD' match date; None for matches without a date"""
+    return datetime.strptime(date_str, '%Y-%m-%d') if date_str else None
 
 def _normalize_to_date_only(dt):
     """Normalize datetime to date only for comparison"""
@@ -145,7 +214,7 @@ def _find_future_matches(matches, today):
     all_program_matches = []
     
     for match in matches:
-        match_date = _parse_match_date(match.get('date', ''))
+        match_date = _parse_match_date(match['date'])
         if match_date is None:
             continue
             
@@ -175,7 +244,7 @@ def _group_matches_by_week(matches, first_match_week, first_match_year, min_matc
             return f"Week {week_num}"
     
     for match in matches:
-        match_date = _parse_match_date(match.get('date', ''))
+        match_date = _parse_match_date(match['date'])
         if match_date is None:
             continue
             
@@ -241,11 +310,11 @@ def get_next_week_matches(data):
         return []
 
     # Sort future matches by date
-    future_matches = sorted(future_matches, key=lambda x: x.get('date', ''))
+    future_matches = sorted(future_matches, key=lambda x: x['date'])
 
     # Step 2: Find the first match and determine its week
     first_match = future_matches[0]
-    first_match_date = _parse_match_date(first_match.get('date', ''))
+    first_match_date = _parse_match_date(first_match['date'])
     
     if first_match_date is None:
         return []
@@ -258,27 +327,16 @@ def get_next_week_matches(data):
     return _format_weekly_matches(matches_by_week)
 
 
-def _get_team_name_from_match(match, field_variations):
-    """Extract team name from match using various field name variations"""
-    for field in field_variations:
-        team = match.get(field, '')
-        if team:
-            return team
-    return ''
-
 def _is_featured_team_match(match, featured_team):
     """Check if match involves the featured team"""
-    home_team = _get_team_name_from_match(match, TeamFieldMappings.HOME_FIELDS)
-    away_team = _get_team_name_from_match(match, TeamFieldMappings.AWAY_FIELDS)
-    
-    return featured_team in home_team or featured_team in away_team
+    return featured_team in match['home'] or featured_team in match['away']
 
-def get_featured_team_matches(data):
+def get_featured_team_matches(data, featured_team=None):
     """Get all featured team matches (played and upcoming) - team depends on USE_TEST_DATA"""
     if not data:
         return {'played': [], 'upcoming': []}
     
-    featured_team = Config.FEATURED_TEAM
+    featured_team = featured_team or Config.FEATURED_TEAM
     featured_played = []
     featured_upcoming = []
     
@@ -293,8 +351,8 @@ def get_featured_team_matches(data):
             featured_upcoming.append(match)
     
     return {
-        'played': sorted(featured_played, key=lambda x: x.get('date', '')),
-        'upcoming': sorted(featured_upcoming, key=lambda x: x.get('date', ''))
+        'played': sorted(featured_played, key=lambda x: x['date']),
+        'upcoming': sorted(featured_upcoming, key=lambda x: x['date'])
     }
 
 
@@ -306,7 +364,7 @@ def get_weekly_results(data):
     weekly_results = {}
     
     for match in data['results']:
-        match_date_str = match.get('date', '')
+        match_date_str = match['date']
         if match_date_str:
             try:
                 match_date = datetime.strptime(match_date_str, '%Y-%m-%d')
@@ -324,7 +382,7 @@ def get_weekly_results(data):
     
     # Sort matches within each week by date
     for week in weekly_results:
-        weekly_results[week] = sorted(weekly_results[week], key=lambda x: x.get('date', ''))
+        weekly_results[week] = sorted(weekly_results[week], key=lambda x: x['date'])
     
     return weekly_results
 
@@ -349,7 +407,7 @@ def get_all_matches(data):
         all_matches.append(match_info)
     
     # Sort all matches by date
-    return sorted(all_matches, key=lambda x: x.get('date', ''))
+    return sorted(all_matches, key=lambda x: x['date'])
 
 
 def create_team_matrix(data):
@@ -360,7 +418,7 @@ def create_team_matrix(data):
     # Get all teams from league table
     teams = []
     for team in data.get('leaguetable', []):
-        team_name = team.get('name', team.get('team', ''))
+        team_name = team['team']
         if team_name:
             teams.append(team_name)
     
@@ -389,54 +447,33 @@ def _find_team_in_matrix(team_name, teams_list):
             return team
     return None
 
-def _get_score_from_match(match, field_variations):
-    """Try multiple score field variations and handle None/0 correctly"""
-    for field in field_variations:
-        score = match.get(field)
-        if score is not None and score != '':  # Accept 0 as valid score
-            return str(score)
-    return None
-
 def _populate_team_matrix_with_matches(matrix, teams, data):
     """Populate matrix with match results and upcoming matches"""
     
     # Fill matrix with results
     for match in data.get('results', []):
-        home_raw = _get_team_name_from_match(match, TeamFieldMappings.HOME_FIELDS)
-        away_raw = _get_team_name_from_match(match, TeamFieldMappings.AWAY_FIELDS)
-        
         # Find matching team names in matrix
-        home = _find_team_in_matrix(home_raw, teams)
-        away = _find_team_in_matrix(away_raw, teams)
+        home = _find_team_in_matrix(match['home'], teams)
+        away = _find_team_in_matrix(match['away'], teams)
         
         if not home or not away:
             continue  # Skip if teams not found
         
-        home_score = _get_score_from_match(match, TeamFieldMappings.HOME_SCORE_FIELDS)
-        away_score = _get_score_from_match(match, TeamFieldMappings.AWAY_SCORE_FIELDS)
-        
         # Only create score if both scores are available
-        if (home in matrix and away in matrix[home] and 
-            home_score is not None and away_score is not None):
-            matrix[home][away] = f"{home_score}-{away_score}"
+        if (home in matrix and away in matrix[home] and
+                match['homeGoals'] is not None and match['awayGoals'] is not None):
+            matrix[home][away] = f"{match['homeGoals']}-{match['awayGoals']}"
     
     # Fill matrix with upcoming matches
     for match in data.get('program', []):
-        home_raw = _get_team_name_from_match(match, TeamFieldMappings.HOME_FIELDS)
-        away_raw = _get_team_name_from_match(match, TeamFieldMappings.AWAY_FIELDS)
-        
         # Find matching team names in matrix
-        home = _find_team_in_matrix(home_raw, teams)
-        away = _find_team_in_matrix(away_raw, teams)
+        home = _find_team_in_matrix(match['home'], teams)
+        away = _find_team_in_matrix(match['away'], teams)
         
         if not home or not away:
             continue  # Skip if teams not found
         
-        date = match.get('date', '')
-        
-        # Convert datetime to just date for display
-        if date and ' ' in date:
-            date = date.split(' ')[0]
+        date = match['date']
         
         # Only add date if no result exists yet
         if home in matrix and away in matrix[home] and matrix[home][away] is None:
@@ -445,5 +482,7 @@ def _populate_team_matrix_with_matches(matrix, teams, data):
     return {'teams': teams, 'matrix': matrix}
 
 if __name__ == "__main__":
-    print("Started MAIN!")
+    from logging_setup import configure_logging
+    configure_logging()
+    logger.info("Started MAIN!")
     get_data()
\ No newline at end of file
@@ -0,0 +1,158 @@
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import date
+from match_table import MatchTable, as_match_table
+from normalize import team_key, team_slug
+
+
+# Upper bound on matches per /api/all-matches page
+MAX_PAGE_SIZE = 500
+DEFAULT_PAGE_SIZE = 100
+
+
+class AmbiguousTeamError(LookupError):
+    """A team identifier that matches more than one team"""
+
+    def __init__(self, identifier, candidates):
+        super().__init__(f"Ambiguous team: {identifier}")
+        self.identifier = identifier
+        self.candidates = candidates
+
+
+def resolve_team(identifier, names):
+    """Map a team identifier (name, slug or key, see team_key) to one of names, or None.
+
+    A name or slug match wins over a key match; AmbiguousTeamError if several teams match
+    equally well. Parts of names are not matched, so 'vv' is no team at all."""
+    identifier = (identifier or '').strip()
+    slug = team_slug(identifier)
+    if not slug:
+        return None
+    for matches in ([name for name in names if identifier.lower() == name.lower() or slug == team_slug(name)],
+                    [name for name in names if slug == team_key(name)]):
+        if len(matches) > 1:
+            raise AmbiguousTeamError(identifier, sorted(matches))
+        if matches:
+            return matches[0]
+    return None
+
+
+class TeamIndex:
+    """Positions of each team's played and upcoming matches, built in one pass over a season.
+
+    Matches are kept in the season's match tables; only the requested team's matches are
+    turned back into dicts."""
+
+    def __init__(self, raw_data):
+        self.tables = {'played': as_match_table((raw_data or {}).get('results')),
+                       'upcoming': as_match_table((raw_data or {}).get('program'))}
+        self.positions = {}
+        for status, table in self.tables.items():
+            for position in range(len(table)):
+                for team in set(table.team_names(position)) - {''}:
+                    self._lists(team)[status].append(position)
+
+        for lists in self.positions.values():
+            for status, positions in lists.items():
+                lists[status] = array('i', sorted(positions, key=self.tables[status].days.__getitem__))
+        self.names = sorted(self.positions)
+
+    def _lists(self, team):
+        lists = self.positions.get(team)
+        if lists is None:
+            lists = self.positions[team] = {'played': array('i'), 'upcoming': array('i')}
+        return lists
+
+    def resolve(self, identifier):
+        """Team name in the index for a URL or query identifier, or None"""
+        return resolve_team(identifier, self.names)
+
+    def featured_team_matches(self, team_name):
+        """Same shape as get_featured_team_matches, for one indexed team"""
+        lists = self.positions.get(team_name, {'played': [], 'upcoming': []})
+        return {status: [self.tables[status][position] for position in positions]
+                for status, positions in lists.items()}
+
+
+class MatchIndex:
+    """Date-sorted match table with per-team and per-status posting lists.
+
+    Posting lists hold positions in the date-sorted table, so they are sorted too and a
+    date range maps to a slice of any of them by binary search on day numbers."""
+
+    def __init__(self, all_matches):
+        table = as_match_table(all_matches)
+        if any(table.days[i] > table.days[i + 1] for i in range(len(table) - 1)):
+            table = MatchTable.from_matches(sorted(table, key=lambda x: x['date']))
+        self.table = table
+        self.by_team = {}
+        self.by_status = {}
+        for position in range(len(table)):
+            for team in set(table.team_names(position)) - {''}:
+                self.by_team.setdefault(team, array('i')).append(position)
+            self.by_status.setdefault(table.status(position), array('i')).append(position)
+        self.team_names = sorted(self.by_team)
+
+    def resolve(self, identifier):
+        """Team name in the index for a query identifier, or None"""
+        return resolve_team(identifier, self.team_names)
+
+    def query(self, date_from=None, date_to=None, team=None, status=None, start=0, limit=MAX_PAGE_SIZE):
+        """Return (matches, next_start) for matches in [date_from, date_to] from position start on.
+
+        Dates are inclusive 'YYYY-MM-DD' strings; next_start is None on the last page."""
+        days = self.table.days
+        lo = max(start, bisect_left(days, date.fromisoformat(date_from).toordinal()) if date_from else 0)
+        hi = bisect_right(days, date.fromisoformat(date_to).toordinal()) if date_to else len(days)
+
+        if team is not None:
+            positions = self.by_team.get(team, [])
+        elif status is not None:
+            positions = self.by_status.get(status, [])
+        else:
+            positions = None
+
+        if positions is None:
+            candidates = range(lo, hi)
+        else:
+            candidates = (positions[i] for i in range(bisect_left(positions, lo), bisect_left(positions, hi)))
+
+        page = []
+        for position in candidates:
+            if status is not None and self.table.status(position) != status:
+                continue
+            if len(page) == limit:
+                return page, position
+            page.append(self.table[position])
+        return page, None
+
+
+class VersionCache:
+    """Structures derived from the data, kept for the most recent data versions.
+
+    Versions are content hashes, so leagues with identical data share an entry."""
+
+    def __init__(self, build, max_versions=32):
+        self.build = build
+        self.max_versions = max_versions
+        self.entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, data, version):
+        """Return the structure for a data version, building it on first use"""
+        with self._lock:
+            entry = self.entries.get(version)
+            if entry is None:
+                entry = self.entries[version] = self.build(data)
+                while len(self.entries) > self.max_versions:
+                    self.entries.popitem(last=False)
+            else:
+                self.entries.move_to_end(version)
+            return entry
+
+
+# Global index caches
+team_index_cache = VersionCache(lambda data: TeamIndex(data.get('raw_data')))
+match_index_cache = VersionCache(lambda data: MatchIndex(data.get('all_matches')))
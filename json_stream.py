@@ -0,0 +1,158 @@
+import codecs
+import json
+import re
+
+_WHITESPACE = ' \t\r\n'
+
+# Characters that matter while skipping: structure outside strings, quote/escape inside
+_STRUCTURE_SPECIAL = re.compile(r'["\[\]{}]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+# A buffer that ends in these characters may end in the middle of a number
+_NUMBER_TAIL = re.compile(r'[0-9.eE+-]*')
+
+
+def iter_text(byte_chunks, encoding='utf-8'):
+    """Decode a stream of byte chunks, keeping multi-byte characters split across chunks intact"""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for chunk in byte_chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+class JSONStreamReader:
+    """Pull parser over a stream of text chunks.
+
+    Objects and arrays are walked one member at a time, so a caller can decode the
+    records it needs and skip the rest without the whole document in memory. Only the
+    unread part of the current chunk and the value being decoded are buffered."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        """Append the next chunk, dropping what was consumed; False at end of stream"""
+        if self.eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _error(self, message):
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def _peek(self):
+        """Next non-whitespace character without consuming it, or '' at end of stream"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise self._error(f"Expecting '{char}'")
+        self.pos += 1
+
+    def _end_of_member(self, closing):
+        """Consume ',' or the closing bracket; True when the container ends"""
+        char = self._peek()
+        if char == closing:
+            self.pos += 1
+            return True
+        if char != ',':
+            raise self._error(f"Expecting ',' or '{closing}'")
+        self.pos += 1
+        return False
+
+    def read_value(self):
+        """Decode the next complete value"""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue  # Value continues in the next chunk
+                raise
+            # A number cut off by the end of the buffer ('1.' of '1.5', '1' of '1e3') may decode
+            # as a shorter one; refill until more than number characters follow it
+            if _NUMBER_TAIL.fullmatch(self.buffer, end) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def skip_value(self):
+        """Consume the next value without building it, in constant memory"""
+        if self._peek() not in '{["':
+            self.read_value()  # Scalars are small
+            return
+
+        depth, in_string = 0, False
+        while True:
+            match = (_STRING_SPECIAL if in_string else _STRUCTURE_SPECIAL).search(self.buffer, self.pos)
+            if match is None:
+                self.pos = len(self.buffer)
+                if not self._fill():
+                    raise self._error('Unterminated value')
+                continue
+
+            char = match.group()
+            self.pos = match.end()
+            if in_string:
+                if char == '\\':
+                    if self.pos >= len(self.buffer) and not self._fill():
+                        raise self._error('Unterminated string')
+                    self.pos += 1  # Skip the escaped character
+                else:
+                    in_string = False
+                    if depth == 0:
+                        return
+            elif char == '"':
+                in_string = True
+            elif char in '[{':
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def iter_object(self):
+        """Yield the keys of the next object; the caller consumes each value before continuing"""
+        self._expect('{')
+        if self._peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise self._error('Expecting property name')
+            self._expect(':')
+            yield key
+            if self._end_of_member('}'):
+                return
+
+    def iter_array(self):
+        """Yield the elements of the next array, decoded one at a time"""
+        self._expect('[')
+        if self._peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.read_value()
+            if self._end_of_member(']'):
+                return
@@ -0,0 +1,176 @@
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from config import LeagueConfig
+from match_table import compact_matches, memory_size
+from scheduler import DataScheduler, compute_data_version, data_scheduler, schedule_refresh, start_schedule_thread
+
+logger = logging.getLogger(__name__)
+
+LEAGUE_ID_PATTERN = re.compile(r'^[a-z0-9][a-z0-9_-]*$')
+
+
+def load_league_definitions(path=LeagueConfig.LEAGUES_FILE):
+    """Read league id -> {'api_url': ...}; None when there is no leagues file"""
+    if not os.path.exists(path):
+        return None
+
+    with open(path, 'r', encoding='utf-8') as f:
+        definitions = json.load(f)
+
+    leagues = {}
+    for league_id, definition in definitions.items():
+        if not LEAGUE_ID_PATTERN.match(league_id) or not definition.get('api_url'):
+            logger.warning("Skipping invalid league definition: %s", league_id)
+            continue
+        leagues[league_id] = definition
+    return leagues
+
+
+class LeagueStore:
+    """One DataScheduler partition per league, with an LRU memory budget.
+
+    Every league keeps its snapshot on disk; only recently requested leagues are kept
+    in memory. Memory use is measured on the published data, match tables included.
+    Refreshing a league that is not in memory only writes its snapshot. Shared leagues
+    are schedulers that load, refresh and keep their data themselves; the store only
+    serves them."""
+
+    def __init__(self, definitions, shared=None, snapshot_dir=LeagueConfig.SNAPSHOT_DIR,
+                 memory_budget=LeagueConfig.MEMORY_BUDGET_BYTES):
+        self.snapshot_dir = snapshot_dir
+        self.memory_budget = memory_budget
+        self.shared = dict(shared or {})  # league id -> DataScheduler
+        self.partitions = {
+            league_id: DataScheduler(data_file=os.path.join(snapshot_dir, f'{league_id}.json'),
+                                     api_url=definition['api_url'], competition=league_id)
+            for league_id, definition in definitions.items()
+        }
+        self.partitions.update(self.shared)
+        self.resident = OrderedDict()  # league id -> estimated bytes, least recently used first
+        self._lock = threading.Lock()
+        self._load_locks = {league_id: threading.Lock() for league_id in self.partitions}
+
+    def __contains__(self, league_id):
+        return league_id in self.partitions
+
+    def resident_bytes(self):
+        with self._lock:
+            return sum(self.resident.values())
+
+    def get(self, league_id):
+        """Return (data, data_version) of a league, loading it into memory if needed"""
+        partition = self.partitions[league_id]
+        if league_id in self.shared:
+            published = partition.get_published()
+            return (published.data, published.version) if published is not None else (None, None)
+
+        with self._lock:
+            published = partition.published
+            if league_id in self.resident and published is not None:
+                self.resident.move_to_end(league_id)
+                return published.data, published.version
+
+        # One loader per league; requests for other leagues are not blocked
+        with self._load_locks[league_id]:
+            if partition.published is None:
+                self._load(league_id, partition)
+
+        published = partition.published
+        if published is None:
+            return None, None
+        size = memory_size(published.data)
+        with self._lock:
+            self.resident[league_id] = size
+            self.resident.move_to_end(league_id)
+            self._evict(keep=league_id)
+        return published.data, published.version
+
+    def _load(self, league_id, partition):
+        """Load a league from its snapshot, or fetch it when there is none yet"""
+        snapshot = partition.load_snapshot()
+        if snapshot is not None:
+            partition.publish(compact_matches(snapshot), compute_data_version(snapshot))
+            logger.info("Loaded league %s from snapshot", league_id)
+            return
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        logger.info("No snapshot for league %s, fetching", league_id)
+        partition.fetch_and_process_data()
+
+    def _evict(self, keep=None):
+        """Drop least recently used leagues from memory until the budget is met"""
+        total = sum(self.resident.values())
+        for league_id in list(self.resident):
+            if total <= self.memory_budget:
+                break
+            if league_id == keep:
+                continue
+            total -= self.resident.pop(league_id)
+            self.partitions[league_id].published = None
+            logger.info("Evicted league %s from memory", league_id)
+
+    def refresh(self, league_id, raw_data=None, executor=None):
+        """Refresh one league; a league that is not resident is written to disk without decoding it"""
+        partition = self.partitions[league_id]
+        with self._load_locks[league_id]:
+            # Only get() makes a league resident, and it waits for this load lock
+            with self._lock:
+                resident = league_id in self.resident
+            partition.fetch_and_process_data(raw_data=raw_data, executor=executor, publish=resident)
+            published = partition.published
+            if resident and published is not None:
+                size = memory_size(published.data)
+                with self._lock:
+                    if league_id in self.resident:
+                        self.resident[league_id] = size
+
+    def refresh_all(self, payloads=None, workers=LeagueConfig.REFRESH_WORKERS):
+        """Refresh every league, building views in a process pool so refreshes scale with cores.
+
+        Fetches run in threads; each fetched payload goes to the pool and the parent only
+        writes and publishes the encoded snapshot. Pass payloads (league id -> raw data)
+        to process recorded data instead of fetching. workers=1 refreshes in-process."""
+        payloads = payloads or {}
+        league_ids = [league_id for league_id in self.partitions if league_id not in self.shared]
+        if not league_ids:
+            return
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+
+        if workers == 1 or len(league_ids) == 1:
+            for league_id in league_ids:
+                self.refresh(league_id, payloads.get(league_id))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool, \
+                    ThreadPoolExecutor(max_workers=LeagueConfig.FETCH_CONCURRENCY) as fetchers:
+                list(fetchers.map(lambda league_id: self.refresh(league_id, payloads.get(league_id), pool),
+                                  league_ids))
+
+        with self._lock:
+            self._evict()
+
+    def start_scheduler(self):
+        """Refresh the leagues that are not shared from the shared schedule thread"""
+        own = len(self.partitions) - len(self.shared)
+        if not own:
+            logger.info("No leagues of its own to refresh; league scheduler not started")
+            return
+        schedule_refresh(self.refresh_all)
+        start_schedule_thread()
+        logger.info("League scheduler started for %d leagues", own)
+
+
+def _create_league_store():
+    definitions = load_league_definitions()
+    if definitions is None:
+        # Without a leagues file the configured competition is served as 'default',
+        # straight from the main scheduler instead of fetching it a second time
+        return LeagueStore({}, shared={'default': data_scheduler})
+    return LeagueStore(definitions)
+
+
+# Global league store
+league_store = _create_league_store()
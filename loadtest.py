@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Load driver that simulates a fleet of dashboard displays.
+
+Each display polls every endpoint of a serving mode in a loop; optional refresh
+storms fire concurrent /api/refresh calls. Reports throughput and p50/p95/p99
+latency per endpoint, and can append the results to a JSON file for comparison.
+
+    python loadtest.py --displays 50 --duration 60 --mode api
+    python loadtest.py --displays 50 --duration 60 --mode slides --storm-every 20 --storm-size 10
+"""
+
+import argparse
+import json
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+import requests
+from config import ApiConfig
+
+# Serving modes: how a display fetches its data
+SERVING_MODES = ('api', 'slides')
+
+
+def _api_paths():
+    paths = [f"/api/{endpoint}" for endpoint in ApiConfig.DATA_MAPPINGS]
+    return paths + ['/api/featured-team-matches']
+
+
+def _slides_paths(base_url):
+    """The manifest and its fragments by content hash, as the dashboard requests them"""
+    manifest = requests.get(f"{base_url}/slides", timeout=30).json()
+    return ['/slides'] + [f"/slides/{slide['name']}?h={slide['hash']}" for slide in manifest['slides']]
+
+
+def display_paths(base_url, mode):
+    """Paths one display polls in a serving mode"""
+    return _slides_paths(base_url) if mode == 'slides' else _api_paths()
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+class Recorder:
+    """Thread-safe latency and status collection per endpoint"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.bytes = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, path, latency, ok, size):
+        with self._lock:
+            self.latencies[path].append(latency)
+            self.bytes[path] += size
+            if not ok:
+                self.errors[path] += 1
+
+    def summary(self, elapsed):
+        report = {}
+        with self._lock:
+            items = list(self.latencies.items())
+        for path, latencies in sorted(items):
+            latencies = sorted(latencies)
+            report[path] = {
+                'requests': len(latencies),
+                'errors': self.errors[path],
+                'throughput_rps': round(len(latencies) / elapsed, 2),
+                'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+                'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+                'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+                'avg_kb': round(self.bytes[path] / len(latencies) / 1024, 1),
+            }
+        return report
+
+
+def _get(session, base_url, path, recorder):
+    start = time.perf_counter()
+    try:
+        response = session.get(f"{base_url}{path}", timeout=60)
+        recorder.record(path, time.perf_counter() - start, response.ok or response.status_code == 304,
+                        len(response.content))
+    except requests.RequestException:
+        recorder.record(path, time.perf_counter() - start, False, 0)
+
+
+def display_loop(base_url, paths, interval, deadline, recorder):
+    """One display: fetch every path, wait for the poll interval, repeat"""
+    session = requests.Session()
+    while time.monotonic() < deadline:
+        for path in paths:
+            _get(session, base_url, path, recorder)
+        if interval:
+            time.sleep(interval)
+
+
+def storm_loop(base_url, every, size, deadline, recorder):
+    """Fire size concurrent /api/refresh calls every 'every' seconds"""
+    while time.monotonic() + every < deadline:
+        time.sleep(every)
+        threads = [threading.Thread(target=_get, args=(requests.Session(), base_url, '/api/refresh', recorder))
+                   for _ in range(size)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+
+def run_load_test(base_url, mode, displays, duration, interval, storm_every, storm_size):
+    """Run displays (and refresh storms) for duration seconds and return the report"""
+    paths = display_paths(base_url, mode)
+    recorder = Recorder()
+    deadline = time.monotonic() + duration
+
+    threads = [threading.Thread(target=display_loop, args=(base_url, paths, interval, deadline, recorder))
+               for _ in range(displays)]
+    if storm_every and storm_size:
+        threads.append(threading.Thread(target=storm_loop,
+                                        args=(base_url, storm_every, storm_size, deadline, recorder)))
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    endpoints = recorder.summary(elapsed)
+    all_latencies = sorted(latency for latencies in recorder.latencies.values() for latency in latencies)
+    return {
+        'mode': mode,
+        'base_url': base_url,
+        'displays': displays,
+        'duration_s': round(elapsed, 2),
+        'started_at': datetime.now().isoformat(),
+        'total': {
+            'requests': len(all_latencies),
+            'errors': sum(recorder.errors.values()),
+            'throughput_rps': round(len(all_latencies) / elapsed, 2),
+            'p50_ms': round((percentile(all_latencies, 0.50) or 0) * 1000, 2),
+            'p95_ms': round((percentile(all_latencies, 0.95) or 0) * 1000, 2),
+            'p99_ms': round((percentile(all_latencies, 0.99) or 0) * 1000, 2),
+        },
+        'endpoints': endpoints,
+    }
+
+
+def print_report(report):
+    print(f"\n=== LOAD TEST: mode={report['mode']} displays={report['displays']} "
+          f"duration={report['duration_s']}s ===")
+    print(f"{'endpoint':<36} {'req':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'KB':>7}")
+    rows = list(report['endpoints'].items()) + [('TOTAL', report['total'])]
+    for path, stats in rows:
+        print(f"{path:<36} {stats['requests']:>7} {stats['errors']:>5} {stats['throughput_rps']:>8} "
+              f"{stats['p50_ms']:>8} {stats['p95_ms']:>8} {stats['p99_ms']:>8} {stats.get('avg_kb', ''):>7}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Simulate dashboard displays against a running SPMS server')
+    parser.add_argument('--base-url', default='http://127.0.0.1:5000')
+    parser.add_argument('--mode', choices=SERVING_MODES, default='api')
+    parser.add_argument('--displays', type=int, default=20)
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds')
+    parser.add_argument('--interval', type=float, default=0.0,
+                        help='seconds between polls per display (0 = closed loop)')
+    parser.add_argument('--storm-every', type=float, default=0.0, help='seconds between refresh storms')
+    parser.add_argument('--storm-size', type=int, default=0, help='concurrent /api/refresh calls per storm')
+    parser.add_argument('--output', help='append the report to this JSON file')
+    args = parser.parse_args(argv)
+
+    report = run_load_test(args.base_url.rstrip('/'), args.mode, args.displays, args.duration,
+                           args.interval, args.storm_every, args.storm_size)
+    print_report(report)
+
+    if args.output:
+        try:
+            with open(args.output, 'r', encoding='utf-8') as f:
+                history = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            history = []
+        history.append(report)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(history, f, indent=2)
+        print(f"\nReport appended to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from config import LoggingConfig
+
+# Attributes every LogRecord has; anything else was passed with extra= and is emitted as a field
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with extra= fields included"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines for local development"""
+
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)-7s %(name)s: %(message)s')
+
+    def format(self, record):
+        line = super().format(record)
+        suppressed = getattr(record, 'suppressed', None)
+        return f"{line} (+{suppressed} suppressed)" if suppressed else line
+
+
+class RateLimitFilter(logging.Filter):
+    """Let each distinct message through once per interval and count the repeats.
+
+    The next emitted copy of a suppressed message carries the number of repeats."""
+    MAX_KEYS = 4096
+
+    def __init__(self, interval):
+        super().__init__()
+        self.interval = interval
+        self._state = {}  # key -> [last emitted (monotonic), suppressed count]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if self.interval <= 0:
+            return True
+        key = (record.name, record.levelno, record.getMessage())
+        now = time.monotonic()
+        with self._lock:
+            state = self._state.get(key)
+            if state is not None and now - state[0] < self.interval:
+                state[1] += 1
+                return False
+            if state is not None and state[1]:
+                record.suppressed = state[1]
+            self._state[key] = [now, 0]
+            if len(self._state) > self.MAX_KEYS:
+                self._prune(now)
+        return True
+
+    def _prune(self, now):
+        """Forget messages that have not been seen for an interval, keeping the map bounded"""
+        for key in [key for key, state in self._state.items() if now - state[0] >= self.interval]:
+            del self._state[key]
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Only merge the arguments here; JSON encoding and tracebacks are formatted
+        # by the listener thread, off the request path
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def parse_module_levels(spec):
+    """Parse 'scheduler=DEBUG,test_data=WARNING' into {logger name: level}"""
+    levels = {}
+    for item in (spec or '').split(','):
+        name, _, level = item.partition('=')
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+_listener = None
+_lock = threading.Lock()
+
+
+def configure_logging(level=None, module_levels=None, fmt=None, rate_limit_seconds=None):
+    """Route all logging through a bounded queue drained by a background thread.
+
+    Safe to call more than once; only the first call installs the handlers."""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return _listener
+
+        formatter = TextFormatter() if (fmt or LoggingConfig.FORMAT) == 'text' else JsonFormatter()
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(formatter)
+
+        queue_handler = NonBlockingQueueHandler(queue.Queue(LoggingConfig.QUEUE_SIZE))
+        rate_limit = LoggingConfig.RATE_LIMIT_SECONDS if rate_limit_seconds is None else rate_limit_seconds
+        queue_handler.addFilter(RateLimitFilter(rate_limit))
+
+        root = logging.getLogger()
+        root.handlers = [queue_handler]
+        root.setLevel((level or LoggingConfig.LEVEL).upper())
+
+        module_levels = LoggingConfig.MODULE_LEVELS if module_levels is None else module_levels
+        for name, module_level in parse_module_levels(module_levels).items():
+            logging.getLogger(name).setLevel(module_level)
+
+        _listener = logging.handlers.QueueListener(queue_handler.queue, stream_handler)
+        _listener.start()
+        atexit.register(_listener.stop)  # Flush queued records on shutdown
+        return _listener
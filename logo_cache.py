@@ -0,0 +1,273 @@
+import csv
+import hashlib
+import logging
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from PIL import Image, features
+from config import LogoConfig
+
+logger = logging.getLogger(__name__)
+
+LOGO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'images', 'team_logos')
+DEFAULT_LOGO = 'default_team.png'
+ICON_SET_FILE = os.path.join(LOGO_DIR, 'icon_set.csv')
+
+LOGO_FILE_PATTERN = re.compile(r'^t_\d+\.png$')
+
+MIMETYPES = {
+    'avif': 'image/avif',
+    'webp': 'image/webp',
+    'png': 'image/png',
+}
+
+# Encoder settings per output format
+SAVE_OPTIONS = {
+    'avif': {'format': 'AVIF', 'quality': 60},
+    'webp': {'format': 'WEBP', 'quality': 85, 'method': 6},
+    'png': {'format': 'PNG', 'optimize': True},
+}
+
+
+def _format_supported(fmt):
+    """Check if the installed Pillow build can encode the given format"""
+    if fmt == 'png':
+        return True
+    try:
+        return bool(features.check(fmt))
+    except ValueError:
+        return False
+
+SUPPORTED_FORMATS = [fmt for fmt in ('avif', 'webp', 'png') if _format_supported(fmt)]
+
+
+def choose_format(accept_header):
+    """Pick the smallest image format the client accepts (AVIF > WebP > PNG)"""
+    accept = accept_header or ''
+    for fmt in SUPPORTED_FORMATS:
+        if fmt == 'png' or MIMETYPES[fmt] in accept:
+            return fmt
+    return 'png'
+
+
+_icon_index = None
+
+def _load_icon_index():
+    """Load club name -> icon number mapping from the HollandseVelden icon set"""
+    global _icon_index
+    if _icon_index is not None:
+        return _icon_index
+
+    index = {}
+    try:
+        with open(ICON_SET_FILE, 'r', encoding='utf-16') as f:
+            reader = csv.reader(f, delimiter='\t')
+            next(reader, None)  # Skip header row
+            for row in reader:
+                if len(row) >= 3 and row[2].strip().isdigit():
+                    index[row[0].strip().lower()] = row[2].strip()
+    except (OSError, UnicodeError) as e:
+        logger.error("Error loading logo icon set: %s", e)
+
+    _icon_index = index
+    return _icon_index
+
+
+def resolve_logo_file(team, league_table=None):
+    """Map a team identifier (icon number, t_<n> key or team name) to a logo filename"""
+    team = (team or '').strip()
+    if team.lower().endswith('.png'):
+        team = team[:-4]
+
+    candidate = None
+    if team.isdigit():
+        candidate = f"t_{team}.png"
+    elif team.startswith('t_'):
+        candidate = f"{team}.png"
+    else:
+        # Prefer the shirt reported by the competition API for this league
+        for row in league_table or []:
+            if row['team'].lower() == team.lower() and row['shirt']:
+                candidate = row['shirt']
+                break
+
+        if candidate is None:
+            icon_number = _load_icon_index().get(team.lower())
+            if icon_number:
+                candidate = f"t_{icon_number}.png"
+
+    if (candidate and LOGO_FILE_PATTERN.match(candidate) and
+            os.path.isfile(os.path.join(LOGO_DIR, candidate))):
+        return candidate
+    return DEFAULT_LOGO
+
+
+def render_logo(source_path, size, fmt):
+    """Scale a logo to fit a size x size box and encode it in the given format"""
+    with Image.open(source_path) as image:
+        image = image.convert('RGBA')
+        scale = size / max(image.size)
+        target = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        if target != image.size:
+            image = image.resize(target, Image.LANCZOS)
+
+        buffer = BytesIO()
+        image.save(buffer, **SAVE_OPTIONS[fmt])
+        return buffer.getvalue()
+
+
+class LogoCache:
+    """Content-addressed disk cache of resized logos with LRU eviction"""
+
+    def __init__(self, cache_dir=LogoConfig.CACHE_DIR, max_bytes=LogoConfig.CACHE_MAX_BYTES):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_bytes = max_bytes
+        self.current_bytes = None  # Computed lazily on the first write
+        self._source_digests = {}
+        self._lock = threading.Lock()
+
+    def _source_digest(self, source_path):
+        """Hash the source logo, memoized on path and modification time"""
+        stat = os.stat(source_path)
+        memo_key = (source_path, stat.st_mtime_ns, stat.st_size)
+        digest = self._source_digests.get(memo_key)
+        if digest is None:
+            with open(source_path, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            self._source_digests[memo_key] = digest
+        return digest
+
+    def version(self, logo_file):
+        """Short digest of a source logo, for URLs that change when the logo is replaced"""
+        return self._source_digest(os.path.join(LOGO_DIR, logo_file))[:16]
+
+    def _entry_path(self, key, fmt):
+        """Return the on-disk path for a cache key, sharded by key prefix"""
+        return os.path.join(self.cache_dir, key[:2], f"{key}.{fmt}")
+
+    def _scan_entries(self):
+        """List (mtime, size, path) for every cached file"""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits its budget"""
+        entries = self._scan_entries()
+        self.current_bytes = sum(size for _, size, _ in entries)
+        if self.current_bytes <= self.max_bytes:
+            return 0
+
+        removed = 0
+        # Hits refresh the mtime, so the oldest mtime is the least recently used
+        for _, size, path in sorted(entries):
+            if self.current_bytes <= self.max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.current_bytes -= size
+            removed += 1
+        return removed
+
+    def get(self, logo_file, size, fmt):
+        """Return (path, key) of the rendered logo, rendering it on first request"""
+        source_path = os.path.join(LOGO_DIR, logo_file)
+        source_digest = self._source_digest(source_path)
+        key = hashlib.sha256(f"{source_digest}:{size}:{fmt}".encode()).hexdigest()
+        path = self._entry_path(key, fmt)
+
+        if os.path.exists(path):
+            try:
+                os.utime(path)  # Mark as recently used
+                return path, key
+            except OSError:
+                pass  # Evicted in the meantime, render again
+
+        data = render_logo(source_path, size, fmt)
+
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+
+            if self.current_bytes is None:
+                self.evict()
+            else:
+                self.current_bytes += len(data)
+                if self.current_bytes > self.max_bytes:
+                    self.evict()
+
+        return path, key
+
+    def open_entry(self, logo_file, size, fmt):
+        """Return (readable file, key) of the rendered logo.
+
+        An entry evicted between lookup and open is rendered again; once open, the
+        file stays readable even if it is evicted while it is being sent."""
+        for _ in range(3):
+            path, key = self.get(logo_file, size, fmt)
+            try:
+                return open(path, 'rb'), key
+            except FileNotFoundError:
+                logger.debug("Logo %s evicted before it could be sent, rendering again", path)
+        # Evicted again every time: the cache is far too small, serve from memory
+        return BytesIO(render_logo(os.path.join(LOGO_DIR, logo_file), size, fmt)), key
+
+
+# Global logo cache instance
+logo_cache = LogoCache()
+
+
+def _prewarm_logo(args):
+    """Render every size/format of one logo (runs in a worker process)"""
+    logo_file, sizes, formats, cache_dir, max_bytes = args
+    cache = LogoCache(cache_dir, max_bytes)
+    for size in sizes:
+        for fmt in formats:
+            cache.get(logo_file, size, fmt)
+    return logo_file
+
+
+def prewarm_logos(league_table, sizes=LogoConfig.SIZES, formats=None, workers=LogoConfig.PREWARM_WORKERS):
+    """Generate all sizes and formats for a league's teams in a process pool"""
+    formats = formats or SUPPORTED_FORMATS
+    logo_files = sorted({resolve_logo_file(row['team'], league_table) for row in league_table})
+    jobs = [(logo_file, tuple(sizes), tuple(formats), logo_cache.cache_dir, logo_cache.max_bytes)
+            for logo_file in logo_files]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for logo_file in executor.map(_prewarm_logo, jobs):
+            logger.info("Pre-warmed %s", logo_file)
+
+    # Workers track their own byte counts, so enforce the budget once at the end
+    logo_cache.evict()
+    return logo_files
+
+
+if __name__ == "__main__":
+    from logging_setup import configure_logging
+    from scheduler import data_scheduler
+
+    configure_logging()
+
+    data = data_scheduler.get_cached_data() or {}
+    league_table = data.get('league_table', [])
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else LogoConfig.PREWARM_WORKERS
+
+    logger.info("Pre-warming logos for %d teams, sizes %s, formats %s",
+                len(league_table), LogoConfig.SIZES, SUPPORTED_FORMATS)
+    prewarm_logos(league_table, workers=workers)
@@ -0,0 +1,192 @@
+import sys
+from array import array
+from datetime import date
+from normalize import MATCH_FIELDS, team_slug
+
+# Keys of a normalized match; only lists of exactly these records are compacted
+MATCH_KEYS = frozenset(MATCH_FIELDS) | {'home_id', 'away_id'}
+
+NO_VALUE = -1  # Missing goals or kickoff time in the typed columns
+
+
+def _minutes(kickoff):
+    """'HH:MM' as minutes after midnight"""
+    hours, minutes = int(kickoff[:2]), int(kickoff[3:])
+    if len(kickoff) != 5 or kickoff[2] != ':' or not (0 <= hours < 24 and 0 <= minutes < 60):
+        raise ValueError(f"Not an HH:MM time: {kickoff}")
+    return hours * 60 + minutes
+
+
+def _goals(goals):
+    if goals is None:
+        return NO_VALUE
+    if goals < 0:
+        raise ValueError(f"Negative score: {goals}")
+    return goals
+
+
+class MatchTable:
+    """Normalized matches stored as parallel typed arrays.
+
+    Dates are day numbers, kickoff times minutes after midnight and goals small ints;
+    team names, statuses and result strings are interned once per table and referenced
+    by number. A match costs about 20 bytes instead of a dict with its own strings.
+    Indexing or iterating gives the normalized match dicts back, built on demand, so
+    the table stands in for a list of matches up to the JSON serialization boundary."""
+
+    def __init__(self):
+        self.days = array('i')
+        self.kickoffs = array('h')
+        self.home = array('H')
+        self.away = array('H')
+        self.home_goals = array('h')
+        self.away_goals = array('h')
+        self.statuses = array('B')
+        self.results = array('H')
+        self.teams = []  # Interned team names; team number -> name
+        self.team_ids = []  # team number -> team slug
+        self.status_names = []
+        self.result_texts = []
+        self._team_numbers = {}  # value -> number, per interned list
+        self._status_numbers = {}
+        self._result_numbers = {}
+        self._days = {'': 0}  # 'YYYY-MM-DD' -> day number
+        self._dates = {0: ''}  # day number -> 'YYYY-MM-DD'
+
+    @classmethod
+    def from_matches(cls, matches):
+        table = cls()
+        for match in matches:
+            table.append(match)
+        return table
+
+    def _team(self, name):
+        number = self._team_numbers.get(name)
+        if number is None:
+            number = self._team_numbers[name] = len(self.teams)
+            self.teams.append(sys.intern(name))
+            self.team_ids.append(team_slug(name))
+        return number
+
+    @staticmethod
+    def _number(numbers, values, value):
+        number = numbers.get(value)
+        if number is None:
+            number = numbers[value] = len(values)
+            values.append(sys.intern(value))
+        return number
+
+    def _day(self, text):
+        day = self._days.get(text)
+        if day is None:
+            day = self._days[text] = date.fromisoformat(text).toordinal()
+            self._dates[day] = text
+        return day
+
+    def append(self, match):
+        """Add a normalized match; raises ValueError or OverflowError for values the columns cannot hold"""
+        self.days.append(self._day(match['date']))
+        self.kickoffs.append(_minutes(match['time']) if match['time'] else NO_VALUE)
+        self.home.append(self._team(match['home']))
+        self.away.append(self._team(match['away']))
+        self.home_goals.append(_goals(match['homeGoals']))
+        self.away_goals.append(_goals(match['awayGoals']))
+        self.statuses.append(self._number(self._status_numbers, self.status_names, match['status']))
+        self.results.append(self._number(self._result_numbers, self.result_texts, match['result']))
+
+    def __len__(self):
+        return len(self.days)
+
+    def date_text(self, position):
+        day = self.days[position]
+        text = self._dates.get(day)
+        if text is None:
+            text = self._dates[day] = date.fromordinal(day).isoformat()
+        return text
+
+    def status(self, position):
+        return self.status_names[self.statuses[position]]
+
+    def team_names(self, position):
+        return self.teams[self.home[position]], self.teams[self.away[position]]
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[index] for index in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        home, away = self.home[position], self.away[position]
+        kickoff, home_goals, away_goals = self.kickoffs[position], self.home_goals[position], self.away_goals[position]
+        return {
+            'status': self.status_names[self.statuses[position]],
+            'date': self.date_text(position),
+            'time': f"{kickoff // 60:02d}:{kickoff % 60:02d}" if kickoff != NO_VALUE else '',
+            'home': self.teams[home],
+            'away': self.teams[away],
+            'homeGoals': None if home_goals == NO_VALUE else home_goals,
+            'awayGoals': None if away_goals == NO_VALUE else away_goals,
+            'result': self.result_texts[self.results[position]],
+            'home_id': self.team_ids[home],
+            'away_id': self.team_ids[away],
+        }
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+    def to_list(self):
+        return [self[position] for position in range(len(self))]
+
+    def nbytes(self):
+        """Bytes held by the typed columns"""
+        columns = (self.days, self.kickoffs, self.home, self.away, self.home_goals, self.away_goals,
+                   self.statuses, self.results)
+        return sum(column.itemsize * len(column) for column in columns)
+
+
+def memory_size(value, _seen=None):
+    """Approximate bytes held by a processed snapshot, match tables included.
+
+    Objects shared between views (interned names, reused records) are counted once."""
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, MatchTable):
+        names = value.teams + value.team_ids + value.status_names + value.result_texts
+        return sys.getsizeof(value) + value.nbytes() + sum(memory_size(name, seen) for name in names)
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(memory_size(key, seen) + memory_size(item, seen) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(memory_size(item, seen) for item in value)
+    return size
+
+
+def as_match_table(matches):
+    """A MatchTable for a list of normalized matches (or the table itself)"""
+    return matches if isinstance(matches, MatchTable) else MatchTable.from_matches(matches or [])
+
+
+def compact_matches(value):
+    """Replace every list of normalized matches in a processed snapshot with a MatchTable.
+
+    Walks nested dicts (raw_data, featured team and weekly views) and returns new dicts, so
+    the input is left untouched. Lists of other records, or of matches with extra keys like
+    next_week_matches' week_label, stay as they are."""
+    if isinstance(value, dict):
+        return {key: compact_matches(item) for key, item in value.items()}
+    if isinstance(value, list) and value and all(isinstance(item, dict) and item.keys() == MATCH_KEYS
+                                                 for item in value):
+        try:
+            return MatchTable.from_matches(value)
+        except (OverflowError, ValueError):
+            return value  # Out-of-range scores or odd dates; keep the dicts
+    return value
+
+
+def json_default(value):
+    """json.dumps default= hook that writes match tables as lists of matches"""
+    if isinstance(value, MatchTable):
+        return value.to_list()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
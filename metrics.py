@@ -0,0 +1,236 @@
+import bisect
+import threading
+import time
+from collections import OrderedDict
+
+# Latency buckets in seconds, from cached API hits up to slow upstream fetches
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(label_names, label_values, extra=None):
+    pairs = list(zip(label_names, label_values, strict=True))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Base class for a labelled metric family"""
+    metric_type = None
+
+    def __init__(self, name, documentation, label_names=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.label_names)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count per label set"""
+    metric_type = 'counter'
+
+    def __init__(self, name, documentation, label_names=()):
+        super().__init__(name, documentation, label_names)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def collect(self):
+        with self._lock:
+            values = list(self._values.items())
+        lines = self.header()
+        for key, value in sorted(values):
+            lines.append(f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Current value per label set, set directly or computed at scrape time"""
+    metric_type = 'gauge'
+
+    def __init__(self, name, documentation, label_names=(), callback=None):
+        super().__init__(name, documentation, label_names)
+        self._values = {}
+        self._callback = callback
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def collect(self):
+        if self._callback is not None:
+            value = self._callback()
+            if value is None:
+                return []  # Nothing to report yet
+            values = [((), value)]
+        else:
+            with self._lock:
+                values = list(self._values.items())
+        lines = self.header()
+        for key, value in sorted(values):
+            lines.append(f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts, sum and count per label set"""
+    metric_type = 'histogram'
+
+    def __init__(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def time(self, **labels):
+        """Context manager that observes the duration of its block"""
+        return _Timer(self, labels)
+
+    def collect(self):
+        with self._lock:
+            values = [(key, (list(entry[0]), entry[1], entry[2])) for key, entry in self._values.items()]
+        lines = self.header()
+        for key, (bucket_counts, total, count) in sorted(values):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), bucket_counts, strict=True):
+                cumulative += bucket_count
+                labels = _format_labels(self.label_names, key, ('le', _format_value(float(bound))))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class ActiveClients:
+    """Distinct clients seen within a sliding time window, at most max_clients of them.
+
+    Clients are kept in the order they were last seen, so expired ones are dropped from
+    the front on every call; past the cap the least recently seen client is dropped."""
+
+    def __init__(self, window_seconds, max_clients=10000):
+        self.window_seconds = window_seconds
+        self.max_clients = max_clients
+        self._last_seen = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _prune(self, now):
+        cutoff = now - self.window_seconds
+        while self._last_seen and (next(iter(self._last_seen.values())) < cutoff
+                                   or len(self._last_seen) > self.max_clients):
+            self._last_seen.popitem(last=False)
+
+    def seen(self, client_key):
+        now = time.monotonic()
+        with self._lock:
+            self._last_seen[client_key] = now
+            self._last_seen.move_to_end(client_key)
+            self._prune(now)
+
+    def count(self):
+        with self._lock:
+            self._prune(time.monotonic())
+            return len(self._last_seen)
+
+
+class Registry:
+    """Collection of metrics rendered together in Prometheus text format"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, label_names=()):
+        return self.register(Counter(name, documentation, label_names))
+
+    def gauge(self, name, documentation, label_names=(), callback=None):
+        return self.register(Gauge(name, documentation, label_names, callback))
+
+    def histogram(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, label_names, buckets))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+
+# Global registry and the metrics shared across modules
+registry = Registry()
+
+REQUEST_LATENCY = registry.histogram(
+    'spms_http_request_duration_seconds', 'Request latency per route', ('route', 'method'))
+REQUESTS_TOTAL = registry.counter(
+    'spms_http_requests_total', 'Requests per route and status code', ('route', 'method', 'status'))
+CACHE_REQUESTS = registry.counter(
+    'spms_cache_requests_total',
+    'DataScheduler cache lookups: hit (memory), miss (loaded from snapshot), revalidate (fetched)',
+    ('result',))
+UPSTREAM_FETCH_DURATION = registry.histogram(
+    'spms_upstream_fetch_duration_seconds', 'Duration of competition API fetches', ('outcome',))
+UPSTREAM_FETCH_TOTAL = registry.counter(
+    'spms_upstream_fetch_total', 'Competition API fetches per outcome', ('outcome',))
+REFRESH_TOTAL = registry.counter(
+    'spms_refresh_total', 'fetch_and_process_data runs per outcome', ('outcome',))
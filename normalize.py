@@ -0,0 +1,143 @@
+import re
+import threading
+from datetime import date
+from functools import lru_cache
+from config import TeamFieldMappings
+
+# Sections of a competition that hold matches and table rows
+MATCH_SECTIONS = ('results', 'program')
+TABLE_SECTIONS = ('leaguetable', 'period1', 'period2', 'period3')
+COMPETITION_SECTIONS = TABLE_SECTIONS + MATCH_SECTIONS
+
+
+@lru_cache(maxsize=4096)
+def team_slug(name):
+    """URL form of a team name, e.g. 'AVV Columbia' -> 'avv-columbia'"""
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+# Club-form abbreviations that team keys leave out, e.g. the VV of 'VV Gorecht'
+CLUB_PREFIXES = ('vv', 'avv', 'cvv', 'rkvv', 'sv', 'rksv', 'sc', 'fc', 'vc', 'asv', 'csv')
+
+
+@lru_cache(maxsize=4096)
+def team_key(name):
+    """Short URL form of a team name without its club-form prefix, e.g. 'AVV Columbia' -> 'columbia'"""
+    slug = team_slug(name)
+    prefix, _, rest = slug.partition('-')
+    return rest if rest and prefix in CLUB_PREFIXES else slug
+
+
+def _text(value):
+    return '' if value is None else str(value).strip()
+
+
+def _int(value):
+    """Scores and table counts as int; None when missing or not numeric"""
+    if value is None or value == '' or isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _count(value):
+    return _int(value) or 0
+
+
+_DATE_PATTERN = re.compile(r'(\d{4})-(\d{2})-(\d{2})(?:[ T]([01]\d|2[0-3]):([0-5]\d)(?::[0-5]\d)?)?$')
+
+
+def _date(value):
+    """Split 'YYYY-MM-DD[ HH:MM[:SS]]' into ('YYYY-MM-DD', 'HH:MM'); ('', '') if it is not a valid date"""
+    match = _DATE_PATTERN.match(value)
+    if match is None:
+        return '', ''
+    year, month, day, hour, minute = match.groups()
+    try:
+        date(int(year), int(month), int(day))
+    except ValueError:
+        return '', ''
+    return f"{year}-{month}-{day}", f"{hour}:{minute}" if hour else ''
+
+
+# Canonical field -> (source field variants in order of preference, converter).
+# The canonical name is always the first variant, so normalizing twice is a no-op.
+MATCH_FIELDS = {
+    'status': (['status', 'matchStatus'], _text),
+    'date': (['date'], _text),
+    'time': (['time', 'kickoff'], _text),
+    'home': (TeamFieldMappings.HOME_FIELDS, _text),
+    'away': (TeamFieldMappings.AWAY_FIELDS, _text),
+    'homeGoals': (TeamFieldMappings.HOME_SCORE_FIELDS, _int),
+    'awayGoals': (TeamFieldMappings.AWAY_SCORE_FIELDS, _int),
+    'result': (['result'], _text),
+}
+
+TABLE_FIELDS = {
+    'position': (['position'], _count),
+    'team': (TeamFieldMappings.TEAM_FIELDS, _text),
+    'played': (['played', 'matches'], _count),
+    'wins': (['wins'], _count),
+    'draws': (['draws', 'ties'], _count),
+    'losses': (['losses'], _count),
+    'goals_for': (['goals_for', 'goalsFor'], _count),
+    'goals_against': (['goals_against', 'goalsAgainst'], _count),
+    'points': (['points'], _count),
+    'shirt': (['shirt'], _text),
+}
+
+_plans = {}
+_plans_lock = threading.Lock()
+
+
+def _plan(fields, record):
+    """(canonical field, source field or None, converter) per field for this record's schema.
+
+    Records from one source share their keys, so a plan is compiled once per schema
+    and every further record is converted with plain lookups."""
+    cache_key = (id(fields), frozenset(record))
+    plan = _plans.get(cache_key)
+    if plan is None:
+        plan = tuple((canonical, next((source for source in sources if source in record), None), convert)
+                     for canonical, (sources, convert) in fields.items())
+        with _plans_lock:
+            _plans[cache_key] = plan
+    return plan
+
+
+def normalize_match(record):
+    """Canonical match: ISO date and 'HH:MM' time, int goals (None if absent) and team ids"""
+    match = {canonical: convert(record[source] if source else None)
+             for canonical, source, convert in _plan(MATCH_FIELDS, record)}
+    day, kickoff = _date(match['date'])
+    match['date'] = day
+    match['time'] = match['time'][:5] or kickoff
+    match['home_id'] = team_slug(match['home'])
+    match['away_id'] = team_slug(match['away'])
+    return match
+
+
+def normalize_table_row(record):
+    """Canonical league or period table row with int counts and a team id"""
+    row = {canonical: convert(record[source] if source else None)
+           for canonical, source, convert in _plan(TABLE_FIELDS, record)}
+    row['team_id'] = team_slug(row['team'])
+    return row
+
+
+def normalize_section(section, records):
+    """Normalize the records of one competition section, dropping anything that is not a record.
+
+    Unknown sections pass through unchanged."""
+    if section in MATCH_SECTIONS:
+        return [normalize_match(record) for record in records if isinstance(record, dict)]
+    if section in TABLE_SECTIONS:
+        return [normalize_table_row(record) for record in records if isinstance(record, dict)]
+    return records
+
+
+def normalize_competition(raw_data):
+    """Normalize every match and table row of a competition; safe to apply more than once"""
+    return {section: normalize_section(section, records or []) for section, records in raw_data.items()}
@@ -0,0 +1,212 @@
+import cProfile
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime
+from config import ProfilingConfig
+
+logger = logging.getLogger(__name__)
+
+# Active refresh run of the current thread, so nested code can add stages
+_local = threading.local()
+
+
+class RefreshRun:
+    """Wall and CPU time per named stage of one fetch_and_process_data run"""
+
+    def __init__(self, run_id):
+        self.run_id = run_id
+        self.started_at = datetime.now().isoformat()
+        self.stages = []
+        self.outcome = None
+        self.wall_ms = None
+        self.cpu_ms = None
+        self.profile_file = None
+        self.profiled = False
+        self._stack = []
+
+    def to_dict(self):
+        return {
+            'id': self.run_id,
+            'started_at': self.started_at,
+            'outcome': self.outcome,
+            'wall_ms': self.wall_ms,
+            'cpu_ms': self.cpu_ms,
+            'stages': self.stages,
+            'profile_file': self.profile_file,
+        }
+
+
+@contextmanager
+def stage(name):
+    """Time a named stage of the current refresh run; a no-op outside a run.
+
+    Nested stages are recorded with dotted names, e.g. 'fetch.http_request'."""
+    run = getattr(_local, 'run', None)
+    if run is None:
+        yield
+        return
+
+    run._stack.append(name)
+    full_name = '.'.join(run._stack)
+    wall_start, cpu_start = time.perf_counter(), time.thread_time()
+    try:
+        yield
+    finally:
+        run.stages.append({
+            'name': full_name,
+            'wall_ms': round((time.perf_counter() - wall_start) * 1000, 3),
+            'cpu_ms': round((time.thread_time() - cpu_start) * 1000, 3),
+        })
+        run._stack.pop()
+
+
+def set_outcome(outcome):
+    """Record how the current refresh run ended"""
+    run = getattr(_local, 'run', None)
+    if run is not None:
+        run.outcome = outcome
+
+
+def profiling():
+    """Whether the current refresh run is being profiled"""
+    run = getattr(_local, 'run', None)
+    return run is not None and run.profiled
+
+
+def add_stages(stages, prefix):
+    """Add stages timed elsewhere (e.g. in a worker process) to the current run under prefix"""
+    run = getattr(_local, 'run', None)
+    if run is not None:
+        run.stages.extend(dict(entry, name=f"{prefix}.{entry['name']}") for entry in stages)
+
+
+class RefreshHistory:
+    """Ring buffer with the stage timings of recent refresh runs"""
+
+    def __init__(self, size):
+        self.runs = deque(maxlen=size)
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def record(self, profile=None):
+        """Collect stages for the refresh run executed inside this block.
+
+        By default the run takes one of this process's profiled refreshes, if any are left.
+        Pass profile=True/False to decide for it instead, e.g. in a worker process, whose
+        run is profiled exactly when the parent run that submitted it is."""
+        with self._lock:
+            run = RefreshRun(self._next_id)
+            self._next_id += 1
+
+        previous_run = getattr(_local, 'run', None)
+        _local.run = run
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            with _profile(run, profile):
+                yield run
+        finally:
+            run.wall_ms = round((time.perf_counter() - wall_start) * 1000, 3)
+            run.cpu_ms = round((time.thread_time() - cpu_start) * 1000, 3)
+            _local.run = previous_run
+            with self._lock:
+                self.runs.append(run)
+
+    def recent(self):
+        """Recent runs as dicts, newest first"""
+        with self._lock:
+            return [run.to_dict() for run in reversed(self.runs)]
+
+
+class SamplingProfiler:
+    """Samples the stack of one thread at a fixed interval into collapsed-stack counts"""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path):
+        """Write samples in collapsed format, readable by flamegraph.pl and speedscope"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+_profiles_remaining = ProfilingConfig.PROFILE_COUNT if ProfilingConfig.PROFILE_MODE else 0
+_profile_lock = threading.Lock()
+
+
+def _claim_profile():
+    """Reserve one of the configured profiled refreshes"""
+    global _profiles_remaining
+    with _profile_lock:
+        if _profiles_remaining <= 0:
+            return False
+        _profiles_remaining -= 1
+        return True
+
+
+@contextmanager
+def _profile(run, profile=None):
+    """Profile the block with cProfile or the sampling profiler when PROFILE_REFRESH is set"""
+    mode = ProfilingConfig.PROFILE_MODE
+    if mode not in ('cprofile', 'sample') or not (_claim_profile() if profile is None else profile):
+        yield
+        return
+    run.profiled = True
+
+    os.makedirs(ProfilingConfig.OUTPUT_DIR, exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    extension = 'prof' if mode == 'cprofile' else 'folded'
+    # Worker processes number their runs on their own; the pid keeps their files apart
+    path = os.path.join(ProfilingConfig.OUTPUT_DIR, f"refresh-{timestamp}-{os.getpid()}-{run.run_id}.{extension}")
+
+    if mode == 'cprofile':
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(path)
+    else:
+        profiler = SamplingProfiler(threading.get_ident(), ProfilingConfig.SAMPLE_INTERVAL)
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            profiler.write(path)
+
+    run.profile_file = path
+    logger.info("Refresh profile written to %s", path)
+
+
+# Global history of recent refresh runs
+refresh_history = RefreshHistory(ProfilingConfig.HISTORY_SIZE)
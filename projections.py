@@ -0,0 +1,166 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from config import ProjectionConfig
+from indexes import VersionCache
+
+logger = logging.getLogger(__name__)
+
+# League-wide goals per match used when no results have been played yet
+DEFAULT_HOME_GOALS = 1.6
+DEFAULT_AWAY_GOALS = 1.3
+
+# Home team points by outcome: away win, draw, home win
+HOME_POINTS = np.array([0, 1, 3], dtype=np.int8)
+
+
+def build_model(league_table, results, program, prior_matches=ProjectionConfig.PRIOR_MATCHES):
+    """Team strengths and expected goals of every remaining match.
+
+    Attack and defence strengths are goals scored and conceded per match relative to the
+    league average, shrunk towards average by prior_matches of average form. Expected
+    goals of a match are the league's home or away average times attack times defence."""
+    teams = [row['team'] for row in league_table]
+    numbers = {team: number for number, team in enumerate(teams)}
+
+    played = [match for match in results if match['homeGoals'] is not None and match['awayGoals'] is not None]
+    home_average = (sum(match['homeGoals'] for match in played) / len(played)) if played else DEFAULT_HOME_GOALS
+    away_average = (sum(match['awayGoals'] for match in played) / len(played)) if played else DEFAULT_AWAY_GOALS
+    average = max((home_average + away_average) / 2, 0.1)
+
+    matches_played = np.array([row['played'] for row in league_table], dtype=float)
+    attack = (np.array([row['goals_for'] for row in league_table], dtype=float) + prior_matches * average) \
+        / (matches_played + prior_matches) / average
+    defence = (np.array([row['goals_against'] for row in league_table], dtype=float) + prior_matches * average) \
+        / (matches_played + prior_matches) / average
+
+    remaining = [(numbers[match['home']], numbers[match['away']]) for match in program
+                 if match['home'] in numbers and match['away'] in numbers]
+    home = np.array([pair[0] for pair in remaining], dtype=np.intp)
+    away = np.array([pair[1] for pair in remaining], dtype=np.intp)
+    return {
+        'teams': teams,
+        'points': np.array([row['points'] for row in league_table], dtype=np.int64),
+        'goals_for': np.array([row['goals_for'] for row in league_table], dtype=np.int64),
+        'goals_against': np.array([row['goals_against'] for row in league_table], dtype=np.int64),
+        'home': home,
+        'away': away,
+        'home_rate': home_average * attack[home] * defence[away],
+        'away_rate': away_average * attack[away] * defence[home],
+    }
+
+
+def _poisson_cdf(rates, tail=1e-7):
+    """Cumulative Poisson probabilities per rate, one row per goal count up to a negligible tail"""
+    pmf = np.exp(-rates)
+    rows = [pmf]
+    while rows[-1].min() < 1 - tail:
+        pmf = pmf * rates / len(rows)
+        rows.append(rows[-1] + pmf)
+    return np.array(rows, dtype=np.float32)
+
+
+def _sample_goals(rng, rates, simulations):
+    """Poisson goals per (simulation, match) by inverting the CDF on uniform samples.
+
+    Comparing float32 uniforms against each CDF row is several times faster than
+    Generator.poisson and keeps the goals in int8."""
+    uniform = rng.random((simulations, len(rates)), dtype=np.float32)
+    goals = np.zeros((simulations, len(rates)), dtype=np.int8)
+    for row in _poisson_cdf(rates):
+        goals += uniform > row
+    return goals
+
+
+def simulate_batch(model, simulations, seed):
+    """Play out the remaining matches simulations times; returns final position counts per team.
+
+    Goals are Poisson samples with one row per simulated season, so a batch is a handful
+    of array operations. Ties on points are broken by goal difference, goals scored and
+    then by lot."""
+    rng = np.random.default_rng(seed)
+    num_teams = len(model['teams'])
+    home, away = model['home'], model['away']
+
+    home_goals = _sample_goals(rng, model['home_rate'], simulations)
+    away_goals = _sample_goals(rng, model['away_rate'], simulations)
+    outcome = np.sign(home_goals - away_goals) + 1  # 0 away win, 1 draw, 2 home win
+    home_points = HOME_POINTS[outcome]
+    away_points = HOME_POINTS[2 - outcome]
+
+    # Match -> team incidence matrices turn per-match columns into per-team totals
+    home_teams = np.zeros((len(home), num_teams))
+    home_teams[np.arange(len(home)), home] = 1
+    away_teams = np.zeros((len(away), num_teams))
+    away_teams[np.arange(len(away)), away] = 1
+
+    points = model['points'] + home_points @ home_teams + away_points @ away_teams
+    goals_for = model['goals_for'] + home_goals @ home_teams + away_goals @ away_teams
+    goals_against = model['goals_against'] + away_goals @ home_teams + home_goals @ away_teams
+
+    # One sortable key per team: points, then goal difference, then goals scored, then lot
+    key = points * 1e8 + (goals_for - goals_against + 5000) * 1e4 + goals_for + rng.random(points.shape)
+    order = np.argsort(-key, axis=1)
+    positions = np.empty_like(order)
+    positions[np.arange(simulations)[:, None], order] = np.arange(num_teams)
+
+    counts = np.zeros((num_teams, num_teams), dtype=np.int64)
+    for team in range(num_teams):
+        counts[team] = np.bincount(positions[:, team], minlength=num_teams)
+    return counts, points.sum(axis=0)
+
+
+def simulate(model, simulations=ProjectionConfig.SIMULATIONS, batch_size=ProjectionConfig.BATCH_SIZE,
+             workers=ProjectionConfig.WORKERS, seed=ProjectionConfig.SEED):
+    """Simulate in batches, in a process pool when workers > 1; returns (position counts, total points)"""
+    sizes = [min(batch_size, simulations - start) for start in range(0, simulations, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if workers > 1 and len(sizes) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            batches = list(pool.map(simulate_batch, [model] * len(sizes), sizes, seeds))
+    else:
+        batches = [simulate_batch(model, size, batch_seed) for size, batch_seed in zip(sizes, seeds, strict=True)]
+
+    counts = sum(batch[0] for batch in batches)
+    total_points = sum(batch[1] for batch in batches)
+    return counts, total_points
+
+
+def project_season(data, simulations=ProjectionConfig.SIMULATIONS):
+    """Final-position probabilities of every team in a processed snapshot"""
+    raw_data = data.get('raw_data') or {}
+    league_table = data.get('league_table') or []
+    if not league_table:
+        return {'simulations': 0, 'remaining_matches': 0, 'teams': []}
+
+    model = build_model(league_table, raw_data.get('results', []), raw_data.get('program', []))
+    counts, total_points = simulate(model, simulations)
+    probabilities = counts / simulations
+    num_teams = len(league_table)
+    places = np.arange(1, num_teams + 1)
+
+    teams = []
+    for number, row in enumerate(league_table):
+        positions = probabilities[number]
+        teams.append({
+            'team': row['team'],
+            'team_id': row['team_id'],
+            'position': row['position'],
+            'points': row['points'],
+            'expected_points': round(float(total_points[number]) / simulations, 2),
+            'expected_position': round(float(positions @ places), 2),
+            'title': round(float(positions[0]), 4),
+            'promotion': round(float(positions[:ProjectionConfig.PROMOTION_PLACES].sum()), 4),
+            'relegation': round(float(positions[num_teams - ProjectionConfig.RELEGATION_PLACES:].sum()), 4)
+            if ProjectionConfig.RELEGATION_PLACES else 0.0,
+            'positions': [round(float(p), 4) for p in positions],
+        })
+    logger.info("Projected %d teams over %d remaining matches with %d simulations",
+                num_teams, len(model['home']), simulations)
+    return {'simulations': simulations, 'remaining_matches': len(model['home']), 'teams': teams}
+
+
+# Projections per data version; building one takes the cache lock, so concurrent
+# requests for a new version wait for a single simulation run
+projection_cache = VersionCache(project_season, max_versions=8)
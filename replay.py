@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Replay recorded upstream responses through the processing pipeline.
+
+Feeds the responses in the response archive, in fetch order, to
+DataScheduler.fetch_and_process_data as fast as possible, and reports the stage
+timings of every run. Use it to reproduce a processing bug from what the API
+actually sent, or to profile and benchmark on a real sequence of polls.
+
+    python replay.py --from 2024-03-02 --to 2024-03-03     # a whole Saturday
+    python replay.py --hash 3f2a9c...                       # one response
+    python replay.py --repeat 5 --output replay.json        # timings as JSON
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from config import ArchiveConfig, ResponseArchiveConfig
+from hollandsevelden import parse_competition
+from json_stream import JSONStreamReader, iter_text
+from profiling import refresh_history
+from response_archive import ResponseArchive
+from scheduler import DataScheduler
+
+
+def load_recorded(archive, content_hash):
+    """Parse a recorded response the way get_data parses a live one"""
+    return parse_competition(JSONStreamReader(iter_text(archive.iter_response(content_hash))))
+
+
+def replay(archive, entries, scheduler, repeat=1):
+    """Process every entry repeat times; returns one result dict per entry"""
+    results = []
+    for entry in entries:
+        try:
+            raw_data = load_recorded(archive, entry['hash'])
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"  {entry['fetched_at']} {entry['hash'][:12]}  unreadable: {e}")
+            results.append({**entry, 'error': str(e)})
+            continue
+
+        runs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            scheduler.fetch_and_process_data(raw_data=raw_data)
+            runs.append({'wall_ms': round((time.perf_counter() - start) * 1000, 3),
+                         'stages': refresh_history.recent()[0]['stages']})
+        median_ms = statistics.median(run['wall_ms'] for run in runs)
+        print(f"  {entry['fetched_at']} {entry['hash'][:12]}  {median_ms:9.2f} ms  version {scheduler.data_version}")
+        results.append({**entry, 'version': scheduler.data_version, 'median_ms': median_ms, 'runs': runs})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay recorded competition API responses')
+    parser.add_argument('--archive-dir', default=ResponseArchiveConfig.DIR, help='response archive directory')
+    parser.add_argument('--from', dest='start', help='first fetch time to replay (ISO date or timestamp)')
+    parser.add_argument('--to', dest='end', help='replay fetches before this time (ISO date or timestamp)')
+    parser.add_argument('--hash', help='replay only the response with this content hash')
+    parser.add_argument('--unique', action='store_true', help='skip repeated polls of an unchanged response')
+    parser.add_argument('--repeat', type=int, default=1, help='runs per response (median is reported)')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    args = parser.parse_args(argv)
+
+    archive = ResponseArchive(args.archive_dir)
+    entries = list(archive.entries(args.start, args.end))
+    if args.hash:
+        entries = [entry for entry in entries if entry['hash'].startswith(args.hash)][:1]
+    if args.unique:
+        seen = set()
+        entries = [entry for entry in entries if not (entry['hash'] in seen or seen.add(entry['hash']))]
+    if not entries:
+        print(f"No recorded responses in {args.archive_dir} for this selection")
+        return 1
+
+    # Replayed snapshots must not end up in the history archive or the live snapshot
+    ArchiveConfig.ENABLED = False
+
+    print(f"=== REPLAY: {len(entries)} responses from {entries[0]['fetched_at']} to {entries[-1]['fetched_at']} ===")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        scheduler = DataScheduler(data_file=os.path.join(temp_dir, 'league_data.json'))
+        start = time.perf_counter()
+        results = replay(archive, entries, scheduler, args.repeat)
+        elapsed = time.perf_counter() - start
+
+    replayed = [result for result in results if 'error' not in result]
+    print(f"\n{len(replayed)} responses replayed in {elapsed:.2f} s"
+          + (f", median {statistics.median(result['median_ms'] for result in replayed):.2f} ms per response"
+             if replayed else ''))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0 if len(replayed) == len(results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,129 @@
+import contextlib
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime
+from config import ResponseArchiveConfig
+
+logger = logging.getLogger(__name__)
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class ResponseRecorder:
+    """Tees the byte chunks of one upstream response into a compressed temporary file.
+
+    The content hash is computed while the body streams past, so the response is
+    stored once under its hash when it is finished; an unchanged poll only adds an
+    index line."""
+
+    def __init__(self, archive, url):
+        self.archive = archive
+        self.url = url
+        self.fetched_at = datetime.now().isoformat(timespec='seconds')
+        self.digest = hashlib.sha256()
+        self.size = 0
+        fd, self.temp_path = tempfile.mkstemp(dir=archive.objects_dir, suffix='.tmp')
+        self._file = gzip.GzipFile(fileobj=os.fdopen(fd, 'wb'), mode='wb',
+                                   compresslevel=ResponseArchiveConfig.COMPRESS_LEVEL, mtime=0)
+
+    def tee(self, chunks):
+        """Pass byte chunks through, recording them"""
+        for chunk in chunks:
+            self.digest.update(chunk)
+            self.size += len(chunk)
+            self._file.write(chunk)
+            yield chunk
+
+    def finish(self, status):
+        """Store the recorded body under its hash and add it to the fetch index"""
+        self._close()
+        content_hash = self.digest.hexdigest()
+        self.archive.store(self.temp_path, content_hash, {
+            'fetched_at': self.fetched_at,
+            'hash': content_hash,
+            'bytes': self.size,
+            'url': self.url,
+            'status': status,
+        })
+        return content_hash
+
+    def abort(self):
+        """Drop a response that did not arrive completely"""
+        self._close()
+        with contextlib.suppress(OSError):
+            os.remove(self.temp_path)
+
+    def _close(self):
+        fileobj = self._file.fileobj
+        self._file.close()
+        fileobj.close()
+
+
+class ResponseArchive:
+    """Upstream responses stored gzip-compressed under their SHA-256, with a fetch index.
+
+    objects/<hash[:2]>/<hash>.gz holds each distinct body once; index.jsonl has one line
+    per fetch (timestamp, hash, size, URL, status) in fetch order."""
+
+    def __init__(self, directory=ResponseArchiveConfig.DIR):
+        self.directory = directory
+        self.objects_dir = os.path.join(directory, 'objects')
+        self.index_file = os.path.join(directory, 'index.jsonl')
+        self._lock = threading.Lock()
+
+    def object_path(self, content_hash):
+        return os.path.join(self.objects_dir, content_hash[:2], f"{content_hash}.gz")
+
+    def recorder(self, url):
+        """A recorder for one response body fetched from url"""
+        os.makedirs(self.objects_dir, exist_ok=True)
+        return ResponseRecorder(self, url)
+
+    def store(self, temp_path, content_hash, entry):
+        path = self.object_path(content_hash)
+        with self._lock:
+            if os.path.exists(path):
+                os.remove(temp_path)
+                entry['duplicate'] = True
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(temp_path, path)
+                entry['duplicate'] = False
+            with open(self.index_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+        logger.debug("Recorded upstream response %s (%d bytes, duplicate: %s)",
+                     content_hash[:12], entry['bytes'], entry['duplicate'])
+
+    def entries(self, start=None, end=None):
+        """Index entries fetched in [start, end) (ISO timestamps or dates), oldest first"""
+        if not os.path.exists(self.index_file):
+            return
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn last line of an interrupted write
+                if start and entry['fetched_at'] < start:
+                    continue
+                if end and entry['fetched_at'] >= end:
+                    continue
+                yield entry
+
+    def iter_response(self, content_hash, chunk_size=READ_CHUNK_SIZE):
+        """Byte chunks of a recorded response body"""
+        with gzip.open(self.object_path(content_hash), 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+
+# Global archive of upstream responses
+response_archive = ResponseArchive()
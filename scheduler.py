@@ -1,6 +1,7 @@
 import schedule
 import time
 import threading
+from collections import namedtuple
 from datetime import datetime
 from hollandsevelden import (
     get_data, 
@@ -12,153 +13,414 @@ from hollandsevelden import (
     create_team_matrix,
     get_all_matches
 )
+import hashlib
 import json
+import logging
 import os
 from dotenv import load_dotenv
-from config import Config, ScheduleConfig
+from config import Config, ScheduleConfig, ArchiveConfig, SnapshotHistoryConfig
+from archive import archive
+from normalize import normalize_competition
+from match_table import compact_matches, json_default
+from snapshot_history import SnapshotHistory
+from metrics import CACHE_REQUESTS, REFRESH_TOTAL
+from profiling import refresh_history, stage, set_outcome, add_stages, profiling
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Bumped when the record shape changes; older snapshots are rebuilt from their raw data on load
+SNAPSHOT_FORMAT = 2
+
+# View builders run on every refresh, in order; each result is stored under its key
+VIEW_BUILDERS = [
+    ('period_standings', get_filtered_period_standings),
+    ('last_week_results', get_last_week_results),
+    ('next_week_matches', get_next_week_matches),
+    ('featured_team_matches', get_featured_team_matches),
+    ('weekly_results', get_weekly_results),
+    ('team_matrix', create_team_matrix),
+    ('all_matches', get_all_matches),
+]
+
+
+# What a scheduler serves, published as one value so readers never mix data and version
+PublishedData = namedtuple('PublishedData', ['data', 'version', 'last_update'])
+
+
+def compute_data_version(processed_data):
+    """Content hash of the processed views, ignoring the refresh timestamp"""
+    content = {k: v for k, v in processed_data.items() if k != 'last_updated'}
+    serialized = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()[:16]
+
+
+def data_mode(use_test_data=None):
+    """'test' or 'api': the source a snapshot is built from, recorded in the snapshot"""
+    if use_test_data is None:
+        use_test_data = Config.USE_TEST_DATA
+    return 'test' if use_test_data else 'api'
+
+
+def matches_mode(snapshot, mode):
+    """Whether a snapshot was built in the given mode.
+    
+    Snapshots written before the mode was recorded belong to the current mode when its
+    featured team plays in them."""
+    recorded = snapshot.get('mode')
+    if recorded is not None:
+        return recorded == mode
+    return mode == data_mode() and any(row.get('team') == Config.FEATURED_TEAM
+                                       for row in snapshot.get('league_table') or [])
+
+
+def build_processed_data(raw_data, mode=None):
+    """Build every view of a raw payload into the processed snapshot structure"""
+    processed_data = {
+        'format': SNAPSHOT_FORMAT,
+        'mode': mode or data_mode(),
+        'raw_data': raw_data,
+        'league_table': raw_data.get('leaguetable', []),
+    }
+    for key, build_view in VIEW_BUILDERS:
+        with stage(f'view.{key}'):
+            processed_data[key] = build_view(raw_data)
+    processed_data['last_updated'] = datetime.now().isoformat()
+    return processed_data
+
+
+def migrate_snapshot(snapshot):
+    """Rebuild a snapshot of an older format from its raw data, or None if it has none.
+    
+    The refresh time and the recorded mode are kept; a snapshot without a mode stays
+    without one, so matches_mode still judges it by its featured team."""
+    raw_data = snapshot.get('raw_data')
+    if not isinstance(raw_data, dict):
+        return None
+    migrated = build_processed_data(normalize_competition(raw_data), snapshot.get('mode'))
+    if 'mode' not in snapshot:
+        del migrated['mode']
+    if snapshot.get('last_updated'):
+        migrated['last_updated'] = snapshot['last_updated']
+    return migrated
+
+
+def process_payload(raw_data, mode=None, profile=False):
+    """Build and encode a snapshot in a worker process.
+    
+    Returns (snapshot bytes, data version, stage timings) so only one compact bytes
+    object crosses the process boundary instead of the pickled view structures.
+    The parent decides whether the worker profiles; workers have no profiling budget of their own."""
+    with refresh_history.record(profile=profile) as run:
+        processed_data = build_processed_data(raw_data, mode)
+        with stage('encode'):
+            snapshot = json.dumps(processed_data, ensure_ascii=False, indent=2).encode('utf-8')
+        with stage('data_version'):
+            data_version = compute_data_version(processed_data)
+    return snapshot, data_version, run.stages
+
 
 class DataScheduler:
-    def __init__(self):
-        self.data_file = 'league_data.json'
-        self.last_update = None
-        self.cached_data = None
+    def __init__(self, data_file='league_data.json', api_url=None, competition='default',
+                 history_size=0, history_dir=SnapshotHistoryConfig.DIR):
+        self.data_file = data_file
+        self.api_url = api_url
+        self.competition = competition
+        self.published = None  # PublishedData, replaced as a whole
         
+        # Recent versions for rollback; history_size=0 keeps only the live snapshot
+        self.history = SnapshotHistory(history_dir, history_size) if history_size > 0 else None
+        
+    @property
+    def cached_data(self):
+        published = self.published
+        return published.data if published is not None else None
+    
+    @property
+    def data_version(self):
+        published = self.published
+        return published.version if published is not None else None
+    
+    @property
+    def last_update(self):
+        published = self.published
+        return published.last_update if published is not None else None
+    
+    def publish(self, data, version, last_update=None):
+        """Serve data as version; one assignment, so a reader sees the old or the new triple"""
+        self.published = PublishedData(data, version, last_update)
+    
     def clear_cache(self):
         """Force clear all cached data"""
-        print("Clearing cached data...")
-        self.cached_data = None
-        self.last_update = None
+        logger.info("Clearing cached data")
+        self.published = None
+        
+    def save_snapshot(self, processed_data):
+        """Write processed data to the snapshot file"""
+        with open(self.data_file, 'w', encoding='utf-8') as f:
+            json.dump(processed_data, f, ensure_ascii=False, indent=2, default=json_default)
+    
+    def load_snapshot(self):
+        """Read processed data from the snapshot file, or None if there is none.
+        
+        A snapshot in an older format is migrated and written back in the current one."""
+        if not os.path.exists(self.data_file):
+            return None
+        with open(self.data_file, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        if snapshot.get('format') == SNAPSHOT_FORMAT:
+            return snapshot
         
-    def fetch_and_process_data(self):
-        """Fetch data from API and process all required views"""
-        print(f"Fetching data at {datetime.now()}")
+        migrated = migrate_snapshot(snapshot)
+        if migrated is None:
+            logger.info("Ignoring snapshot %s in an older format without raw data", self.data_file)
+            return None
+        try:
+            self.save_snapshot(migrated)
+        except OSError as e:
+            logger.warning("Could not write migrated snapshot %s: %s", self.data_file, e)
+        logger.info("Migrated snapshot %s from format %s to %s",
+                    self.data_file, snapshot.get('format', 1), SNAPSHOT_FORMAT)
+        return migrated
+    
+    def fetch_and_process_data(self, raw_data=None, executor=None, publish=True):
+        """Fetch data from API and process all required views.
         
+        Pass raw_data to process an already fetched payload instead (benchmarks, replays).
+        Pass a ProcessPoolExecutor to build the views in a worker process.
+        publish=False only writes (and archives) the snapshot, for data that is not
+        kept in memory; a worker's snapshot is then not decoded unless the archive needs it.
+        Every stage is timed and kept in refresh_history."""
+        with refresh_history.record():
+            self._fetch_and_process_data(raw_data, executor, publish)
+    
+    def _fetch_and_process_data(self, raw_data, executor, publish):
         # Check if we should use test data
         use_test_data = Config.USE_TEST_DATA
-        print(f"Scheduler: USE_TEST_DATA = {use_test_data}")
+        logger.info("Fetching data (test data: %s)", use_test_data)
         
         try:
             # Get raw data (will use test data if configured)
-            raw_data = get_data(use_test_data=use_test_data)
+            if raw_data is None:
+                with stage('fetch'):
+                    raw_data = get_data(use_test_data=use_test_data, api_url=self.api_url)
+            else:
+                # Fetched data is normalized while parsing; supplied payloads may be in any source shape
+                with stage('normalize'):
+                    raw_data = normalize_competition(raw_data)
             if not raw_data:
-                print("Failed to fetch data")
+                logger.warning("Failed to fetch data; keeping the last good snapshot")
+                REFRESH_TOTAL.inc(outcome='no_data')
+                set_outcome('no_data')
                 return
             
+            if executor is None:
+                # Process all required views
+                processed_data = build_processed_data(raw_data, data_mode(use_test_data))
+                
+                # Save to file
+                with stage('snapshot_write'):
+                    self.save_snapshot(processed_data)
+                
+                with stage('data_version'):
+                    data_version = compute_data_version(processed_data)
+            else:
+                # Views are built and encoded in a worker; write its bytes, decode them only to serve or archive
+                with stage('process'):
+                    snapshot, data_version, worker_stages = executor.submit(
+                        process_payload, raw_data, data_mode(use_test_data), profiling()).result()
+                add_stages(worker_stages, 'process')
+                
+                with stage('snapshot_write'), open(self.data_file, 'wb') as f:
+                    f.write(snapshot)
+                
+                processed_data = None
+                if publish or ArchiveConfig.ENABLED:
+                    with stage('decode'):
+                        processed_data = json.loads(snapshot)
+            
+            if ArchiveConfig.ENABLED:
+                with stage('archive'):
+                    self._archive(processed_data, data_version, use_test_data)
             
-            # Process all required views
-            processed_data = {
-                'raw_data': raw_data,
-                'league_table': raw_data.get('leaguetable', []),
-                'period_standings': get_filtered_period_standings(raw_data),
-                'last_week_results': get_last_week_results(raw_data),
-                'next_week_matches': get_next_week_matches(raw_data),
-                'featured_team_matches': get_featured_team_matches(raw_data),
-                'weekly_results': get_weekly_results(raw_data),
-                'team_matrix': create_team_matrix(raw_data),
-                'all_matches': get_all_matches(raw_data),
-                'last_updated': datetime.now().isoformat()
-            }
+            if not publish:
+                REFRESH_TOTAL.inc(outcome='success')
+                set_outcome('success')
+                logger.info("Data saved, version %s; not kept in memory", data_version)
+                return
             
-            # Save to file
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(processed_data, f, ensure_ascii=False, indent=2)
+            # Resident data keeps its match lists as compact tables
+            if self.history is None:
+                with stage('compact'):
+                    compacted = compact_matches(processed_data)
+            else:
+                with stage('history'):
+                    compacted = self.history.add(data_version, processed_data)
             
-            self.cached_data = processed_data
-            self.last_update = datetime.now()
-            print(f"Data successfully updated and saved at {self.last_update}")
+            pinned = self.history.pinned if self.history is not None else None
+            if pinned is not None and pinned != data_version:
+                logger.info("Version %s kept in the history; serving pinned version %s", data_version, pinned)
+                if self.data_version != pinned:
+                    self._publish_version(pinned)
+            else:
+                self.publish(compacted, data_version, datetime.now())
+            REFRESH_TOTAL.inc(outcome='success')
+            set_outcome('success')
+            logger.info("Data updated and saved, version %s", data_version)
             
         except Exception as e:
-            print(f"Error fetching/processing data: {e}")
+            REFRESH_TOTAL.inc(outcome='error')
+            set_outcome('error')
+            logger.exception("Error fetching/processing data: %s", e)
+    
+    def _publish_version(self, version):
+        """Serve a version from the history: a pointer swap, nothing is reprocessed"""
+        snapshot = self.history.get(version) if self.history is not None else None
+        if snapshot is None:
+            return False
+        self.publish(snapshot, version, _last_update(snapshot))
+        return True
+    
+    def get_version(self, version):
+        """A retained snapshot by data version, or None"""
+        published = self.published
+        if published is not None and version == published.version:
+            return published.data
+        return self.history.get(version) if self.history is not None else None
+    
+    def rollback(self, version):
+        """Serve a retained version until the next refresh; False if it is not retained"""
+        if not self._publish_version(version):
+            return False
+        logger.warning("Rolled back to version %s", version)
+        return True
+    
+    def pin(self, version):
+        """Serve a retained version until unpinned; refreshes only add to the history meanwhile"""
+        if self.history is None or not self.history.pin(version):
+            return False
+        self._publish_version(version)
+        logger.warning("Pinned version %s", version)
+        return True
+    
+    def unpin(self):
+        """Release the pin and serve the newest retained version"""
+        if self.history is None:
+            return None
+        self.history.pin(None)
+        latest = self.history.latest()
+        if latest is not None:
+            self._publish_version(latest)
+        logger.warning("Unpinned; serving version %s", self.data_version)
+        return self.data_version
+    
+    def _archive(self, processed_data, data_version, use_test_data):
+        """Append the snapshot to the history archive; a failure never fails the refresh"""
+        try:
+            archive.ingest('test' if use_test_data else self.competition, processed_data, data_version)
+        except Exception as e:
+            logger.exception("Archiving snapshot failed: %s", e)
     
     def get_cached_data(self):
-        """Get cached data, load from file if not in memory"""
-        current_mode = Config.USE_TEST_DATA
+        """Data of the current mode, or None; see get_published"""
+        published = self.get_published()
+        return published.data if published is not None else None
+    
+    def get_published(self):
+        """PublishedData of the current mode: from memory, else from the snapshot file, else fetched.
         
-        if current_mode:
-            print("Test mode enabled - fetching fresh test data...")
-            self.fetch_and_process_data()
-            return self.cached_data
-            
-        # API mode - check if we need to fetch fresh data
-        need_fresh_data = False
-        
-        # Always check if cached data matches current mode, even if we have data in memory
-        if self.cached_data is not None:
-            # Check if in-memory cached data matches current mode
-            cached_featured_team = self.cached_data.get('raw_data', {}).get('leaguetable', [{}])[0].get('team', '')
-            expected_team = Config.FEATURED_TEAM
-            
-            if not (expected_team in cached_featured_team or cached_featured_team in expected_team):
-                print(f"In-memory cached data is for different mode (found: {cached_featured_team}, expected: {expected_team})")
-                self.cached_data = None  # Force reload
-                need_fresh_data = True
-            else:
-                print(f"In-memory cached data matches current mode: {expected_team}")
-                return self.cached_data
-        
-        if self.cached_data is None:
-            # No data in memory, try to load from file
-            try:
-                if os.path.exists(self.data_file):
-                    with open(self.data_file, 'r', encoding='utf-8') as f:
-                        cached_file_data = json.load(f)
-                        
-                    # Check if cached data matches current mode (API mode = Columbia, Test mode = Gorecht)
-                    cached_featured_team = cached_file_data.get('raw_data', {}).get('leaguetable', [{}])[0].get('team', '')
-                    expected_team = Config.FEATURED_TEAM  # Should be 'AVV Columbia' in API mode
-                    
-                    if expected_team in cached_featured_team or cached_featured_team in expected_team:
-                        # Cache matches current mode
-                        self.cached_data = cached_file_data
-                        if 'last_updated' in self.cached_data:
-                            self.last_update = datetime.fromisoformat(self.cached_data['last_updated'])
-                        print(f"Loaded cached data matching current mode: {expected_team}")
-                    else:
-                        # Cache doesn't match current mode
-                        print(f"Cached data is for different mode (found: {cached_featured_team}, expected: {expected_team})")
-                        need_fresh_data = True
-                else:
-                    print("No cached data file found")
-                    need_fresh_data = True
-                    
-            except Exception as e:
-                print(f"Error loading cached data: {e}")
-                need_fresh_data = True
-        
-        # Fetch fresh data if needed
-        if need_fresh_data:
-            print("Fetching fresh API data...")
+        Served data is only replaced once a replacement is in hand, so while the
+        upstream is failing the last good snapshot stays in service. Read data and
+        version from the one returned value; the scheduler may publish a newer one meanwhile."""
+        mode = data_mode()
+        
+        if mode == 'test':
+            logger.debug("Test mode enabled - fetching fresh test data")
+            CACHE_REQUESTS.inc(result='revalidate')
             self.fetch_and_process_data()
+            return self.published
+        
+        published = self.published
+        if published is not None and matches_mode(published.data, mode):
+            CACHE_REQUESTS.inc(result='hit')
+            return published
         
-        return self.cached_data
+        if self._load_from_file(mode):
+            CACHE_REQUESTS.inc(result='miss')
+            return self.published
+        
+        logger.info("No %s data in memory or on disk, fetching", mode)
+        CACHE_REQUESTS.inc(result='revalidate')
+        self.fetch_and_process_data()
+        published = self.published
+        return published if published is not None and matches_mode(published.data, mode) else None
+    
+    def _load_from_file(self, mode):
+        """Serve the snapshot file if it was built in this mode; False if there is none"""
+        try:
+            snapshot = self.load_snapshot()
+        except Exception as e:
+            logger.warning("Error loading cached data: %s", e)
+            return False
+        if snapshot is None:
+            logger.info("No cached data file found")
+            return False
+        if not matches_mode(snapshot, mode):
+            logger.info("Cached data file %s is not %s data", self.data_file, mode)
+            return False
+        
+        data_version = compute_data_version(snapshot)
+        
+        # A version pinned before a restart stays live
+        pinned = self.history.pinned if self.history is not None else None
+        if pinned in (None, data_version) or not self._publish_version(pinned):
+            self.publish(compact_matches(snapshot), data_version, _last_update(snapshot))
+        logger.info("Loaded cached %s data from %s", mode, self.data_file)
+        return True
     
     def start_scheduler(self):
         """Start the background scheduler"""
-        # Schedule daily update
-        schedule.every().day.at(ScheduleConfig.DAILY_UPDATE_TIME).do(self.fetch_and_process_data)
-        
-        # Schedule Saturday updates using centralized configuration
-        for time_slot in ScheduleConfig.SATURDAY_TIMES:
-            schedule.every().saturday.at(time_slot).do(self.fetch_and_process_data)
+        schedule_refresh(self.fetch_and_process_data)
         
         # Initial data fetch if no cached data
         if not os.path.exists(self.data_file):
             self.fetch_and_process_data()
         
-        def run_scheduler():
-            while True:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
-        
-        # Start scheduler in background thread
-        scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
-        scheduler_thread.start()
-        print("Data scheduler started")
+        start_schedule_thread()
+        logger.info("Data scheduler started")
+
+
+def _last_update(snapshot):
+    return datetime.fromisoformat(snapshot['last_updated']) if snapshot.get('last_updated') else None
+
+
+def schedule_refresh(job):
+    """Run job at the daily update time and on Saturday afternoons"""
+    schedule.every().day.at(ScheduleConfig.DAILY_UPDATE_TIME).do(job)
+    
+    # Schedule Saturday updates using centralized configuration
+    for time_slot in ScheduleConfig.SATURDAY_TIMES:
+        schedule.every().saturday.at(time_slot).do(job)
+
+
+_schedule_thread = None
+
+def start_schedule_thread():
+    """Start the one background thread that runs all scheduled jobs"""
+    global _schedule_thread
+    if _schedule_thread is not None:
+        return
+    
+    def run_scheduler():
+        while True:
+            schedule.run_pending()
+            time.sleep(60)  # Check every minute
+    
+    _schedule_thread = threading.Thread(target=run_scheduler, daemon=True)
+    _schedule_thread.start()
 
 
 # Global scheduler instance
-data_scheduler = DataScheduler()
\ No newline at end of file
+data_scheduler = DataScheduler(history_size=SnapshotHistoryConfig.SIZE)
\ No newline at end of file
@@ -0,0 +1,276 @@
+import hashlib
+import threading
+from datetime import datetime
+from flask import render_template
+from config import Config
+
+# Carousel order of the data slides (the intro screen is part of the page)
+SLIDE_NAMES = [
+    'standings',
+    'period1',
+    'period2',
+    'period3',
+    'last-week-results',
+    'next-week-matches',
+    'featured-team-matches',
+    'team-matrix',
+]
+
+PLAYED_STATUSES = {'Gespeeld', 'played', 'Afgelopen', 'Finished', 'Final'}
+
+
+def _parse_date(date_str):
+    """Parse a 'YYYY-MM-DD' date into a datetime, or None if it is not one"""
+    try:
+        return datetime.strptime(date_str, '%Y-%m-%d')
+    except (TypeError, ValueError):
+        return None
+
+
+def _names_match(name, team_name):
+    """Loose team name comparison used throughout the dashboard"""
+    return bool(name and team_name) and (team_name in name or name in team_name)
+
+
+def _is_featured_match(match, featured_team):
+    return _names_match(match['home'], featured_team) or _names_match(match['away'], featured_team)
+
+
+def _is_played(match):
+    """Check played status, falling back to numeric scores when status is missing"""
+    if match['status']:
+        return match['status'] in PLAYED_STATUSES
+    return match['homeGoals'] is not None and match['awayGoals'] is not None
+
+
+def _week_label(date):
+    return f"Week {date.isocalendar()[1]} ({date.year})"
+
+
+def _group_by_week(matches, featured_team, newest_first):
+    """Group matches by ISO week, featured team matches first within each week"""
+    weeks = {}
+    for match in matches:
+        date = _parse_date(match['date'])
+        if date is None:
+            continue
+        key = (date.year, date.isocalendar()[1])
+        weeks.setdefault(key, {'label': _week_label(date), 'matches': []})['matches'].append((date, match))
+
+    grouped = []
+    for key in sorted(weeks, reverse=newest_first):
+        week_matches = sorted(weeks[key]['matches'], key=lambda item: item[0], reverse=newest_first)
+        week_matches.sort(key=lambda item: not _is_featured_match(item[1], featured_team))
+        grouped.append({'label': weeks[key]['label'], 'matches': [match for _, match in week_matches]})
+    return grouped
+
+
+def _team_form(team_name, all_matches):
+    """Last 5 played results for a team as win/draw/loss/unplayed, oldest first"""
+    team_matches = [match for match in all_matches
+                    if _names_match(match['home'], team_name) or _names_match(match['away'], team_name)]
+    team_matches.sort(key=lambda match: match['date'])
+
+    last_played = [match for match in team_matches if _is_played(match)][-5:]
+    form = ['unplayed'] * (5 - len(last_played))
+
+    for match in last_played:
+        home_goals, away_goals = match['homeGoals'], match['awayGoals']
+        team_lower = team_name.lower()
+        is_home = _names_match(match['home'].lower(), team_lower)
+        is_away = _names_match(match['away'].lower(), team_lower)
+
+        if not (is_home or is_away) or home_goals is None or away_goals is None:
+            form.append('unplayed')
+        elif home_goals == away_goals:
+            form.append('draw')
+        elif (is_home and home_goals > away_goals) or (is_away and away_goals > home_goals):
+            form.append('win')
+        else:
+            form.append('loss')
+    return form
+
+
+def _standings_rows(standings, featured_team, all_matches=None):
+    """League or period table rows for display"""
+    rows = []
+    for team in standings:
+        name = team['team']
+        rows.append({
+            'position': team['position'],
+            'name': name,
+            'played': team['played'],
+            'wins': team['wins'],
+            'draws': team['draws'],
+            'losses': team['losses'],
+            'goal_difference': team['goals_for'] - team['goals_against'],
+            'points': team['points'],
+            'featured': _names_match(name, featured_team),
+            'form': _team_form(name, all_matches) if all_matches is not None else None,
+        })
+    return rows
+
+
+def _standings_context(data, featured_team):
+    # Build the match dicts once for the form of every team
+    rows = _standings_rows(data.get('league_table', []), featured_team, list(data.get('all_matches', [])))
+    return {'columns': [rows[0:7], rows[7:14]], 'show_form': True}
+
+
+def _period_context(data, featured_team, period_key):
+    period = data.get('raw_data', {}).get(period_key) or []
+    if not any(team['played'] > 0 for team in period):
+        return None  # Only show periods in which matches have been played
+
+    rows = _standings_rows(period, featured_team)
+    return {
+        'title': period_key.replace('period', 'Periode '),
+        'columns': [rows[0:7], rows[7:14]],
+        'show_form': False,
+    }
+
+
+def _last_week_results_context(data, featured_team):
+    results = [match for match in data.get('last_week_results', [])
+               if match['status'] == 'Gespeeld' or
+               (match['homeGoals'] is not None and match['awayGoals'] is not None)]
+    results = sorted(results, key=lambda match: match['date'], reverse=True)[:7]
+
+    weeks = _group_by_week(results, featured_team, newest_first=True)
+    for week in weeks:
+        week['matches'] = [{
+            'home': match['home'] or 'Team A',
+            'away': match['away'] or 'Team B',
+            'home_goals': match['homeGoals'] or 0,
+            'away_goals': match['awayGoals'] or 0,
+            'featured': _is_featured_match(match, featured_team),
+        } for match in week['matches']]
+    return {'weeks': weeks}
+
+
+def _next_week_matches_context(data, featured_team):
+    weeks = _group_by_week(data.get('next_week_matches', []), featured_team, newest_first=False)
+    for week in weeks:
+        matches = []
+        for match in week['matches']:
+            matches.append({
+                'home': match['home'] or 'Team A',
+                'away': match['away'] or 'Team B',
+                'date': _parse_date(match['date']).strftime('%d-%m'),
+                'time': match['time'],
+                'featured': _is_featured_match(match, featured_team),
+            })
+        week['matches'] = matches
+    return {'weeks': weeks}
+
+
+def _featured_team_matches_context(data, featured_team):
+    featured = data.get('featured_team_matches', {})
+    all_matches = list(featured.get('played', [])) + list(featured.get('upcoming', []))
+
+    played = sorted((m for m in all_matches if _is_played(m)), key=lambda m: m['date'], reverse=True)
+    upcoming = sorted((m for m in all_matches if not _is_played(m)), key=lambda m: m['date'])
+
+    def summarize(match, opponent):
+        date = _parse_date(match['date'])
+        return {
+            'opponent': opponent,
+            'played': _is_played(match),
+            'home_goals': match['homeGoals'] or 0,
+            'away_goals': match['awayGoals'] or 0,
+            'date': date.strftime('%d-%m') if date else '',
+        }
+
+    ordered = played + upcoming
+    return {
+        'featured_team': featured_team,
+        'home_matches': [summarize(m, m['away'] or 'Team') for m in ordered if _names_match(m['home'], featured_team)],
+        'away_matches': [summarize(m, m['home'] or 'Team') for m in ordered if _names_match(m['away'], featured_team)],
+    }
+
+
+def _format_matrix_cell(value):
+    """Show scores as-is and YYYY-MM-DD dates as DD-MM"""
+    if not value:
+        return '-'
+    if '-' in value and len(value) <= 5:
+        return value
+    date = _parse_date(value)
+    return date.strftime('%d-%m') if date else value
+
+
+def _team_matrix_context(data, featured_team):
+    team_matrix = data.get('team_matrix') or {}
+    teams = team_matrix.get('teams', [])
+    matrix = team_matrix.get('matrix', {})
+    return {
+        'teams': [team[:8] for team in teams],
+        'rows': [{
+            'team': team[:8],
+            'featured': _names_match(team, featured_team),
+            'cells': [_format_matrix_cell(matrix.get(team, {}).get(opponent)) for opponent in teams],
+        } for team in teams],
+    }
+
+
+SLIDE_BUILDERS = {
+    'standings': ('slides/standings.html', _standings_context),
+    'period1': ('slides/standings.html', lambda data, team: _period_context(data, team, 'period1')),
+    'period2': ('slides/standings.html', lambda data, team: _period_context(data, team, 'period2')),
+    'period3': ('slides/standings.html', lambda data, team: _period_context(data, team, 'period3')),
+    'last-week-results': ('slides/last_week_results.html', _last_week_results_context),
+    'next-week-matches': ('slides/next_week_matches.html', _next_week_matches_context),
+    'featured-team-matches': ('slides/featured_team_matches.html', _featured_team_matches_context),
+    'team-matrix': ('slides/team_matrix.html', _team_matrix_context),
+}
+
+
+def render_slide(name, data, featured_team=None):
+    """Render one slide as an HTML fragment, or None if it has nothing to show"""
+    template, build_context = SLIDE_BUILDERS[name]
+    context = build_context(data, featured_team or Config.FEATURED_TEAM)
+    if context is None:
+        return None
+    return render_template(template, **context)
+
+
+class SlideCache:
+    """Rendered slide fragments and their content hashes, kept until the data version changes"""
+
+    def __init__(self):
+        self.version = None
+        self.fragments = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, name, data, version):
+        """Return (fragment, hash) for a slide, rendering it once per data version"""
+        with self._lock:
+            if version != self.version:
+                self.version = version
+                self.fragments = {}
+            if name not in self.fragments:
+                fragment = render_slide(name, data)
+                fragment_hash = hashlib.sha256(fragment.encode('utf-8')).hexdigest()[:12] if fragment else None
+                self.fragments[name] = (fragment, fragment_hash)
+            return self.fragments[name]
+
+    def get(self, name, data, version):
+        """Return the cached HTML fragment for a slide, or None if it has no content"""
+        return self._entry(name, data, version)[0]
+
+    def get_hash(self, name, data, version):
+        """Return the content hash of a slide fragment"""
+        return self._entry(name, data, version)[1]
+
+    def manifest(self, data, version):
+        """Name and content hash of every slide with content, in carousel order"""
+        slides = []
+        for name in SLIDE_NAMES:
+            fragment_hash = self.get_hash(name, data, version)
+            if fragment_hash is not None:
+                slides.append({'name': name, 'hash': fragment_hash})
+        return slides
+
+
+# Global slide cache instance
+slide_cache = SlideCache()
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from match_table import compact_matches, json_default
+
+logger = logging.getLogger(__name__)
+
+
+def _write_atomic(path, content):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(content)
+    os.replace(temp_path, path)
+
+
+class SnapshotHistory:
+    """The last `size` processed snapshots by data version, in memory and on disk.
+
+    Each view of a snapshot (league table, raw data, weekly results, ...) is stored once
+    under the hash of its content, so versions share the views that did not change:
+    in memory as the same compacted object, on disk as the same views/<hash>.json file.
+    index.json lists the retained versions, oldest first, and the pinned version.
+    A pinned version is never evicted."""
+
+    def __init__(self, directory, size):
+        self.directory = directory
+        self.size = size
+        self.views_dir = os.path.join(directory, 'views')
+        self.index_file = os.path.join(directory, 'index.json')
+        self.entries = OrderedDict()  # version -> {'version', 'last_updated', 'stored_at', 'views': {key: hash}}
+        self.pinned = None
+        self._views = {}  # view hash -> compacted view, for views loaded or added in this process
+        self._snapshots = {}  # version -> assembled snapshot dict
+        self._lock = threading.RLock()
+        self._load_index()
+
+    def _view_path(self, view_hash):
+        return os.path.join(self.views_dir, f"{view_hash}.json")
+
+    def _load_index(self):
+        """Read the index written by an earlier process; views are loaded when first used"""
+        if not os.path.exists(self.index_file):
+            return
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable snapshot history index %s: %s", self.index_file, e)
+            return
+        for entry in index.get('versions', []):
+            self.entries[entry['version']] = entry
+        self.pinned = index.get('pinned') if index.get('pinned') in self.entries else None
+
+    def _save_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        index = {'pinned': self.pinned, 'versions': list(self.entries.values())}
+        _write_atomic(self.index_file, json.dumps(index, indent=2).encode('utf-8'))
+
+    def _view(self, view_hash):
+        view = self._views.get(view_hash)
+        if view is None:
+            with open(self._view_path(view_hash), 'r', encoding='utf-8') as f:
+                view = self._views[view_hash] = compact_matches(json.load(f))
+        return view
+
+    def add(self, version, processed_data):
+        """Retain a processed snapshot; returns it compacted, sharing unchanged views with older versions"""
+        with self._lock:
+            if version == self.latest() and self.get(version) is not None:
+                # Unchanged refresh: only the timestamp moves on
+                self.entries[version]['last_updated'] = processed_data.get('last_updated')
+                self._snapshots[version] = dict(self._snapshots[version], last_updated=processed_data.get('last_updated'))
+                return self._snapshots[version]
+
+            os.makedirs(self.views_dir, exist_ok=True)
+            views = {}
+            for key, value in processed_data.items():
+                if key == 'last_updated':
+                    continue
+                encoded = json.dumps(value, sort_keys=True, ensure_ascii=False, default=json_default).encode('utf-8')
+                view_hash = hashlib.sha256(encoded).hexdigest()[:20]
+                views[key] = view_hash
+                if view_hash not in self._views:
+                    if not os.path.exists(self._view_path(view_hash)):
+                        _write_atomic(self._view_path(view_hash), encoded)
+                    self._views[view_hash] = compact_matches(value)
+
+            self.entries.pop(version, None)
+            self._snapshots.pop(version, None)
+            self.entries[version] = {
+                'version': version,
+                'last_updated': processed_data.get('last_updated'),
+                'stored_at': datetime.now().isoformat(timespec='seconds'),
+                'views': views,
+            }
+            self._evict()
+            self._save_index()
+            return self.get(version)
+
+    def _evict(self):
+        """Drop the oldest unpinned versions beyond size, then views no version uses"""
+        for version in list(self.entries):
+            if len(self.entries) <= self.size:
+                break
+            if version != self.pinned:
+                del self.entries[version]
+                self._snapshots.pop(version, None)
+
+        used = {view_hash for entry in self.entries.values() for view_hash in entry['views'].values()}
+        for view_hash in [view_hash for view_hash in self._views if view_hash not in used]:
+            del self._views[view_hash]
+        for name in os.listdir(self.views_dir):
+            if name.endswith('.json') and name[:-len('.json')] not in used:
+                os.remove(os.path.join(self.views_dir, name))
+
+    def get(self, version):
+        """The retained snapshot of a version (compacted, read-only), or None"""
+        with self._lock:
+            snapshot = self._snapshots.get(version)
+            if snapshot is not None:
+                return snapshot
+            entry = self.entries.get(version)
+            if entry is None:
+                return None
+            try:
+                snapshot = {key: self._view(view_hash) for key, view_hash in entry['views'].items()}
+            except (OSError, ValueError) as e:
+                logger.warning("Snapshot version %s cannot be read from the history: %s", version, e)
+                return None
+            snapshot['last_updated'] = entry['last_updated']
+            self._snapshots[version] = snapshot
+            return snapshot
+
+    def latest(self):
+        with self._lock:
+            return next(reversed(self.entries), None)
+
+    def pin(self, version):
+        """Pin a retained version (None unpins); False if the version is not retained"""
+        with self._lock:
+            if version is not None and version not in self.entries:
+                return False
+            self.pinned = version
+            self._save_index()
+            return True
+
+    def versions(self):
+        """Retained versions, newest first"""
+        with self._lock:
+            return [{'version': entry['version'], 'last_updated': entry['last_updated'],
+                     'stored_at': entry['stored_at'], 'pinned': entry['version'] == self.pinned}
+                    for entry in reversed(self.entries.values())]
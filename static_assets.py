@@ -0,0 +1,144 @@
+import hashlib
+import logging
+import os
+import posixpath
+import re
+import threading
+from flask import make_response, request
+from werkzeug.security import safe_join
+
+logger = logging.getLogger(__name__)
+
+# One year, the practical maximum for Cache-Control max-age
+IMMUTABLE_MAX_AGE = 31536000
+
+# url(...) references in stylesheets; data: and external URLs are left alone
+_CSS_URL = re.compile(r'''url\(\s*(['"]?)([^'")\s]+)\1\s*\)''')
+
+
+class AssetManifest:
+    """Content hashes of static files, computed when a URL for the file is first built.
+
+    Only files that are referenced get hashed. Hashes are kept per file size and
+    modification time, so a changed file gets a new URL without a restart. Stylesheets
+    are served with their url(...) references fingerprinted too, and their own hash
+    covers the rewritten text, so a changed background image changes the CSS URL."""
+
+    def __init__(self, app=None):
+        self.static_folder = None
+        self._hashes = {}  # filename -> ((size, mtime), hash)
+        self._stylesheets = {}  # filename -> ((size, mtime), {referenced filename: hash}, rewritten bytes, hash)
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Hook fingerprinting into url_for('static', ...) and serve rewritten stylesheets"""
+        self.static_folder = app.static_folder
+        app.url_defaults(self._add_fingerprint)
+        app.after_request(self._set_cache_headers)
+        static_view = app.view_functions['static']
+
+        def static(filename):
+            if filename.endswith('.css'):
+                stylesheet = self._stylesheet(filename)
+                if stylesheet is not None:
+                    response = make_response(stylesheet[2])
+                    response.mimetype = 'text/css'
+                    response.set_etag(stylesheet[3])
+                    response.cache_control.no_cache = True
+                    return response.make_conditional(request)
+            return static_view(filename=filename)
+        app.view_functions['static'] = static
+        app.extensions['asset_manifest'] = self
+
+    def _path(self, filename):
+        path = safe_join(self.static_folder, filename) if self.static_folder and filename else None
+        return path if path and os.path.isfile(path) else None
+
+    @staticmethod
+    def _stat_key(path):
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def fingerprint(self, filename):
+        """Return the content hash for a static filename, or None if there is no such file"""
+        if filename.endswith('.css'):
+            stylesheet = self._stylesheet(filename)
+            return stylesheet[3] if stylesheet is not None else None
+
+        path = self._path(filename)
+        if path is None:
+            return None
+        stat_key = self._stat_key(path)
+        entry = self._hashes.get(filename)
+        if entry is None or entry[0] != stat_key:
+            with open(path, 'rb') as f:
+                entry = (stat_key, hashlib.sha256(f.read()).hexdigest()[:12])
+            with self._lock:
+                self._hashes[filename] = entry
+        return entry[1]
+
+    def _referenced_filename(self, stylesheet, url):
+        """Static filename a url(...) in a stylesheet points at, or None"""
+        if url.startswith(('data:', '#')) or '//' in url:
+            return None
+        url = url.split('?', 1)[0].split('#', 1)[0]
+        if url.startswith('/static/'):
+            return url[len('/static/'):]
+        if url.startswith('/'):
+            return None
+        return posixpath.normpath(posixpath.join(posixpath.dirname(stylesheet), url))
+
+    def _stylesheet(self, filename):
+        """(stat key, references, rewritten bytes, hash) of a stylesheet, or None if it does not exist"""
+        path = self._path(filename)
+        if path is None:
+            return None
+        stat_key = self._stat_key(path)
+        entry = self._stylesheets.get(filename)
+        if entry is not None and entry[0] == stat_key and all(
+                self.fingerprint(reference) == fingerprint for reference, fingerprint in entry[1].items()):
+            return entry
+
+        with open(path, 'r', encoding='utf-8') as f:
+            css = f.read()
+        references = {}
+
+        def versioned(match):
+            quote, url = match.groups()
+            reference = self._referenced_filename(filename, url)
+            fingerprint = self.fingerprint(reference) if reference and '?' not in url else None
+            if fingerprint is None:
+                return match.group()
+            references[reference] = fingerprint
+            return f'url({quote}{url}?v={fingerprint}{quote})'
+
+        rewritten = _CSS_URL.sub(versioned, css).encode('utf-8')
+        entry = (stat_key, references, rewritten, hashlib.sha256(rewritten).hexdigest()[:12])
+        with self._lock:
+            self._stylesheets[filename] = entry
+        logger.debug("Fingerprinted %d url() references in %s", len(references), filename)
+        return entry
+
+    def _add_fingerprint(self, endpoint, values):
+        """Append ?v=<hash> to static URLs so changed content gets a new URL"""
+        if endpoint != 'static' or 'v' in values:
+            return
+        fingerprint = self.fingerprint(values.get('filename', ''))
+        if fingerprint:
+            values['v'] = fingerprint
+
+    def _set_cache_headers(self, response):
+        """Mark fingerprinted static responses as immutable for a year"""
+        if request.endpoint != 'static' or response.status_code != 200:
+            return response
+
+        version = request.args.get('v')
+        filename = (request.view_args or {}).get('filename', '')
+        if version and version == self.fingerprint(filename):
+            response.cache_control.public = True
+            response.cache_control.max_age = IMMUTABLE_MAX_AGE
+            response.cache_control.immutable = True
+            response.cache_control.no_cache = None
+        return response
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the HollandseVelden competition API, for load tests.
+
+Replays recorded competition payloads (cycled per request, so a recorded sequence
+can be played back) or serves a synthetic league, with configurable latency,
+error rates and payload padding.
+
+    python stub_api.py --payload noord-zaterdag-1f.json --latency-ms 200 --error-rate 0.05
+    python stub_api.py --teams 18 --seasons 10 --pad-kb 512
+
+Point the dashboard at it with HOLLANDSE_VELDEN_API_URL=http://127.0.0.1:8765/
+"""
+
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from synthetic_data import generate_league, to_api_payload
+
+
+class StubSettings:
+    """Behaviour of the stub server, shared by all handler threads"""
+
+    def __init__(self, payloads, latency, jitter, error_rate, decode_error_rate, seed):
+        self.payloads = itertools.cycle(payloads)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.decode_error_rate = decode_error_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests_served = 0
+
+    def next_response(self):
+        """Pick delay, status and body for the next request"""
+        with self.lock:
+            self.requests_served += 1
+            delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+            roll = self.rng.random()
+            payload = next(self.payloads)
+
+        if roll < self.error_rate:
+            return delay, 503, b'{"error": "stub: service unavailable"}'
+        if roll < self.error_rate + self.decode_error_rate:
+            return delay, 200, payload[:len(payload) // 2]  # Truncated JSON
+        return delay, 200, payload
+
+
+def make_handler(settings):
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            delay, status, body = settings.next_response()
+            time.sleep(delay)
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Keep load tests quiet
+
+    return StubHandler
+
+
+def _pad(payload, pad_kb):
+    """Add an unused field so payload size can be scaled independently of the league"""
+    if pad_kb > 0:
+        payload['competition']['links'] = {'padding': 'x' * (pad_kb * 1024)}
+    return payload
+
+
+def build_payloads(args):
+    """Encode the recorded payload files, or a synthetic league, as response bodies"""
+    payloads = []
+    if args.payload:
+        for path in args.payload:
+            with open(path, 'r', encoding='utf-8') as f:
+                payloads.append(_pad(json.load(f), args.pad_kb))
+    else:
+        raw_data = generate_league(num_teams=args.teams, rounds=args.rounds,
+                                   seasons=args.seasons, seed=args.seed)
+        payloads.append(_pad(to_api_payload(raw_data), args.pad_kb))
+    return [json.dumps(payload, ensure_ascii=False).encode('utf-8') for payload in payloads]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Stub HollandseVelden competition API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--payload', action='append',
+                        help='recorded competition JSON; repeat to replay a sequence')
+    parser.add_argument('--teams', type=int, default=14, help='synthetic league size (without --payload)')
+    parser.add_argument('--rounds', type=int, default=2)
+    parser.add_argument('--seasons', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--pad-kb', type=int, default=0, help='extra unused payload kilobytes')
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of 503 responses')
+    parser.add_argument('--decode-error-rate', type=float, default=0.0,
+                        help='fraction of truncated (invalid JSON) responses')
+    args = parser.parse_args(argv)
+
+    payloads = build_payloads(args)
+    settings = StubSettings(payloads, args.latency_ms / 1000, args.jitter_ms / 1000,
+                            args.error_rate, args.decode_error_rate, args.seed)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(settings))
+
+    sizes = ', '.join(f"{len(payload) / 1024:.0f} KB" for payload in payloads)
+    print(f"Stub competition API on http://{args.host}:{args.port}/ serving {len(payloads)} payload(s): {sizes}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Stub served {settings.requests_served} requests")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+import random
+from datetime import datetime, timedelta
+from config import Config
+from normalize import normalize_competition
+
+STATUS_PLAYED = 'Gespeeld'
+STATUS_UPCOMING = 'Nog te spelen'
+
+
+def _team_names(num_teams, featured_team, rng):
+    """Build unique team names, with the featured team first"""
+    prefixes = ['VV', 'SV', 'FC', 'CVV', 'VVV', 'SC', 'RKVV', 'AVV']
+    places = ['Noord', 'Zuid', 'Oost', 'West', 'Veld', 'Dorp', 'Stad', 'Haven', 'Berg', 'Dal',
+              'Brug', 'Meer', 'Bos', 'Hoek', 'Dijk', 'Wold', 'Horst', 'Loo', 'Hem', 'Zand']
+    names = [featured_team] if featured_team else []
+    while len(names) < num_teams:
+        name = f"{rng.choice(prefixes)} {rng.choice(places)}{rng.choice(places).lower()} {len(names)}"
+        names.append(name)
+    return names[:num_teams]
+
+
+def _round_robin(teams):
+    """Single round-robin matchdays using the circle method"""
+    teams = list(teams)
+    if len(teams) % 2:
+        teams.append(None)  # Bye
+    half = len(teams) // 2
+    matchdays = []
+    for day in range(len(teams) - 1):
+        pairs = []
+        for i in range(half):
+            home, away = teams[i], teams[-1 - i]
+            if home is not None and away is not None:
+                # Alternate home advantage so teams don't always play at home
+                pairs.append((home, away) if day % 2 == 0 else (away, home))
+        matchdays.append(pairs)
+        teams = [teams[0]] + [teams[-1]] + teams[1:-1]
+    return matchdays
+
+
+def _season_schedule(teams, rounds):
+    """All matchdays of a season; each round is a full round-robin with home/away swapped"""
+    single = _round_robin(teams)
+    matchdays = []
+    for round_index in range(rounds):
+        for pairs in single:
+            matchdays.append(pairs if round_index % 2 == 0 else [(away, home) for home, away in pairs])
+    return matchdays
+
+
+def _first_saturday(year):
+    """First Saturday of September, the usual start of the amateur season"""
+    date = datetime(year, 9, 1)
+    return date + timedelta(days=(5 - date.weekday()) % 7)
+
+
+def _score(rng, home_strength, away_strength):
+    """Sample a plausible score from two team strengths"""
+    home_goals = sum(rng.random() < 0.25 * home_strength for _ in range(6))
+    away_goals = sum(rng.random() < 0.20 * away_strength for _ in range(6))
+    return home_goals, away_goals
+
+
+def _standings(teams, matches):
+    """Compute a league table from played matches"""
+    stats = {team: {'played': 0, 'wins': 0, 'draws': 0, 'losses': 0, 'goals_for': 0, 'goals_against': 0}
+             for team in teams}
+    for match in matches:
+        home, away = stats[match['home']], stats[match['away']]
+        home_goals, away_goals = match['homeGoals'], match['awayGoals']
+        home['played'] += 1
+        away['played'] += 1
+        home['goals_for'] += home_goals
+        home['goals_against'] += away_goals
+        away['goals_for'] += away_goals
+        away['goals_against'] += home_goals
+        if home_goals > away_goals:
+            home['wins'] += 1
+            away['losses'] += 1
+        elif home_goals < away_goals:
+            away['wins'] += 1
+            home['losses'] += 1
+        else:
+            home['draws'] += 1
+            away['draws'] += 1
+
+    def sort_key(team):
+        s = stats[team]
+        points = s['wins'] * 3 + s['draws']
+        return (-points, -(s['goals_for'] - s['goals_against']), -s['goals_for'], team)
+
+    table = []
+    for position, team in enumerate(sorted(teams, key=sort_key), 1):
+        s = stats[team]
+        points = s['wins'] * 3 + s['draws']
+        table.append({
+            'team': team,
+            'position': position,
+            'played': s['played'],
+            'wins': s['wins'],
+            'draws': s['draws'],
+            'losses': s['losses'],
+            'goals_for': s['goals_for'],
+            'goals_against': s['goals_against'],
+            'points': points,
+            'shirt': '',
+        })
+    return table
+
+
+def generate_league(num_teams=14, rounds=2, seasons=1, played_fraction=0.7,
+                    seed=42, featured_team=None, start_year=None):
+    """Generate one competition in the normalized raw_data shape returned by get_data().
+
+    Earlier seasons are fully played and appear in 'results'; the league table and
+    period standings describe the last season, of which played_fraction is played."""
+    rng = random.Random(seed)
+    featured_team = Config.FEATURED_TEAM if featured_team is None else featured_team
+    teams = _team_names(num_teams, featured_team, rng)
+    strengths = {team: rng.uniform(0.6, 1.4) for team in teams}
+    start_year = start_year or datetime.now().year - seasons + 1
+
+    results = []
+    program = []
+    season_results = []
+    matchdays = []
+
+    for season in range(seasons):
+        is_current = season == seasons - 1
+        matchdays = _season_schedule(teams, rounds)
+        played_days = round(len(matchdays) * played_fraction) if is_current else len(matchdays)
+        season_start = _first_saturday(start_year + season)
+        season_results = []
+
+        for day_index, pairs in enumerate(matchdays):
+            date = (season_start + timedelta(weeks=day_index)).strftime('%Y-%m-%d')
+            for home, away in pairs:
+                if day_index < played_days:
+                    home_goals, away_goals = _score(rng, strengths[home], strengths[away])
+                    match = {
+                        'status': STATUS_PLAYED,
+                        'date': date,
+                        'home': home,
+                        'away': away,
+                        'homeGoals': home_goals,
+                        'awayGoals': away_goals,
+                        'result': f"{home_goals} - {away_goals}",
+                    }
+                    results.append(match)
+                    season_results.append((day_index, match))
+                else:
+                    program.append({
+                        'status': STATUS_UPCOMING,
+                        'date': date,
+                        'home': home,
+                        'away': away,
+                        'homeGoals': 0,
+                        'awayGoals': 0,
+                        'result': '',
+                    })
+
+    # Split the current season into three periods of equal length
+    period_length = max(1, -(-len(matchdays) // 3))
+    periods = {}
+    for period in range(3):
+        period_matches = [match for day_index, match in season_results
+                          if day_index // period_length == period]
+        periods[f'period{period + 1}'] = _standings(teams, period_matches)
+
+    return normalize_competition({
+        'leaguetable': _standings(teams, [match for _, match in season_results]),
+        'period1': periods['period1'],
+        'period2': periods['period2'],
+        'period3': periods['period3'],
+        'results': results,
+        'program': program,
+    })
+
+
+def generate_competitions(num_competitions, seed=42, **league_options):
+    """Generate several independent competitions, keyed by competition id"""
+    return {
+        f"competition-{index + 1}": generate_league(seed=seed + index, **league_options)
+        for index in range(num_competitions)
+    }
+
+
+def _api_table(rows):
+    """Table rows with the competition API field names"""
+    return [{
+        'position': team['position'],
+        'name': team['team'],
+        'shirt': team['shirt'],
+        'matches': team['played'],
+        'wins': team['wins'],
+        'ties': team['draws'],
+        'losses': team['losses'],
+        'points': team['points'],
+        'goalsFor': team['goals_for'],
+        'goalsAgainst': team['goals_against'],
+        'pointsPunished': '0',
+    } for team in rows]
+
+
+def _api_matches(matches):
+    """Matches with the competition API fields; scores of unplayed matches are 0"""
+    return [{
+        'status': match['status'],
+        'date': f"{match['date']} {match['time']}:00" if match['time'] else match['date'],
+        'home': match['home'],
+        'away': match['away'],
+        'homeGoals': match['homeGoals'] or 0,
+        'awayGoals': match['awayGoals'] or 0,
+        'result': match['result'],
+    } for match in matches]
+
+
+def to_api_payload(raw_data, title='Synthetische klasse', season='2025/2026'):
+    """Convert normalized raw_data back into the competition API response format"""
+    return {
+        'competition': {
+            'meta': {'title': title, 'district': 'Synthetisch', 'season': season},
+            'leaguetable': _api_table(raw_data['leaguetable']),
+            'period1': _api_table(raw_data['period1']),
+            'period2': _api_table(raw_data['period2']),
+            'period3': _api_table(raw_data['period3']),
+            'results': _api_matches(raw_data['results']),
+            'program': _api_matches(raw_data['program']),
+        }
+    }
@@ -0,0 +1,172 @@
+import threading
+from collections import deque
+from indexes import resolve_team
+
+# Streaks tracked per team: a team's run continues while the condition holds
+STREAKS = {
+    'wins': lambda scored, conceded: scored > conceded,
+    'unbeaten': lambda scored, conceded: scored >= conceded,
+    'scoring': lambda scored, _conceded: scored > 0,
+    'clean_sheets': lambda _scored, conceded: conceded == 0,
+}
+RECENT_MEETINGS = 5
+
+
+def _split():
+    return {'played': 0, 'wins': 0, 'draws': 0, 'losses': 0, 'goals_for': 0, 'goals_against': 0,
+            'clean_sheets': 0, 'failed_to_score': 0}
+
+
+def _add(split, scored, conceded):
+    split['played'] += 1
+    split['wins' if scored > conceded else 'draws' if scored == conceded else 'losses'] += 1
+    split['goals_for'] += scored
+    split['goals_against'] += conceded
+    split['clean_sheets'] += conceded == 0
+    split['failed_to_score'] += scored == 0
+
+
+def _result_key(match):
+    return match['date'], match['home'], match['away']
+
+
+class StatsAggregator:
+    """Home/away splits, streaks and head-to-head records of one competition's results.
+
+    Results are applied one at a time in date order, so a refresh only applies the results
+    that are new since the previous one. A result that changes, disappears or arrives
+    older than a team's last applied match makes the next update start over."""
+
+    def __init__(self):
+        self.teams = {}  # team -> {'home': split, 'away': split, 'streaks': {...}, 'last_date': date}
+        self.pairs = {}  # (team, team) sorted -> head-to-head record
+        self.applied = {}  # (date, home, away) -> (home goals, away goals)
+        self.names = []  # Sorted team names, for resolving identifiers
+
+    def _team(self, name):
+        team = self.teams.get(name)
+        if team is None:
+            team = self.teams[name] = {
+                'home': _split(), 'away': _split(), 'last_date': '',
+                'streaks': {streak: {'current': 0, 'longest': 0} for streak in STREAKS},
+            }
+        return team
+
+    def _pair(self, team_a, team_b):
+        key = tuple(sorted((team_a, team_b)))
+        pair = self.pairs.get(key)
+        if pair is None:
+            pair = self.pairs[key] = {
+                'teams': list(key), 'played': 0, 'draws': 0,
+                'wins': {key[0]: 0, key[1]: 0}, 'goals': {key[0]: 0, key[1]: 0},
+                'home_wins': {key[0]: 0, key[1]: 0}, 'recent': deque(maxlen=RECENT_MEETINGS),
+            }
+        return pair
+
+    def add_result(self, match):
+        """Apply one played match; matches of a team must arrive in date order"""
+        home, away = match['home'], match['away']
+        home_goals, away_goals = match['homeGoals'], match['awayGoals']
+        self.applied[_result_key(match)] = (home_goals, away_goals)
+
+        for name, side, scored, conceded in ((home, 'home', home_goals, away_goals),
+                                             (away, 'away', away_goals, home_goals)):
+            team = self._team(name)
+            _add(team[side], scored, conceded)
+            team['last_date'] = match['date']
+            for streak, holds in STREAKS.items():
+                run = team['streaks'][streak]
+                run['current'] = run['current'] + 1 if holds(scored, conceded) else 0
+                run['longest'] = max(run['longest'], run['current'])
+
+        pair = self._pair(home, away)
+        pair['played'] += 1
+        pair['goals'][home] += home_goals
+        pair['goals'][away] += away_goals
+        if home_goals == away_goals:
+            pair['draws'] += 1
+        else:
+            winner = home if home_goals > away_goals else away
+            pair['wins'][winner] += 1
+            if winner == home:
+                pair['home_wins'][home] += 1
+        pair['recent'].appendleft({'date': match['date'], 'home': home, 'away': away,
+                                   'homeGoals': home_goals, 'awayGoals': away_goals})
+
+    def pending(self, results):
+        """Results not applied yet, oldest first; None when the aggregate has to be rebuilt"""
+        played = [match for match in results if match['homeGoals'] is not None and match['awayGoals'] is not None]
+        current = {_result_key(match): (match['homeGoals'], match['awayGoals']) for match in played}
+        if any(current.get(key) != score for key, score in self.applied.items()):
+            return None  # A result was corrected or removed
+
+        new = sorted((match for match in played if _result_key(match) not in self.applied),
+                     key=lambda match: match['date'])
+        for match in new:
+            for name in (match['home'], match['away']):
+                if name in self.teams and match['date'] < self.teams[name]['last_date']:
+                    return None  # Arrived out of order; streaks have to be replayed
+        return new
+
+    def team_stats(self, name):
+        team = self.teams[name]
+        total = _split()
+        for key in total:
+            total[key] = team['home'][key] + team['away'][key]
+        return {'team': name, 'home': dict(team['home']), 'away': dict(team['away']), 'total': total,
+                'streaks': {streak: dict(run) for streak, run in team['streaks'].items()}}
+
+    def head_to_head(self, team_a, team_b):
+        pair = self.pairs.get(tuple(sorted((team_a, team_b))))
+        if pair is None:
+            return {'teams': [team_a, team_b], 'played': 0, 'draws': 0, 'wins': {team_a: 0, team_b: 0},
+                    'goals': {team_a: 0, team_b: 0}, 'home_wins': {team_a: 0, team_b: 0}, 'recent': []}
+        return {**pair, 'wins': dict(pair['wins']), 'goals': dict(pair['goals']),
+                'home_wins': dict(pair['home_wins']), 'recent': list(pair['recent'])}
+
+
+class TeamStatsStore:
+    """One aggregator per competition, brought up to date when the data version changes.
+
+    Reads and updates share one lock, so a response never sees a half-applied refresh."""
+
+    def __init__(self):
+        self.entries = {}  # competition -> (aggregator, data version)
+        self._lock = threading.Lock()
+
+    def _aggregator(self, competition, data, version):
+        aggregator, applied_version = self.entries.get(competition, (None, None))
+        if aggregator is not None and applied_version == version:
+            return aggregator
+
+        results = (data.get('raw_data') or {}).get('results', [])
+        new = aggregator.pending(results) if aggregator is not None else None
+        if new is None:
+            aggregator = StatsAggregator()
+            new = aggregator.pending(results)
+        for match in new:
+            aggregator.add_result(match)
+        if new:
+            aggregator.names = sorted(aggregator.teams)
+        self.entries[competition] = (aggregator, version)
+        return aggregator
+
+    def team_stats(self, competition, data, version, team):
+        """Statistics of a team identifier (name, slug or key), or None if unknown"""
+        with self._lock:
+            aggregator = self._aggregator(competition, data, version)
+            name = resolve_team(team, aggregator.names)
+            return aggregator.team_stats(name) if name is not None else None
+
+    def head_to_head(self, competition, data, version, team_a, team_b):
+        """Head-to-head record of two team identifiers, or None if either is unknown"""
+        with self._lock:
+            aggregator = self._aggregator(competition, data, version)
+            name_a, name_b = resolve_team(team_a, aggregator.names), resolve_team(team_b, aggregator.names)
+            if name_a is None or name_b is None or name_a == name_b:
+                return None
+            return aggregator.head_to_head(name_a, name_b)
+
+
+# Global team statistics store
+team_stats_store = TeamStatsStore()
@@ -0,0 +1,148 @@
+// Service Worker - SPMS Liga Dashboard
+// Rendered by Flask so the precache list always matches the current fingerprinted assets
+const SHELL_CACHE = 'spms-shell-{{ cache_version }}';
+const ASSET_CACHE = 'spms-assets';
+const DATA_CACHE = 'spms-data';
+const SLIDE_CACHE = 'spms-slides';
+const PRECACHE_URLS = {{ precache_urls | tojson }};
+
+// Precache the app shell, CSS/JS and the current league's logos
+self.addEventListener('install', event => {
+    event.waitUntil(
+        caches.open(SHELL_CACHE)
+            .then(cache => cache.addAll(PRECACHE_URLS))
+            .then(() => self.skipWaiting())
+    );
+});
+
+// Drop shell caches from previous versions, and assets the current shell no longer references
+self.addEventListener('activate', event => {
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(keys
+                .filter(key => key.startsWith('spms-shell-') && key !== SHELL_CACHE)
+                .map(key => caches.delete(key))))
+            .then(pruneAssets)
+            .then(() => self.clients.claim())
+    );
+});
+
+async function pruneAssets() {
+    const current = new Set(PRECACHE_URLS.map(url => new URL(url, self.location.origin).href));
+    const cache = await caches.open(ASSET_CACHE);
+    const requests = await cache.keys();
+    await Promise.all(requests
+        .filter(request => !current.has(request.url))
+        .map(request => cache.delete(request)));
+}
+
+// URLs that name their content: fingerprinted static files and logos under their source digest
+function isContentHashed(url) {
+    return (url.pathname.startsWith('/static/') && url.searchParams.has('v'))
+        || /^\/logos\/[0-9a-f]+\/[^/]+\/\d+$/.test(url.pathname);
+}
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    const url = new URL(request.url);
+
+    // Only handle same-origin GET requests; CDN assets go straight to the network
+    if (request.method !== 'GET' || url.origin !== self.location.origin) {
+        return;
+    }
+
+    if (url.pathname === '/api/refresh') {
+        return;  // A refresh the user asked for must reach the server
+    } else if (url.pathname.startsWith('/slides/') && url.searchParams.has('h')) {
+        event.respondWith(slideFragment(request, url));
+    } else if (url.pathname.startsWith('/api/') || url.pathname.startsWith('/slides')) {
+        event.respondWith(staleWhileRevalidate(event, DATA_CACHE));
+    } else if (isContentHashed(url)) {
+        event.respondWith(cacheFirst(request));
+    } else if (url.pathname.startsWith('/static/') || url.pathname.startsWith('/logos/')) {
+        event.respondWith(networkFirst(request));
+    } else if (request.mode === 'navigate') {
+        event.respondWith(staleWhileRevalidate(event, SHELL_CACHE));
+    }
+});
+
+// Serve content-hashed assets from cache, fetching and storing them on a miss
+async function cacheFirst(request) {
+    const cached = await caches.match(request);
+    if (cached) {
+        return cached;
+    }
+    const response = await fetch(request);
+    if (response.ok) {
+        const cache = await caches.open(ASSET_CACHE);
+        cache.put(request, response.clone());
+    }
+    return response;
+}
+
+// Unversioned assets can change behind their URL: fetch them, and use the cache only offline
+async function networkFirst(request) {
+    const cache = await caches.open(ASSET_CACHE);
+    try {
+        const response = await fetch(request);
+        if (response.ok) {
+            cache.put(request, response.clone());
+        }
+        return response;
+    } catch (error) {
+        const cached = await cache.match(request);
+        if (cached) {
+            return cached;
+        }
+        throw error;
+    }
+}
+
+// A slide fragment URL carries the fragment's content hash, so a cached copy is always current.
+// Only a response that really has that hash is stored, replacing older versions of the slide.
+async function slideFragment(request, url) {
+    const cache = await caches.open(SLIDE_CACHE);
+    const cached = await cache.match(request);
+    if (cached) {
+        return cached;
+    }
+    const response = await fetch(request);
+    if (response.ok && response.headers.get('X-Slide-Hash') === url.searchParams.get('h')) {
+        const stale = await cache.keys();
+        await Promise.all(stale
+            .filter(key => new URL(key.url).pathname === url.pathname)
+            .map(key => cache.delete(key)));
+        await cache.put(request, response.clone());
+    }
+    return response;
+}
+
+// Answer from cache immediately and refresh the cached copy in the background
+async function staleWhileRevalidate(event, cacheName) {
+    const request = event.request;
+    const cache = await caches.open(cacheName);
+    const cached = await cache.match(request);
+
+    const update = fetch(request).then(async response => {
+        if (response.ok) {
+            await cache.put(request, response.clone());
+            if (cached && cached.headers.get('ETag') !== response.headers.get('ETag')) {
+                notifyClients({type: 'data-updated', url: request.url});
+            }
+        }
+        return response;
+    });
+
+    if (cached) {
+        event.waitUntil(update.catch(error => {
+            console.log('Background refresh failed, serving cached copy:', request.url, error);
+        }));
+        return cached;
+    }
+    return update;
+}
+
+async function notifyClients(message) {
+    const clients = await self.clients.matchAll({type: 'window'});
+    clients.forEach(client => client.postMessage(message));
+}
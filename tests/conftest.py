@@ -0,0 +1,17 @@
+import os
+import sys
+import pytest
+
+# The application modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    """Test client of the app serving the bundled test data, writing its files under tmp_path"""
+    from app import app
+    from config import ArchiveConfig, Config
+    monkeypatch.setattr(Config, 'USE_TEST_DATA', True)
+    monkeypatch.setattr(ArchiveConfig, 'ENABLED', False)
+    monkeypatch.chdir(tmp_path)
+    return app.test_client()
@@ -0,0 +1,45 @@
+import pytest
+from archive import Archive
+
+
+def _match(date, home, away, home_goals=None, away_goals=None):
+    return {'date': date, 'time': '14:30', 'home': home, 'away': away,
+            'homeGoals': home_goals, 'awayGoals': away_goals}
+
+
+def _snapshot(program=(), results=()):
+    return {'raw_data': {'program': list(program), 'results': list(results), 'leaguetable': []},
+            'last_updated': '2024-03-01T12:00:00'}
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return Archive(str(tmp_path / 'archive.db'), read_pool_size=1)
+
+
+def test_rescheduled_fixture_is_kept_once_at_its_new_date(archive):
+    archive.ingest('league', _snapshot(program=[_match('2024-03-02', 'A', 'B'), _match('2024-03-02', 'C', 'D')]), 'v1')
+    archive.ingest('league', _snapshot(program=[_match('2024-03-09', 'A', 'B'), _match('2024-03-02', 'C', 'D')]), 'v2')
+
+    assert [(m['date'], m['status']) for m in archive.head_to_head('A', 'B')] == [('2024-03-09', 'upcoming')]
+    assert [m['date'] for m in archive.head_to_head('C', 'D')] == ['2024-03-02']
+
+    archive.ingest('league', _snapshot(results=[_match('2024-03-09', 'A', 'B', 2, 1),
+                                                _match('2024-03-02', 'C', 'D', 0, 0)]), 'v3')
+    assert [(m['date'], m['status'], m['homeGoals']) for m in archive.team_matches('A')] == \
+        [('2024-03-09', 'played', 2)]
+
+
+def test_played_matches_are_never_dropped(archive):
+    archive.ingest('league', _snapshot(results=[_match('2024-03-02', 'A', 'B', 1, 0)]), 'v1')
+    archive.ingest('league', _snapshot(program=[_match('2024-03-16', 'B', 'A')]), 'v2')
+
+    assert [(m['date'], m['status']) for m in archive.head_to_head('A', 'B')] == \
+        [('2024-03-16', 'upcoming'), ('2024-03-02', 'played')]
+
+
+def test_other_seasons_are_left_alone(archive):
+    archive.ingest('league', _snapshot(program=[_match('2023-05-06', 'A', 'B')]), 'v1')
+    archive.ingest('league', _snapshot(program=[_match('2024-03-09', 'A', 'B')]), 'v2')
+
+    assert [m['season'] for m in archive.head_to_head('A', 'B')] == ['2023/2024', '2022/2023']
@@ -0,0 +1,118 @@
+import pytest
+import requests
+import hollandsevelden
+import scheduler
+from circuit_breaker import CircuitBreaker, BreakerRegistry, CLOSED, OPEN, HALF_OPEN
+from config import ArchiveConfig, Config
+from test_data import get_test_data
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker('api', failure_threshold=3, reset_timeout=10, clock=Clock())
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure('HTTP 503')
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+    breaker.record_failure('HTTP 503')
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.status()['rejected_calls'] == 1
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker('api', failure_threshold=2, reset_timeout=10, clock=Clock())
+    breaker.record_failure('timeout')
+    breaker.record_success()
+    breaker.record_failure('timeout')
+    assert breaker.state == CLOSED
+
+
+def test_half_open_allows_one_probe():
+    clock = Clock()
+    breaker = CircuitBreaker('api', failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure('timeout')
+    clock.now = 9.9
+    assert not breaker.allow()
+    clock.now = 10
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()  # The probe is still running
+
+
+def test_failed_probe_reopens_and_successful_probe_closes():
+    clock = Clock()
+    breaker = CircuitBreaker('api', failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure('timeout')
+    clock.now = 10
+    assert breaker.allow()
+    breaker.record_failure('timeout')
+    assert breaker.state == OPEN
+    assert breaker.status()['retry_in_seconds'] == 10
+    clock.now = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+@pytest.fixture
+def api_mode(monkeypatch, tmp_path):
+    """API mode against an upstream that refuses connections; returns the list of attempted requests"""
+    monkeypatch.setattr(Config, 'USE_TEST_DATA', False)
+    monkeypatch.setattr(ArchiveConfig, 'ENABLED', False)
+    monkeypatch.setattr(hollandsevelden, 'upstream_breakers', BreakerRegistry())
+    monkeypatch.chdir(tmp_path)
+    attempts = []
+
+    def refuse(url, **_):
+        attempts.append(url)
+        raise requests.ConnectionError('connection refused')
+    monkeypatch.setattr(hollandsevelden.requests, 'get', refuse)
+    return attempts
+
+
+def _scheduler(tmp_path):
+    return scheduler.DataScheduler(data_file=str(tmp_path / 'league_data.json'), api_url='http://upstream.invalid/')
+
+
+def test_failed_fetches_keep_the_served_data(api_mode, tmp_path):
+    data_scheduler = _scheduler(tmp_path)
+    data_scheduler.fetch_and_process_data(raw_data=get_test_data())
+    data, version = data_scheduler.cached_data, data_scheduler.data_version
+
+    for _ in range(5):
+        data_scheduler.fetch_and_process_data()
+
+    assert data_scheduler.cached_data is data
+    assert data_scheduler.data_version == version
+    assert len(api_mode) == 3  # Then the breaker opened
+    assert data_scheduler.get_cached_data() is data
+
+
+def test_last_snapshot_is_served_after_a_restart_with_upstream_down(api_mode, tmp_path):
+    _scheduler(tmp_path).fetch_and_process_data(raw_data=get_test_data())
+
+    restarted = _scheduler(tmp_path)
+    for _ in range(3):
+        data = restarted.get_cached_data()
+        assert data is not None
+        assert data['mode'] == 'api'
+    assert api_mode == []
+
+
+def test_snapshot_of_the_other_mode_is_not_served(api_mode, tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'USE_TEST_DATA', True)
+    _scheduler(tmp_path).fetch_and_process_data(raw_data=get_test_data())
+    monkeypatch.setattr(Config, 'USE_TEST_DATA', False)
+
+    assert _scheduler(tmp_path).get_cached_data() is None
+    assert len(api_mode) == 1
@@ -0,0 +1,19 @@
+import csv
+import io
+
+
+def test_csv_export_declares_one_charset(client):
+    response = client.get('/api/export/league-table.csv')
+
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == 'text/csv; charset=utf-8'
+    assert response.headers['Content-Disposition'] == 'attachment; filename="league-table.csv"'
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+    assert rows[0][:2] == ['Pos', 'Team']
+    assert len(rows) > 1
+
+
+def test_binary_exports_keep_their_mimetype(client):
+    assert client.get('/api/export/league-table.xlsx').headers['Content-Type'] == \
+        'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    assert client.get('/api/export/all-matches.pdf').headers['Content-Type'] == 'application/pdf'
@@ -0,0 +1,62 @@
+import json
+import pytest
+from json_stream import JSONStreamReader, iter_text
+
+SAMPLE = ('{"leaguetable": [{"team": "VV Gorecht", "points": 37, "ratio": 1.5, "big": 1e3, "small": -0.25E-2},'
+          ' {"team": "Blauw Wit \'34", "points": -12, "ratio": 0.125, "big": 12E+2, "small": 5e-1}],'
+          ' "results": [1.5, 2, -3, 10.75, 4e1, 0, true, false, null],'
+          ' "escaped": "quote \\" backslash \\\\ tab \\t \\u00e9 é ✓", "empty": {}, "none": []}')
+
+
+def _splits(text):
+    """The text cut into two chunks at every position, and into three at every pair of positions"""
+    for i in range(len(text) + 1):
+        yield [text[:i], text[i:]]
+    for i in range(1, len(text)):
+        for j in range(i + 1, len(text), 7):
+            yield [text[:i], text[i:j], text[j:]]
+
+
+def test_read_value_matches_json_loads_for_every_split():
+    expected = json.loads(SAMPLE)
+    for chunks in _splits(SAMPLE):
+        assert JSONStreamReader(chunks).read_value() == expected, chunks
+
+
+@pytest.mark.parametrize('chunks, expected', [
+    (['[1.', '5, 2]'], [1.5, 2]),
+    (['[1e', '3]'], [1000.0]),
+    (['[1', '.', '5', 'e', '-', '1]'], [0.15]),
+    (['[-', '7]'], [-7]),
+    (['[12', '34]'], [1234]),
+])
+def test_numbers_split_across_chunks(chunks, expected):
+    assert list(JSONStreamReader(chunks).iter_array()) == expected
+
+
+def test_walking_and_skipping_matches_json_loads_for_every_split():
+    expected = json.loads(SAMPLE)
+    for chunks in _splits(SAMPLE):
+        reader = JSONStreamReader(chunks)
+        walked = {}
+        for key in reader.iter_object():
+            if key == 'results':
+                walked[key] = list(reader.iter_array())
+            elif key == 'leaguetable':
+                walked[key] = [row['team'] for row in reader.iter_array()]
+            else:
+                reader.skip_value()
+        assert walked == {'leaguetable': [row['team'] for row in expected['leaguetable']],
+                          'results': expected['results']}, chunks
+
+
+def test_multibyte_characters_split_across_byte_chunks():
+    encoded = SAMPLE.encode('utf-8')
+    for i in range(len(encoded) + 1):
+        chunks = iter_text([encoded[:i], encoded[i:]])
+        assert JSONStreamReader(chunks).read_value() == json.loads(SAMPLE)
+
+
+def test_truncated_number_is_an_error():
+    with pytest.raises(json.JSONDecodeError):
+        list(JSONStreamReader(['[1', '.']).iter_array())
@@ -0,0 +1,41 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from leagues import LeagueStore
+from match_table import memory_size
+
+PAYLOAD = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'noord-zaterdag-1f.json')
+
+
+def _store(tmp_path, memory_budget=10 ** 9):
+    return LeagueStore({'north': {'api_url': ''}, 'south': {'api_url': ''}},
+                       snapshot_dir=str(tmp_path), memory_budget=memory_budget)
+
+
+def _payload():
+    with open(PAYLOAD, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_pool_refresh_keeps_only_resident_leagues_in_memory(tmp_path):
+    store = _store(tmp_path)
+    store.refresh('north', _payload())
+    data, version = store.get('north')
+    assert data is not None
+
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        store.refresh('north', _payload(), pool)
+        store.refresh('south', _payload(), pool)
+
+    assert store.partitions['north'].published is not None
+    assert store.partitions['south'].published is None
+    assert os.path.exists(tmp_path / 'south.json')
+    assert store.get('south')[1] == version
+
+
+def test_resident_size_is_measured_on_the_compact_data(tmp_path):
+    store = _store(tmp_path)
+    store.refresh('north', _payload())
+    data, _ = store.get('north')
+
+    assert store.resident_bytes() == memory_size(data) > 0
@@ -0,0 +1,58 @@
+import os
+import pytest
+import app as app_module
+from config import LogoConfig
+from logo_cache import LogoCache
+
+SIZE = LogoConfig.SIZES[0]
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    cache = LogoCache(str(tmp_path / 'logo_cache'))
+    monkeypatch.setattr(app_module, 'logo_cache', cache)
+    return cache
+
+
+@pytest.mark.usefixtures('cache')
+def test_team_logo_url_is_revalidated(client):
+    response = client.get(f'/logos/t_184/{SIZE}')
+
+    assert response.status_code == 200
+    assert 'immutable' not in response.headers['Cache-Control']
+    assert client.get(f'/logos/t_184/{SIZE}', headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+
+
+def test_versioned_logo_url_is_immutable(client, cache):
+    with app_module.app.test_request_context():
+        url = app_module.logo_url('t_184', SIZE)
+    assert url == f"/logos/{cache.version('t_184.png')}/t_184/{SIZE}"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+
+
+def test_replaced_logo_redirects_to_its_new_url(client, cache):
+    response = client.get(f'/logos/0123456789abcdef/t_184/{SIZE}')
+
+    assert response.status_code == 302
+    assert response.headers['Location'].endswith(f"/logos/{cache.version('t_184.png')}/t_184/{SIZE}")
+
+
+def test_logo_evicted_before_sending_is_rendered_again(client, cache, monkeypatch):
+    get = cache.get
+    evicted = []
+
+    def get_then_evict(*args):
+        path, key = get(*args)
+        if not evicted:
+            os.remove(path)
+            evicted.append(path)
+        return path, key
+    monkeypatch.setattr(cache, 'get', get_then_evict)
+
+    response = client.get(f'/logos/t_184/{SIZE}')
+    assert evicted
+    assert response.status_code == 200
+    assert response.data.startswith(b'\x89PNG')
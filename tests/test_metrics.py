@@ -0,0 +1,27 @@
+import metrics
+from metrics import ActiveClients
+
+
+def test_expired_clients_are_pruned_when_new_ones_are_seen(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(metrics.time, 'monotonic', lambda: now[0])
+    clients = ActiveClients(window_seconds=60)
+    clients.seen('a')
+    clients.seen('b')
+    now[0] += 30
+    clients.seen('a')
+    now[0] += 45
+
+    clients.seen('c')
+
+    assert list(clients._last_seen) == ['a', 'c']
+    assert clients.count() == 2
+
+
+def test_clients_are_capped():
+    clients = ActiveClients(window_seconds=60, max_clients=3)
+    for client_key in 'abcde':
+        clients.seen(client_key)
+
+    assert list(clients._last_seen) == ['c', 'd', 'e']
+    assert clients.count() == 3
@@ -0,0 +1,26 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import profiling
+import scheduler
+from config import ProfilingConfig
+
+PAYLOAD = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'noord-zaterdag-1f.json')
+
+
+def test_profile_budget_is_claimed_in_the_parent(tmp_path, monkeypatch):
+    monkeypatch.setattr(ProfilingConfig, 'PROFILE_MODE', 'cprofile')
+    monkeypatch.setattr(ProfilingConfig, 'OUTPUT_DIR', str(tmp_path / 'profiles'))
+    monkeypatch.setattr(profiling, '_profiles_remaining', 1)
+    with open(PAYLOAD, 'r', encoding='utf-8') as f:
+        payload = json.load(f)
+    data_scheduler = scheduler.DataScheduler(data_file=str(tmp_path / 'league_data.json'))
+
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        for _ in range(3):
+            data_scheduler.fetch_and_process_data(raw_data=payload, executor=pool)
+
+    # The first refresh profiles its parent and worker stage; the budget is then spent for both
+    profiles = os.listdir(tmp_path / 'profiles')
+    assert len(profiles) == 2
+    assert len({name.split('-')[3] for name in profiles}) == 2
@@ -0,0 +1,52 @@
+import json
+import os
+import shutil
+import scheduler
+from config import Config
+
+# The snapshot committed with the repository predates the format field
+LEGACY_SNAPSHOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'league_data.json')
+
+
+def _legacy_scheduler(tmp_path):
+    data_file = tmp_path / 'league_data.json'
+    shutil.copy(LEGACY_SNAPSHOT, data_file)
+    return scheduler.DataScheduler(data_file=str(data_file)), data_file
+
+
+def test_legacy_snapshot_is_migrated_on_load(tmp_path):
+    with open(LEGACY_SNAPSHOT, 'r', encoding='utf-8') as f:
+        legacy = json.load(f)
+    data_scheduler, data_file = _legacy_scheduler(tmp_path)
+
+    snapshot = data_scheduler.load_snapshot()
+
+    assert snapshot['format'] == scheduler.SNAPSHOT_FORMAT
+    assert 'mode' not in snapshot
+    assert snapshot['last_updated'] == legacy['last_updated']
+    assert all('team_id' in row for row in snapshot['league_table'])
+    assert all('home_id' in match for match in snapshot['raw_data']['results'])
+
+    # Written back, so the next load reads the current format directly
+    with open(data_file, 'r', encoding='utf-8') as f:
+        assert json.load(f)['format'] == scheduler.SNAPSHOT_FORMAT
+    assert data_scheduler.load_snapshot() == snapshot
+
+
+def test_migrated_snapshot_is_served_in_its_mode(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'USE_TEST_DATA', False)
+    data_scheduler, _ = _legacy_scheduler(tmp_path)
+    team = data_scheduler.load_snapshot()['league_table'][0]['team']
+    monkeypatch.setattr(Config, 'FEATURED_TEAM', team)
+
+    data = data_scheduler.get_cached_data()
+
+    assert data is not None
+    assert data_scheduler.data_version == scheduler.compute_data_version(data_scheduler.load_snapshot())
+
+
+def test_snapshot_without_raw_data_is_ignored(tmp_path):
+    data_file = tmp_path / 'league_data.json'
+    data_file.write_text(json.dumps({'league_table': [], 'last_updated': '2024-01-01T00:00:00'}))
+
+    assert scheduler.DataScheduler(data_file=str(data_file)).load_snapshot() is None
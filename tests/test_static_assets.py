@@ -0,0 +1,62 @@
+import os
+import pytest
+from flask import Flask, url_for
+from static_assets import AssetManifest
+
+
+@pytest.fixture
+def site(tmp_path):
+    static = tmp_path / 'static'
+    (static / 'css').mkdir(parents=True)
+    (static / 'images').mkdir()
+    (static / 'images' / 'logo.png').write_bytes(b'logo v1')
+    (static / 'images' / 'unused.bin').write_bytes(b'x' * 1024)
+    (static / 'css' / 'site.css').write_text(
+        '.a { background: url("/static/images/logo.png"); }\n'
+        '.b { background: url(../images/logo.png); }\n'
+        '.c { background: url(data:image/png;base64,AAAA); }\n'
+        '.d { background: url("https://example.com/x.png"); }\n')
+    app = Flask(__name__, static_folder=str(static))
+    manifest = AssetManifest(app)
+    return app, manifest, static
+
+
+def _url(app, filename):
+    with app.test_request_context():
+        return url_for('static', filename=filename)
+
+
+def test_files_are_hashed_when_first_referenced(site):
+    app, manifest, _ = site
+    assert manifest._hashes == {}
+
+    assert '?v=' in _url(app, 'images/logo.png')
+    assert set(manifest._hashes) == {'images/logo.png'}
+    assert '?v=' not in _url(app, 'images/missing.png')
+    assert manifest.fingerprint('../static/images/logo.png') is None
+
+
+def test_stylesheet_references_are_fingerprinted(site):
+    app, manifest, _ = site
+    logo_url = _url(app, 'images/logo.png')
+
+    response = app.test_client().get(_url(app, 'css/site.css'))
+    css = response.get_data(as_text=True)
+
+    assert response.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+    assert f'url("{logo_url}")' in css
+    assert f'url(../images/logo.png?v={manifest.fingerprint("images/logo.png")})' in css
+    assert 'url(data:image/png;base64,AAAA)' in css
+    assert 'url("https://example.com/x.png")' in css
+
+
+def test_changed_background_changes_the_stylesheet_url(site):
+    app, _, static = site
+    css_url = _url(app, 'css/site.css')
+
+    logo = static / 'images' / 'logo.png'
+    logo.write_bytes(b'logo v2, replaced')
+    os.utime(logo, ns=(1, 1))
+
+    assert _url(app, 'css/site.css') != css_url
+    assert app.test_client().get(css_url).headers['Cache-Control'] == 'no-cache'
@@ -0,0 +1,47 @@
+import pytest
+from indexes import AmbiguousTeamError, resolve_team
+
+NAMES = ["Blauw Wit '34", 'CVV Oranje Nassau G', 'FVC', 'VV Gorecht', 'VV Winsum']
+
+
+@pytest.mark.parametrize('identifier, expected', [
+    ('VV Gorecht', 'VV Gorecht'),
+    ('vv gorecht', 'VV Gorecht'),
+    ('vv-gorecht', 'VV Gorecht'),
+    ('gorecht', 'VV Gorecht'),
+    ('blauw-wit-34', "Blauw Wit '34"),
+    ('oranje-nassau-g', 'CVV Oranje Nassau G'),
+    ('fvc', 'FVC'),
+])
+def test_resolves_names_slugs_and_keys(identifier, expected):
+    assert resolve_team(identifier, NAMES) == expected
+
+
+@pytest.mark.parametrize('identifier', ['vv', 'gore', 'nassau', 'wit', '', '  ', None])
+def test_parts_of_names_do_not_resolve(identifier):
+    assert resolve_team(identifier, NAMES) is None
+
+
+def test_name_match_wins_over_key_match():
+    assert resolve_team('winsum', ['VV Winsum', 'Winsum']) == 'Winsum'
+
+
+def test_several_key_matches_are_ambiguous():
+    with pytest.raises(AmbiguousTeamError) as raised:
+        resolve_team('winsum', ['VV Winsum', 'SV Winsum'])
+    assert raised.value.candidates == ['SV Winsum', 'VV Winsum']
+
+
+def test_head_to_head_does_not_guess_a_team(client):
+    assert client.get('/api/head-to-head/gorecht/vv').status_code == 404
+    response = client.get('/api/head-to-head/gorecht/winsum')
+    assert response.status_code == 200
+    assert response.json['teams'] == ['VV Gorecht', 'VV Winsum']
+
+
+def test_ambiguous_team_lists_the_candidates(client, monkeypatch):
+    import indexes
+    monkeypatch.setattr(indexes, 'team_key', lambda _name: 'club')
+    response = client.get('/api/team-stats/club')
+    assert response.status_code == 400
+    assert len(response.json['candidates']) > 1
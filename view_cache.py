@@ -0,0 +1,47 @@
+import threading
+from collections import OrderedDict
+from match_table import MatchTable
+
+
+def project_fields(value, fields, in_list=False):
+    """Keep only the given keys of flat records (dicts in lists without nested containers).
+
+    Containers around the records, like period or week groupings and the team matrix,
+    are kept whole so the shape of each view does not change."""
+    if isinstance(value, (list, MatchTable)):
+        return [project_fields(item, fields, in_list=True) for item in value]
+    if isinstance(value, dict):
+        if in_list and not any(isinstance(item, (list, dict)) for item in value.values()):
+            return {key: item for key, item in value.items() if key in fields}
+        return {key: project_fields(item, fields) for key, item in value.items()}
+    return value
+
+
+class SerializedViewCache:
+    """JSON-encoded views per data version, so responses are assembled without re-serializing"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, version, key, build):
+        """Return the encoded view for (version, key), calling build() to encode it on a miss"""
+        cache_key = (version, key)
+        with self._lock:
+            encoded = self.entries.get(cache_key)
+            if encoded is not None:
+                self.entries.move_to_end(cache_key)
+                return encoded
+
+        # Encode outside the lock; a concurrent miss for the same view just encodes it twice
+        encoded = build()
+        with self._lock:
+            self.entries[cache_key] = encoded
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return encoded
+
+
+# Global serialized view cache
+serialized_view_cache = SerializedViewCache()